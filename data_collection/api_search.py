@@ -1,15 +1,26 @@
+import argparse
 import requests
 import csv
 import os
-import time
 import logging
 
 from dotenv import load_dotenv
 
-from datetime import datetime, timedelta
-
-from typing import List, Dict, Optional
-
+from datetime import date, datetime, timedelta
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
+from typing import Iterator, List, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from checkpoint import CheckpointJournal
+from enrichment import EnrichmentEngine, GraphQLEnricher
+from http_client import GitHubClient
+from progress import ProgressTracker
+from rate_limit import RateLimitScheduler
+from response_cache import ResponseCache
+import storage
+from telemetry import Telemetry
 from utils import format_datetime
 
 load_dotenv()
@@ -21,11 +32,57 @@ logger = logging.getLogger(__name__)
 
 last_year_date = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
 
+# Qualifiers of the study query: pushed in the last year, more than 10 stars.
+DEFAULT_QUALIFIERS = f"pushed:>{last_year_date} stars:>10"
+MIN_STARS = 11
+
+# The Search API returns at most 1000 results per query.
+SEARCH_RESULT_CAP = 1000
+
 NUM_COMMITS = 50
 NUM_STARS = 2
 
 PER_PAGE = int(os.getenv('PER_PAGE'))
 MAX_RESP = int(os.getenv('MAX_RESP'))
+MAX_WORKERS = int(os.getenv('MAX_WORKERS', '8'))
+SEARCH_WORKERS = int(os.getenv('SEARCH_WORKERS', '4'))
+# Search terms mined concurrently by `run_terms`.
+TERM_WORKERS = int(os.getenv('TERM_WORKERS', '4'))
+PROGRESS_INTERVAL = float(os.getenv('PROGRESS_INTERVAL', '30'))
+
+# Quoted, comma-separated search terms of the study.
+KEY_WORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'key-words')
+
+# 'link': one `per_page=1` request per count, read from the Link header.
+# 'walk': download every commit page (kept for cross-checking).
+COUNT_MODES = ("link", "walk")
+COMMIT_COUNT_MODE = os.getenv('COMMIT_COUNT_MODE', 'link')
+
+# 'link': one `per_page=1` request, read from the Link header (exact).
+# 'page': length of the first `per_page=100` page (previous behavior, caps at 100).
+CONTRIBUTOR_COUNT_MODES = ("link", "page")
+CONTRIBUTOR_COUNT_MODE = os.getenv('CONTRIBUTOR_COUNT_MODE', 'link')
+# Also count contributors without a GitHub account (commit emails only).
+CONTRIBUTORS_ANON = os.getenv('CONTRIBUTORS_ANON', 'false').lower() in ('1', 'true', 'yes')
+
+# 'rest': one REST call per repository and metric.
+# 'graphql': commit counts of GRAPHQL_BATCH_SIZE repositories per GraphQL query.
+ENRICHMENT_BACKENDS = ("rest", "graphql")
+ENRICHMENT_BACKEND = os.getenv('ENRICHMENT_BACKEND', 'rest')
+GRAPHQL_BATCH_SIZE = int(os.getenv('GRAPHQL_BATCH_SIZE', '50'))
+
+# Suffix of a table being written; it is renamed to its final name once complete.
+PARTIAL_SUFFIX = ".partial"
+
+# Repositories enriched and written per batch when a full list is saved.
+STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', str(PER_PAGE)))
+
+COMMITS_2024_WINDOW = {
+    "since": "2024-01-01T00:00:00Z",
+    "until": "2024-12-31T23:59:59Z",
+}
+
+API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com')
 
 TOKEN    = os.getenv('API_TOKEN')
 
@@ -34,36 +91,103 @@ headers = {
     'Accept': 'application/vnd.github.v3+json'
 }
 
+# Keep at least one pooled connection per enrichment worker.
+HTTP_POOL_SIZE = max(int(os.getenv('HTTP_POOL_SIZE', '16')), MAX_WORKERS)
+# Requests on the wire at once, shared by all terms and enrichment workers.
+MAX_IN_FLIGHT = int(os.getenv('MAX_IN_FLIGHT', str(HTTP_POOL_SIZE)))
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '30'))
+MAX_RETRIES = int(os.getenv('MAX_RETRIES', '5'))
+
+# An empty HTTP_CACHE_PATH disables the on-disk response cache.
+HTTP_CACHE_PATH = os.getenv('HTTP_CACHE_PATH', os.path.join(root, '.cache', 'github_responses.sqlite'))
+HTTP_CACHE_TTL = float(os.getenv('HTTP_CACHE_TTL', '86400'))
+HTTP_CACHE_MAX_AGE = float(os.getenv('HTTP_CACHE_MAX_AGE', str(30 * 86400)))
+HTTP_CACHE_MAX_MB = int(os.getenv('HTTP_CACHE_MAX_MB', '512'))
+
+# JSONL file receiving one record per request and per span (empty: summary only).
+TELEMETRY_PATH = os.getenv('TELEMETRY_PATH', '')
+
+# Shared session used by every API helper (keep-alive + connection pooling),
+# paced by the search/core rate-limit quotas reported by GitHub, backed by the
+# on-disk response cache and instrumented by the run telemetry.
+telemetry = Telemetry()
+scheduler = RateLimitScheduler()
+response_cache = (
+    ResponseCache(
+        HTTP_CACHE_PATH,
+        ttl=HTTP_CACHE_TTL,
+        max_age=HTTP_CACHE_MAX_AGE,
+        max_bytes=HTTP_CACHE_MAX_MB * 1024 * 1024,
+    )
+    if HTTP_CACHE_PATH
+    else None
+)
+client = GitHubClient(
+    headers,
+    pool_size=max(HTTP_POOL_SIZE, MAX_IN_FLIGHT),
+    timeout=HTTP_TIMEOUT,
+    scheduler=scheduler,
+    max_retries=MAX_RETRIES,
+    cache=response_cache,
+    max_in_flight=MAX_IN_FLIGHT,
+    telemetry=telemetry,
+)
+
 
 class HandleCsv:
     """
     Helper class to handle CSV generation for mined GitHub repositories.
     """
 
-    def __init__(self, repos, term: str, prefix: str = "") -> None:
+    def __init__(
+        self,
+        repos,
+        term: str,
+        prefix: str = "",
+        max_workers: int = MAX_WORKERS,
+        journal: Optional[CheckpointJournal] = None,
+        progress: Optional[ProgressTracker] = None,
+    ) -> None:
         """
         Initialize the CSV handler.
 
         Parameters
         ----------
-        repos : list
-            List of repository objects (as returned by the GitHub Search API).
+        repos : list or iterable
+            List of repository objects (as returned by the GitHub Search API), or an
+            iterable of pages (lists of repository objects), e.g. from
+            `iter_search_pages`, which is consumed and written page by page.
         term : str
             Search term used to retrieve the repositories.
         prefix : str, optional
             Prefix to be added to the output CSV filename.
+        max_workers : int, optional
+            Number of concurrent enrichment calls. Default is `MAX_WORKERS`.
+        journal : CheckpointJournal, optional
+            Known metrics are taken from it instead of being fetched again, and
+            every newly enriched repository is recorded in it.
+        progress : ProgressTracker, optional
+            Receives the number of repositories enriched for `term`.
         """
         self.term = term
         self.csv_file = repos
         self.prefix = prefix
         self.repos = repos
+        self.max_workers = max_workers
+        self.journal = journal
+        self.progress = progress
         self.output_path: Optional[str] = None
 
-    def handling_to_save(self) -> None:
+    def handling_to_save(self) -> int:
         """
         Prepare output filename and trigger CSV export for the current repositories.
+
+        Returns
+        -------
+        int
+            Number of rows written.
         """
-        filename = f"{self.prefix}{self.term}_repos_{format_datetime()}.csv"
+        filename = f"{self.prefix}{self.term}_repos_{format_datetime()}{storage.extension()}"
         output_folder = os.path.join(root, "dataset/raw_data")
 
         if not os.path.exists(output_folder):
@@ -72,131 +196,220 @@ class HandleCsv:
         self.output_path = os.path.join(output_folder, filename)
 
         logger.info("Saving repository data to CSV: %s", self.output_path)
-        self.save_to_csv()
-        logger.info("Data successfully saved to %s", self.output_path)
+        if self.progress is not None and isinstance(self.repos, list):
+            self.progress.set_expected(self.term, len(self.repos))
+        rows = self.save_to_csv()
+        if rows:
+            logger.info("Data successfully saved to %s (%d rows)", self.output_path, rows)
+        return rows
+
+    def _batches(self) -> Iterator[List[Dict]]:
+        """Split `self.repos` into enrichment batches (pages are kept as they come)."""
+        if isinstance(self.repos, list):
+            for start in range(0, len(self.repos), STREAM_BATCH_SIZE):
+                yield self.repos[start: start + STREAM_BATCH_SIZE]
+        else:
+            yield from self.repos
 
-    def save_to_csv(self) -> None:
+    def save_to_csv(self) -> int:
         """
-        Save repositories data to a CSV file, including commits and collaborators information.
+        Save repositories data to a table, including commits and collaborators information.
+
+        Returns
+        -------
+        int
+            Number of rows written (0 if no file was created).
 
         Notes
         -----
         - Uses `self.repos` as the source of data.
         - Requires `self.output_path` to be set before calling this method.
+        - The format follows the extension of `self.output_path` (CSV, Parquet or
+          Feather, see `storage`); `handling_to_save` uses `STORAGE_FORMAT`.
+        - Repositories are enriched and written batch by batch (one page or
+          `STREAM_BATCH_SIZE` repositories); CSV batches are flushed and fsync'ed, so
+          memory stays bounded and an interrupted run keeps the rows written so far
+          in `<output_path>.partial`. The table is renamed to `self.output_path`
+          once complete.
+        - Commits and collaborators are fetched concurrently by the configured
+          backend (see `build_enricher`); rows are still written in the order of
+          `self.repos`.
+        - Metrics already known to `self.journal` are not fetched again.
+        - Repositories merged across terms carry a `search_terms` list, written as a
+          comma-separated `search_term` value; otherwise `self.term` is used.
         """
-        if not self.repos:
-            logger.warning("No repository data to save. CSV file will not be created.")
-            return
-
         if not self.output_path:
-            logger.error("Output path is not set. Aborting CSV save operation.")
-            return
-
-        with open(self.output_path, mode="w", newline="", encoding="utf-8") as file:
-            writer = csv.writer(file)
-            writer.writerow(
+            logger.error("Output path is not set. Aborting save operation.")
+            return 0
+
+        batches = (batch for batch in self._batches() if batch)
+        first_batch = next(batches, None)
+        if first_batch is None:
+            logger.warning("No repository data to save. Output file will not be created.")
+            return 0
+
+        # Written under a temporary name: an interrupted run leaves no partial table
+        # among the tables of the folder (see `storage.list_tables`).
+        partial_path = f"{self.output_path}{PARTIAL_SUFFIX}"
+        rows = 0
+        with storage.TableWriter(partial_path, fmt=storage.table_format(self.output_path)) as writer:
+            for batch in chain([first_batch], batches):
+                rows += self._write_batch(writer, batch)
+        os.replace(partial_path, self.output_path)
+
+        return rows
+
+    def _write_batch(self, writer: storage.TableWriter, batch: List[Dict]) -> int:
+        """Enrich a batch of repositories and write one row per repository."""
+        metrics = self._enrich(batch)
+
+        rows = []
+        for repo, repo_metrics in zip(batch, metrics):
+            name = repo["name"]
+            full_name = repo["full_name"]
+            total_commits = repo_metrics["total_commits"]
+            last_commit = repo["pushed_at"]
+            commits_2024 = repo_metrics["commits_2024"]
+            fork = repo["fork"]
+            forks = repo["forks"]
+            size = repo["size"]
+            score = repo["score"]
+            archived = repo["archived"]
+            disabled = repo["disabled"]
+            contributors_url = repo["contributors_url"]
+            collaborators_url = repo["collaborators_url"]
+            collaborators_count = repo_metrics["collaborators"]
+
+            rows.append(
                 [
-                    "name",
-                    "full_name",
-                    "URL",
-                    "desc.",
-                    "total_commits",
-                    "last_commit",
-                    "commits_2024",
-                    "stars",
-                    "fork",
-                    "forks",
-                    "lang",
-                    "size",
-                    "score",
-                    "template",
-                    "archived",
-                    "disabled",
-                    "contributors_url",
-                    "collaborators_url",
-                    "collaborators",
-                    "search_term",
+                    name,
+                    full_name,
+                    repo["html_url"],
+                    repo["description"],
+                    total_commits,
+                    last_commit,
+                    commits_2024,
+                    repo["stargazers_count"],
+                    fork,
+                    forks,
+                    repo["language"],
+                    size,
+                    score,
+                    repo["is_template"],
+                    archived,
+                    disabled,
+                    contributors_url,
+                    collaborators_url,
+                    collaborators_count,
+                    ",".join(repo.get("search_terms") or [self.term]),
                 ]
             )
 
-            for repo in self.repos:
-                owner = repo["owner"]["login"]
-                name = repo["name"]
-                full_name = repo["full_name"]
-                total_commits = count_total_commits(owner, name)
-                last_commit = repo["pushed_at"]
-                commits_2024 = count_commits_2024(owner, name)
-                fork = repo["fork"]
-                forks = repo["forks"]
-                size = repo["size"]
-                score = repo["score"]
-                archived = repo["archived"]
-                disabled = repo["disabled"]
-                contributors_url = repo["contributors_url"]
-                collaborators_url = repo["collaborators_url"]
-                collaborators_count = get_collaborators_count(owner, name)
-
-                writer.writerow(
-                    [
-                        name,
-                        full_name,
-                        repo["html_url"],
-                        repo["description"],
-                        total_commits,
-                        last_commit,
-                        commits_2024,
-                        repo["stargazers_count"],
-                        fork,
-                        forks,
-                        repo["language"],
-                        size,
-                        score,
-                        repo["is_template"],
-                        archived,
-                        disabled,
-                        contributors_url,
-                        collaborators_url,
-                        collaborators_count,
-                        self.term,
-                    ]
-                )
+        writer.write_rows(rows)
+        return len(batch)
+
+    def _enrich(self, repos: List[Dict]) -> List[Dict[str, int]]:
+        """
+        Return the metrics of every repository, fetching only those not in the journal.
+
+        Repositories being enriched by another term at the same time are claimed
+        in the journal; their metrics are awaited instead of fetched twice.
+        """
+        metrics: List[Optional[Dict[str, int]]] = [
+            self.journal.metrics_for(repo) if self.journal else None for repo in repos
+        ]
+        pending = [index for index, known in enumerate(metrics) if known is None]
+        if len(pending) < len(repos):
+            logger.info(
+                "Reusing known metrics for %d of %d repositories.",
+                len(repos) - len(pending),
+                len(repos),
+            )
+
+        if self.progress is not None:
+            self.progress.add_enriched(self.term, len(repos) - len(pending))
+
+        claimed = {}
+        if self.journal is not None:
+            claimed = {index: self.journal.claim(repos[index]) for index in pending}
+            pending = [index for index in pending if claimed[index] is None]
+
+        try:
+            fetched = build_enricher(self.max_workers).enrich(
+                [repos[index] for index in pending], on_repo=self._on_repo
+            )
+        finally:
+            if self.journal is not None:
+                self.journal.release([repos[index] for index in pending])
+
+        for index, repo_metrics in zip(pending, fetched):
+            metrics[index] = repo_metrics
+
+        for index, future in claimed.items():
+            if future is None:
+                continue
+            try:
+                metrics[index] = future.result()
+            except RuntimeError:
+                # The term that claimed it failed: fetch it here instead.
+                metrics[index] = build_enricher(1).enrich([repos[index]], on_repo=self.journal.record_repo)[0]
+            if self.progress is not None:
+                self.progress.add_enriched(self.term)
+        return metrics
+
+    def _on_repo(self, repo: Dict, metrics: Dict[str, int]) -> None:
+        """Checkpoint a newly enriched repository and count it in the progress."""
+        if self.journal is not None:
+            self.journal.record_repo(repo, metrics)
+        if self.progress is not None:
+            self.progress.add_enriched(self.term)
 
     def load_repos_from_csv(self, file_path: str) -> List[Dict]:
         """
-        Load repositories from an existing CSV file.
+        Load repositories from an existing table (CSV, Parquet or Feather).
 
         The `search_term` column is converted to a list, assuming comma-separated values.
 
         Parameters
         ----------
         file_path : str
-            Path to the CSV file containing repository data.
+            Path to the table containing repository data.
 
         Returns
         -------
         list of dict
-            List of repositories loaded from the CSV file.
+            List of repositories loaded from the table.
         """
-        repos: List[Dict] = []
-        with open(file_path, mode="r", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                # Convert search_term column to a list, assuming comma-separated values
-                row["search_term"] = (
-                    row.get("search_term", "").split(",") if row.get("search_term") else []
-                )
-                repos.append(row)
+        repos = storage.records(storage.read_table(file_path))
+        for row in repos:
+            # Convert search_term column to a list, assuming comma-separated values
+            row["search_term"] = row["search_term"].split(",") if row.get("search_term") else []
         return repos
 
 
-def search_github_repos(
+def build_search_query(search_term: str, qualifiers: str = DEFAULT_QUALIFIERS) -> str:
+    """Return the Search API query of a term restricted by the given qualifiers."""
+    return f"{search_term} in:name,description,topics, {qualifiers}"
+
+
+def iter_search_pages(
     search_term: str,
     sort: str = "stars",
     order: str = "desc",
     per_page: int = PER_PAGE,
-) -> Optional[List[Dict]]:
+    journal: Optional[CheckpointJournal] = None,
+    qualifiers: str = DEFAULT_QUALIFIERS,
+    max_results: int = MAX_RESP,
+    progress: Optional[ProgressTracker] = None,
+) -> Iterator[List[Dict]]:
     """
-    Search repositories on GitHub using the REST API, ensuring unique results.
+    Search repositories on GitHub page by page, yielding only unseen repositories.
+
+    Only the ids of the repositories already yielded are kept, so a caller writing
+    each page as it comes (the default per-term mode, see `HandleCsv`) keeps memory
+    flat regardless of `max_results`. `search_partitioned` and `collect_search_hits`
+    merge the pages by repository id first, so they hold every repository of the
+    term (or of all terms) in memory before anything is written.
 
     Parameters
     ----------
@@ -208,82 +421,357 @@ def search_github_repos(
         Sorting order: 'asc' for ascending, 'desc' for descending. Default is 'desc'.
     per_page : int, optional
         Number of results per page (max: 100). Default is `PER_PAGE`.
-
-    Returns
-    -------
-    list of dict or None
-        List of repository objects (at most `MAX_RESP`), or None in case of error.
+    journal : CheckpointJournal, optional
+        Pages already recorded are restored from it; new pages are recorded.
+    qualifiers : str, optional
+        `pushed:`/`stars:` qualifiers of the query. Default is `DEFAULT_QUALIFIERS`.
+    max_results : int, optional
+        Maximum number of repositories yielded. Default is `MAX_RESP`.
+    progress : ProgressTracker, optional
+        Receives every page of the term (and the expected number of repositories).
+
+    Yields
+    ------
+    list of dict
+        The new unique repository objects of each page (at most `max_results` overall).
     """
-    url = "https://api.github.com/search/repositories"
-    query = f"{search_term} in:name,description,topics, pushed:>{last_year_date} stars:>10"
+    url = f"{API_URL}/search/repositories"
+    # Slices of a partitioned term are journaled separately from the term itself.
+    journal_key = search_term if qualifiers == DEFAULT_QUALIFIERS else f"{search_term} | {qualifiers}"
 
     params = {
-        "q": query,
+        "q": build_search_query(search_term, qualifiers),
         "sort": sort,
         "order": order,
         "per_page": per_page,
     }
 
-    all_repositories: List[Dict] = []
     seen_repos = set()
     page = 1
 
     logger.info("Starting GitHub search for term '%s'.", search_term)
 
-    while len(all_repositories) < MAX_RESP:
+    while len(seen_repos) < max_results:
         params["page"] = page
-        try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-        except requests.RequestException as exc:
-            logger.error("Request error while searching repositories: %s", exc)
-            break
+        repositories = journal.page(journal_key, page) if journal else None
+        total_count = None
 
-        if response.status_code != 200:
-            logger.error(
-                "Error while searching repositories: %s - %s",
-                response.status_code,
-                response.text,
-            )
-            break
+        if repositories is not None:
+            logger.info("Page %d restored from the checkpoint journal.", page)
+        else:
+            try:
+                response = client.get(url, params=params, timeout=10)
+            except requests.RequestException as exc:
+                logger.error("Request error while searching repositories: %s", exc)
+                break
+
+            if response.status_code != 200:
+                logger.error(
+                    "Error while searching repositories: %s - %s",
+                    response.status_code,
+                    response.text,
+                )
+                break
 
-        data = response.json()
-        repositories = data.get("items", [])
+            data = response.json()
+            repositories = data.get("items", [])
+            if qualifiers == DEFAULT_QUALIFIERS and "total_count" in data:
+                total_count = min(data["total_count"], max_results)
+            if journal is not None:
+                journal.record_page(journal_key, page, repositories)
 
         if not repositories:
             logger.info("No more repositories returned by the API (page %d).", page)
             break
 
+        new_repositories = []
         for repo in repositories:
             repo_id = repo["id"]
-            if repo_id not in seen_repos:
+            if repo_id not in seen_repos and len(seen_repos) < max_results:
                 seen_repos.add(repo_id)
-                all_repositories.append(repo)
+                new_repositories.append(repo)
 
         logger.info(
             "Page %d loaded with %d repositories (%d unique accumulated).",
             page,
             len(repositories),
-            len(all_repositories),
+            len(seen_repos),
         )
+        if progress is not None:
+            progress.add_page(search_term, len(new_repositories), total_count)
+        yield new_repositories
 
         if len(repositories) < per_page:
             logger.info("Last page reached at page %d.", page)
             break
 
         page += 1
-        time.sleep(3)  # Avoid hitting API rate limits
 
-    limited_results = all_repositories[:MAX_RESP]
     logger.info(
-        "Search for '%s' finished with %d unique repositories (limited to %d).",
+        "Search for '%s' finished with %d unique repositories (limit %d).",
+        search_term,
+        len(seen_repos),
+        max_results,
+    )
+
+
+def search_github_repos(
+    search_term: str,
+    sort: str = "stars",
+    order: str = "desc",
+    per_page: int = PER_PAGE,
+    journal: Optional[CheckpointJournal] = None,
+) -> Optional[List[Dict]]:
+    """
+    Search repositories on GitHub using the REST API, ensuring unique results.
+
+    Collects every page of `iter_search_pages` in memory; prefer the generator when
+    the results are processed incrementally.
+
+    Parameters
+    ----------
+    search_term : str
+        Search term (e.g., 'EdgeAI').
+    sort : str, optional
+        Sorting criterion ('stars', 'forks', etc.). Default is 'stars'.
+    order : str, optional
+        Sorting order: 'asc' for ascending, 'desc' for descending. Default is 'desc'.
+    per_page : int, optional
+        Number of results per page (max: 100). Default is `PER_PAGE`.
+    journal : CheckpointJournal, optional
+        Pages already recorded are restored from it; new pages are recorded.
+
+    Returns
+    -------
+    list of dict or None
+        List of repository objects (at most `MAX_RESP`), or None in case of error.
+    """
+    pages = iter_search_pages(search_term, sort, order, per_page, journal)
+    return list(chain.from_iterable(pages))
+
+
+def search_total_count(search_term: str, qualifiers: str) -> Optional[int]:
+    """
+    Return the number of repositories matching a query, with a single small request.
+
+    Parameters
+    ----------
+    search_term : str
+        Search term.
+    qualifiers : str
+        `pushed:`/`stars:` qualifiers of the query.
+
+    Returns
+    -------
+    int or None
+        The `total_count` reported by the Search API, or None in case of error.
+    """
+    params = {"q": build_search_query(search_term, qualifiers), "per_page": 1}
+    try:
+        response = client.get(f"{API_URL}/search/repositories", params=params, timeout=10)
+    except requests.RequestException as exc:
+        logger.error("Request error while counting search results: %s", exc)
+        return None
+
+    if response.status_code != 200:
+        logger.error(
+            "Error while counting search results: %s - %s",
+            response.status_code,
+            response.text,
+        )
+        return None
+    return response.json().get("total_count", 0)
+
+
+def _slice_qualifiers(first: date, last: date, min_stars: int, max_stars: Optional[int]) -> str:
+    stars = f">={min_stars}" if max_stars is None else f"{min_stars}..{max_stars}"
+    return f"pushed:{first.isoformat()}..{last.isoformat()} stars:{stars}"
+
+
+def partition_search_term(search_term: str) -> List[Tuple[str, int]]:
+    """
+    Split the query of a term into slices of at most `SEARCH_RESULT_CAP` results.
+
+    The `pushed:` window of the study (the last year) is halved until each slice
+    fits; a single day that is still too large is split by `stars:` ranges. Each
+    candidate slice costs one `per_page=1` request to read its `total_count`.
+
+    Parameters
+    ----------
+    search_term : str
+        Search term.
+
+    Returns
+    -------
+    list of (str, int)
+        Qualifiers and result count of each non-empty slice, in date order. A
+        query under the cap is returned as the single `DEFAULT_QUALIFIERS` slice.
+    """
+    total = search_total_count(search_term, DEFAULT_QUALIFIERS)
+    if total is None or total <= SEARCH_RESULT_CAP:
+        return [(DEFAULT_QUALIFIERS, total or 0)]
+
+    first_day = datetime.strptime(last_year_date, "%Y-%m-%d").date() + timedelta(days=1)
+    pending = [(first_day, datetime.now().date(), MIN_STARS, None)]
+    slices: List[Tuple[tuple, str, int]] = []
+
+    while pending:
+        first, last, min_stars, max_stars = pending.pop()
+        qualifiers = _slice_qualifiers(first, last, min_stars, max_stars)
+        count = search_total_count(search_term, qualifiers)
+
+        if count is not None and count > SEARCH_RESULT_CAP:
+            if first < last:
+                middle = first + (last - first) // 2
+                pending.append((middle + timedelta(days=1), last, min_stars, max_stars))
+                pending.append((first, middle, min_stars, max_stars))
+                continue
+            if max_stars is None or min_stars < max_stars:
+                middle = min_stars * 4 if max_stars is None else (min_stars + max_stars) // 2
+                pending.append((first, last, middle + 1, max_stars))
+                pending.append((first, last, min_stars, middle))
+                continue
+            logger.warning(
+                "Slice '%s' of '%s' still has %d results; only %d are reachable.",
+                qualifiers,
+                search_term,
+                count,
+                SEARCH_RESULT_CAP,
+            )
+
+        if count is None or count > 0:
+            slices.append(((first, min_stars), qualifiers, count or 0))
+
+    slices.sort(key=lambda item: item[0])
+    logger.info(
+        "Query for '%s' (%d results) partitioned into %d slices (~%d pages).",
         search_term,
-        len(all_repositories),
-        len(limited_results),
+        total,
+        len(slices),
+        sum(-(-min(count, SEARCH_RESULT_CAP) // PER_PAGE) for _, _, count in slices),
     )
-    return limited_results
+    return [(qualifiers, count) for _, qualifiers, count in slices]
+
+
+def search_partitioned(
+    search_term: str,
+    journal: Optional[CheckpointJournal] = None,
+    progress: Optional[ProgressTracker] = None,
+) -> List[Dict]:
+    """
+    Search a term beyond the 1000-result cap by running its query slices in parallel.
+
+    Parameters
+    ----------
+    search_term : str
+        Search term.
+    journal : CheckpointJournal, optional
+        Checkpoint journal for the search pages of every slice.
+    progress : ProgressTracker, optional
+        Receives the pages of every slice under `search_term`.
+
+    Returns
+    -------
+    list of dict
+        Unique repositories of all slices, merged by repository id in slice order.
+    """
+    slices = partition_search_term(search_term)
+    if progress is not None:
+        progress.set_expected(search_term, sum(min(count, SEARCH_RESULT_CAP) for _, count in slices))
+
+    def _run(qualifiers: str) -> List[Dict]:
+        pages = iter_search_pages(
+            search_term,
+            per_page=PER_PAGE,
+            journal=journal,
+            qualifiers=qualifiers,
+            max_results=SEARCH_RESULT_CAP,
+            progress=progress,
+        )
+        return list(chain.from_iterable(pages))
+
+    with ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="search") as executor:
+        results = list(executor.map(_run, [qualifiers for qualifiers, _ in slices]))
+
+    merged: Dict[int, Dict] = {}
+    for repos in results:
+        for repo in repos:
+            merged.setdefault(repo["id"], repo)
+
+    logger.info(
+        "Partitioned search for '%s' finished with %d unique repositories from %d slices.",
+        search_term,
+        len(merged),
+        len(slices),
+    )
+    return list(merged.values())
+
+
+def _last_page_number(response: requests.Response) -> Optional[int]:
+    """Return the page number of the `rel="last"` entry of the Link header, if any."""
+    last_url = response.links.get("last", {}).get("url")
+    if not last_url:
+        return None
+    page = parse_qs(urlparse(last_url).query).get("page")
+    return int(page[0]) if page else None
 
 
-def count_total_commits(owner: str, repo_name: str) -> int:
+def count_via_link_header(url: str, params: Dict, label: str) -> int:
+    """
+    Count the items of a paginated GitHub endpoint with a single request.
+
+    The endpoint is requested with `per_page=1`, so the number of the last page
+    advertised in the `Link` header equals the number of items. When there is no
+    `Link` header the whole result fits in that first page.
+
+    Parameters
+    ----------
+    url : str
+        Endpoint URL (e.g. the `/commits` URL of a repository).
+    params : dict
+        Extra query parameters (e.g. `since`/`until`).
+    label : str
+        Description used in log messages (e.g. "commits for <repo>").
+
+    Returns
+    -------
+    int
+        Number of items, or 0 in case of error.
+    """
+    try:
+        response = client.get(url, params={**params, "per_page": 1})
+    except requests.RequestException as exc:
+        logger.error("Request error while fetching %s: %s", label, exc)
+        return 0
+
+    if response.status_code == 204:
+        # e.g. the contributors of an empty repository.
+        return 0
+    if response.status_code == 409:
+        # "Git Repository is empty.": the commits of a repository without commits.
+        logger.debug("No %s: %s", label, response.text)
+        return 0
+    if response.status_code != 200:
+        logger.error(
+            "Error while fetching %s: %s - %s",
+            label,
+            response.status_code,
+            response.text,
+        )
+        return 0
+
+    last_page = _last_page_number(response)
+    if last_page is not None:
+        return last_page
+    return len(response.json())
+
+
+def _check_count_mode(mode: str) -> None:
+    if mode not in COUNT_MODES:
+        raise ValueError(f"Unknown count mode '{mode}'. Expected one of {COUNT_MODES}.")
+
+
+def count_total_commits(owner: str, repo_name: str, mode: str = COMMIT_COUNT_MODE) -> int:
     """
     Count the total number of commits in a GitHub repository.
 
@@ -293,22 +781,30 @@ def count_total_commits(owner: str, repo_name: str) -> int:
         Repository owner (GitHub username or organization).
     repo_name : str
         Repository name.
+    mode : str, optional
+        'link' reads the count from the Link header of one request; 'walk'
+        downloads every commit page. Default is `COMMIT_COUNT_MODE`.
 
     Returns
     -------
     int
         Total number of commits in the repository.
     """
-    commits_url = f"https://api.github.com/repos/{owner}/{repo_name}/commits"
+    _check_count_mode(mode)
+    commits_url = f"{API_URL}/repos/{owner}/{repo_name}/commits"
+
+    if mode == "link":
+        total_commits = count_via_link_header(commits_url, {}, f"commits for {repo_name}")
+        logger.debug("Total commits for %s/%s: %d", owner, repo_name, total_commits)
+        return total_commits
+
     params = {"per_page": 100}
     total_commits = 0
     page = 1
 
     while True:
         try:
-            response = requests.get(
-                commits_url, headers=headers, params={**params, "page": page}
-            )
+            response = client.get(commits_url, params={**params, "page": page})
         except requests.RequestException as exc:
             logger.error(
                 "Request error while fetching commits for %s: %s", repo_name, exc
@@ -334,7 +830,7 @@ def count_total_commits(owner: str, repo_name: str) -> int:
     return total_commits
 
 
-def count_commits_2024(owner: str, repo_name: str) -> int:
+def count_commits_2024(owner: str, repo_name: str, mode: str = COMMIT_COUNT_MODE) -> int:
     """
     Count the number of commits in the year 2024 for a GitHub repository.
 
@@ -344,26 +840,35 @@ def count_commits_2024(owner: str, repo_name: str) -> int:
         Repository owner (GitHub username or organization).
     repo_name : str
         Repository name.
+    mode : str, optional
+        'link' reads the count from the Link header of one request; 'walk'
+        downloads every commit page. Default is `COMMIT_COUNT_MODE`.
 
     Returns
     -------
     int
         Number of commits in 2024.
     """
-    commits_url = f"https://api.github.com/repos/{owner}/{repo_name}/commits"
-    params = {
-        "since": "2024-01-01T00:00:00Z",
-        "until": "2024-12-31T23:59:59Z",
-        "per_page": 100,
-    }
+    _check_count_mode(mode)
+    commits_url = f"{API_URL}/repos/{owner}/{repo_name}/commits"
+    window = COMMITS_2024_WINDOW
+
+    if mode == "link":
+        total_commits_2024 = count_via_link_header(
+            commits_url, window, f"2024 commits for {repo_name}"
+        )
+        logger.debug(
+            "Total commits in 2024 for %s/%s: %d", owner, repo_name, total_commits_2024
+        )
+        return total_commits_2024
+
+    params = {**window, "per_page": 100}
     total_commits_2024 = 0
     page = 1
 
     while True:
         try:
-            response = requests.get(
-                commits_url, headers=headers, params={**params, "page": page}
-            )
+            response = client.get(commits_url, params={**params, "page": page})
         except requests.RequestException as exc:
             logger.error(
                 "Request error while fetching 2024 commits for %s: %s", repo_name, exc
@@ -391,7 +896,12 @@ def count_commits_2024(owner: str, repo_name: str) -> int:
     return total_commits_2024
 
 
-def get_collaborators_count(owner: str, repo_name: str) -> int:
+def get_collaborators_count(
+    owner: str,
+    repo_name: str,
+    mode: str = CONTRIBUTOR_COUNT_MODE,
+    anon: bool = CONTRIBUTORS_ANON,
+) -> int:
     """
     Count the number of collaborators (contributors) in a GitHub repository.
 
@@ -401,25 +911,49 @@ def get_collaborators_count(owner: str, repo_name: str) -> int:
         Repository owner (GitHub username or organization).
     repo_name : str
         Repository name.
+    mode : str, optional
+        'link' reads the exact count from the `Link` header of one `per_page=1`
+        request; 'page' counts the first page of 100 full contributor objects.
+        Default is `CONTRIBUTOR_COUNT_MODE`.
+    anon : bool, optional
+        Include anonymous contributors (`anon=true`). GitHub links at most 500
+        author emails to users, so larger repositories need it for a full count.
+        Default is `CONTRIBUTORS_ANON`.
 
     Returns
     -------
     int
         Number of collaborators (contributors), or 0 in case of error.
     """
+    if mode not in CONTRIBUTOR_COUNT_MODES:
+        raise ValueError(
+            f"Unknown contributor count mode '{mode}'. Expected one of {CONTRIBUTOR_COUNT_MODES}."
+        )
+
     collaborators_url = (
-        f"https://api.github.com/repos/{owner}/{repo_name}/contributors"
+        f"{API_URL}/repos/{owner}/{repo_name}/contributors"
     )
-    params = {"per_page": 100}
+    params = {"anon": "true"} if anon else {}
+
+    if mode == "link":
+        collaborators = count_via_link_header(
+            collaborators_url, params, f"collaborators for {owner}/{repo_name}"
+        )
+        logger.debug("Collaborators for %s/%s: %d", owner, repo_name, collaborators)
+        return collaborators
+
+    params["per_page"] = 100
 
     try:
-        response = requests.get(collaborators_url, headers=headers, params=params)
+        response = client.get(collaborators_url, params=params)
     except requests.RequestException as exc:
         logger.error(
             "Request error while fetching collaborators for %s: %s", repo_name, exc
         )
         return 0
 
+    if response.status_code == 204:
+        return 0
     if response.status_code == 200:
         collaborators = len(response.json())
         logger.debug("Collaborators for %s/%s: %d", owner, repo_name, collaborators)
@@ -434,7 +968,81 @@ def get_collaborators_count(owner: str, repo_name: str) -> int:
         return 0
 
 
-def search_and_save_management(term: str) -> None:
+# Per-repository metrics computed during enrichment, keyed by CSV column.
+ENRICHMENT_FETCHERS = {
+    "total_commits": count_total_commits,
+    "commits_2024": count_commits_2024,
+    "collaborators": get_collaborators_count,
+}
+
+
+def load_search_terms(path: str = KEY_WORDS_PATH) -> List[str]:
+    """
+    Read the search terms of the study from the key-words file.
+
+    Parameters
+    ----------
+    path : str, optional
+        File of quoted, comma-separated terms (e.g. `"edge ai",`), one or more
+        per line. Default is `KEY_WORDS_PATH`.
+
+    Returns
+    -------
+    list of str
+        Terms in file order, without duplicates or blanks.
+    """
+    with open(path, mode="r", encoding="utf-8") as file:
+        fields = chain.from_iterable(csv.reader(file, skipinitialspace=True))
+        terms = [field.strip() for field in fields if field.strip()]
+    return list(dict.fromkeys(terms))
+
+
+def build_enricher(max_workers: int = MAX_WORKERS, backend: Optional[str] = None):
+    """
+    Create the enrichment backend selected by `ENRICHMENT_BACKEND`.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Number of concurrent calls (or GraphQL queries).
+    backend : str, optional
+        'rest' or 'graphql'. Default is `ENRICHMENT_BACKEND`.
+
+    Returns
+    -------
+    EnrichmentEngine or GraphQLEnricher
+        An object whose `enrich(repos, on_repo=None)` returns the
+        `ENRICHMENT_FETCHERS` fields for each repository.
+    """
+    backend = backend or ENRICHMENT_BACKEND
+    if backend not in ENRICHMENT_BACKENDS:
+        raise ValueError(
+            f"Unknown enrichment backend '{backend}'. Expected one of {ENRICHMENT_BACKENDS}."
+        )
+
+    if backend == "graphql":
+        return GraphQLEnricher(
+            client.post,
+            f"{API_URL}/graphql",
+            COMMITS_2024_WINDOW,
+            rest_fetchers={"collaborators": get_collaborators_count},
+            fallback_fetchers={
+                "total_commits": count_total_commits,
+                "commits_2024": count_commits_2024,
+            },
+            batch_size=GRAPHQL_BATCH_SIZE,
+            max_workers=max_workers,
+            telemetry=telemetry,
+        )
+    return EnrichmentEngine(ENRICHMENT_FETCHERS, max_workers=max_workers, telemetry=telemetry)
+
+
+def search_and_save_management(
+    term: str,
+    journal: Optional[CheckpointJournal] = None,
+    partition: bool = False,
+    progress: Optional[ProgressTracker] = None,
+) -> None:
     """
     Perform GitHub search for a given term and save the results to a CSV file.
 
@@ -442,59 +1050,333 @@ def search_and_save_management(term: str) -> None:
     ----------
     term : str
         Search term to be used in the GitHub Search API.
+    journal : CheckpointJournal, optional
+        Checkpoint journal; a term whose CSV was already written is skipped.
+    partition : bool, optional
+        Split the query into slices to go beyond the 1000-result Search API cap.
+    progress : ProgressTracker, optional
+        Receives the pages fetched and repositories enriched for the term.
     """
+    if journal is not None and journal.output_for(term):
+        logger.info("Term '%s' already saved to %s, skipping.", term, journal.output_for(term))
+        if progress is not None:
+            progress.finish_term(term)
+        return
+
     logger.info("Searching repositories for term '%s'...", term)
+    if progress is not None:
+        progress.start_term(term)
 
-    repos = search_github_repos(term, per_page=PER_PAGE)
-    if not repos:
+    with telemetry.span("term", term):
+        if partition:
+            repos = search_partitioned(term, journal=journal, progress=progress)
+        else:
+            # Pages are enriched and written as they arrive instead of being collected first.
+            repos = iter_search_pages(term, per_page=PER_PAGE, journal=journal, progress=progress)
+        handler = HandleCsv(repos, term, prefix="RAW_", journal=journal, progress=progress)
+        rows = handler.handling_to_save()
+    if progress is not None:
+        progress.finish_term(term)
+    if not rows:
         logger.warning("No repositories found for term '%s'.", term)
         return
 
-    handler = HandleCsv(repos, term, prefix="RAW_")
-    handler.handling_to_save()
+    if journal is not None:
+        journal.record_output(term, handler.output_path)
+
+
+def run_terms(
+    search_terms: List[str],
+    journal: Optional[CheckpointJournal] = None,
+    partition: bool = False,
+    term_workers: int = TERM_WORKERS,
+    progress: Optional[ProgressTracker] = None,
+) -> List[str]:
+    """
+    Mine several terms concurrently, one CSV per term.
+
+    All terms share the client, hence one rate-limit scheduler and one in-flight
+    request budget (`MAX_IN_FLIGHT`): adding terms adds queued work, not load.
+
+    Parameters
+    ----------
+    search_terms : list of str
+        Search terms to be used in the GitHub Search API.
+    journal : CheckpointJournal, optional
+        Checkpoint journal shared by all terms.
+    partition : bool, optional
+        Split each query into slices to go beyond the 1000-result Search API cap.
+    term_workers : int, optional
+        Terms mined at the same time. `1` mines them in sequence.
+    progress : ProgressTracker, optional
+        Per-term progress of the run.
+
+    Returns
+    -------
+    list of str
+        Terms that failed (they are not journaled, so `--resume` retries them).
+    """
+    failed = []
+
+    def _run(term: str) -> None:
+        search_and_save_management(term, journal=journal, partition=partition, progress=progress)
+
+    with ThreadPoolExecutor(max_workers=max(1, term_workers), thread_name_prefix="term") as executor:
+        futures = {executor.submit(_run, term): term for term in search_terms}
+        for future in as_completed(futures):
+            term = futures[future]
+            try:
+                future.result()
+            except Exception:
+                logger.exception("Mining failed for term '%s'.", term)
+                failed.append(term)
+
+    return failed
+
+
+def collect_search_hits(
+    search_terms: List[str],
+    journal: Optional[CheckpointJournal] = None,
+    partition: bool = False,
+    progress: Optional[ProgressTracker] = None,
+    term_workers: int = 1,
+) -> Tuple[List[Dict], int]:
+    """
+    Search every term and merge the hits by GitHub repository id.
+
+    Parameters
+    ----------
+    search_terms : list of str
+        Search terms to be used in the GitHub Search API.
+    journal : CheckpointJournal, optional
+        Checkpoint journal for the search pages.
+    partition : bool, optional
+        Split each query into slices to go beyond the 1000-result Search API cap.
+    progress : ProgressTracker, optional
+        Receives the search pages of every term.
+    term_workers : int, optional
+        Terms searched at the same time; hits are merged in term order regardless.
+
+    Returns
+    -------
+    tuple of (list of dict, int)
+        Unique repositories, in order of first appearance, each with a
+        `search_terms` list of the terms that matched it; and the total number of
+        hits before merging.
+    """
+    def _search(term: str) -> List[Dict]:
+        logger.info("Searching repositories for term '%s'...", term)
+        with telemetry.span("search", term):
+            if partition:
+                repos = search_partitioned(term, journal=journal, progress=progress)
+            else:
+                pages = iter_search_pages(term, per_page=PER_PAGE, journal=journal, progress=progress)
+                repos = list(chain.from_iterable(pages))
+        if progress is not None:
+            progress.finish_term(term)
+        return repos
+
+    with ThreadPoolExecutor(max_workers=max(1, term_workers), thread_name_prefix="term") as executor:
+        results = list(executor.map(_search, search_terms))
+
+    merged: Dict[int, Dict] = {}
+    total_hits = 0
+    for term, repos in zip(search_terms, results):
+        total_hits += len(repos)
+        for repo in repos:
+            entry = merged.setdefault(repo["id"], {**repo, "search_terms": []})
+            entry["search_terms"].append(term)
+
+    return list(merged.values()), total_hits
+
+
+def _enrichment_requests() -> int:
+    """Number of non-search API requests sent so far by the shared client."""
+    endpoints = client.stats.summary()["endpoints"]
+    return sum(values["requests"] for name, values in endpoints.items() if name != "search")
+
+
+def search_dedup_and_save_management(
+    search_terms: List[str],
+    journal: Optional[CheckpointJournal] = None,
+    partition: bool = False,
+    progress: Optional[ProgressTracker] = None,
+    term_workers: int = 1,
+) -> None:
+    """
+    Search all terms first, then enrich each unique repository exactly once.
+
+    The result is a single CSV whose `search_term` column lists every term that
+    matched the repository (comma-separated).
+
+    Parameters
+    ----------
+    search_terms : list of str
+        Search terms to be used in the GitHub Search API.
+    journal : CheckpointJournal, optional
+        Checkpoint journal for search pages and enriched repositories.
+    partition : bool, optional
+        Split each query into slices to go beyond the 1000-result Search API cap.
+    progress : ProgressTracker, optional
+        Receives the search pages of every term, then the enrichment of "all-terms".
+    term_workers : int, optional
+        Terms searched at the same time.
+    """
+    if journal is not None and journal.output_for("all-terms"):
+        logger.info("Merged CSV already saved to %s, skipping.", journal.output_for("all-terms"))
+        return
+
+    repos, total_hits = collect_search_hits(
+        search_terms,
+        journal=journal,
+        partition=partition,
+        progress=progress,
+        term_workers=term_workers,
+    )
+    if not repos:
+        logger.warning("No repositories found for any of the %d terms.", len(search_terms))
+        return
+
+    before = _enrichment_requests()
+    handler = HandleCsv(repos, "all-terms", prefix="RAW_", journal=journal, progress=progress)
+    with telemetry.span("enrichment", "all-terms"):
+        handler.handling_to_save()
+    if progress is not None:
+        progress.finish_term("all-terms")
+    spent = _enrichment_requests() - before
+    if journal is not None:
+        journal.record_output("all-terms", handler.output_path)
+
+    skipped = total_hits - len(repos)
+    per_repo = spent / len(repos) if spent else 0.0
+    logger.info(
+        "Cross-term deduplication: %d search hits -> %d unique repositories. "
+        "%d enrichments skipped, ~%d API calls saved (%.1f calls/repo).",
+        total_hits,
+        len(repos),
+        skipped,
+        round(skipped * per_repo),
+        per_repo,
+    )
 
 
 def main() -> None:
     """
     Entry point for the mining script.
 
-    Iterates over a predefined list of EdgeAI-related search terms, retrieves
-    repositories from GitHub, and stores the results as CSV files in
-    `dataset/raw_data`.
-    """
-    search_terms = [
-        "edge ai",
-        "edge_ai",
-        "edgeiot",
-        "edge iot",
-        "edge-tpu",
-        "edgetpu",
-        "edge tpu",
-        "edge_tpu",
-        "tiny-ml",
-        "tinyml",
-        "tiny ml",
-        "tiny_ml",
-        "edge-impulse",
-        "edgeimpulse",
-        "edge impulse",
-        "edge_impulse",
-        "edge-architecture",
-        "edgearchitecture",
-        "edge architecture",
-        "edge_architecture",
-        "edge-ai-architecture",
-        "edgeaiarchitecture",
-        "edge ai architecture",
-        "edge_ai_architecture",
-    ]
-
-    logger.info("Starting GitHub mining for %d search terms.", len(search_terms))
-
-    for term in search_terms:
-        search_and_save_management(term)
-
-    logger.info("GitHub mining process completed for all terms.")
+    Reads the EdgeAI-related search terms from the key-words file (`--terms-file`),
+    retrieves repositories from GitHub, and stores the results as CSV files in
+    `dataset/raw_data`. Up to `--term-workers` terms are mined concurrently under
+    one shared rate-limit and in-flight request budget, and the progress of each
+    term (pages, repositories enriched, ETA) is logged periodically.
+
+    Every request and every term/repository span is recorded by `telemetry`
+    (as JSONL with `--telemetry`); a summary of where the time went is logged at
+    the end.
+
+    With `--mode dedup`, the hits of all terms are merged by repository id before
+    enrichment, so each repository is enriched once and a single CSV is written.
+
+    Completed pages, repositories and terms are recorded in a checkpoint journal;
+    `--resume` continues an interrupted run from it, and `--since` reuses the
+    metrics of a previous snapshot for repositories not pushed to since.
+
+    With `--partition`, each query is split by `pushed:` date (then `stars:`)
+    ranges into slices under the 1000-result Search API cap, searched in parallel.
+    """
+    parser = argparse.ArgumentParser(description="Mine EdgeAI repositories from GitHub.")
+    parser.add_argument(
+        "--mode",
+        choices=("per-term", "dedup"),
+        default="per-term",
+        help="'per-term' writes one CSV per term (default); 'dedup' enriches each "
+             "repository once across all terms and writes a single CSV.",
+    )
+    parser.add_argument(
+        "--journal",
+        default=os.path.join(root, "dataset", "mining_journal.jsonl"),
+        help="Checkpoint journal file (JSONL).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume the run recorded in --journal instead of starting a new one.",
+    )
+    parser.add_argument(
+        "--since",
+        metavar="SNAPSHOT",
+        help="CSV file or folder of a previous run; repositories whose pushed_at did "
+             "not change reuse its metrics instead of being re-enriched.",
+    )
+    parser.add_argument(
+        "--partition",
+        action="store_true",
+        help="Split queries by pushed date/stars ranges to collect more than the "
+             "1000 results the Search API returns per query.",
+    )
+    parser.add_argument(
+        "--telemetry",
+        metavar="PATH",
+        default=TELEMETRY_PATH or None,
+        help="Append one JSONL record per request and per span to PATH "
+             "(default: TELEMETRY_PATH). A summary is logged in any case.",
+    )
+    parser.add_argument(
+        "--terms-file",
+        default=KEY_WORDS_PATH,
+        help="File of quoted, comma-separated search terms (default: key-words).",
+    )
+    parser.add_argument(
+        "--term-workers",
+        type=int,
+        default=TERM_WORKERS,
+        help="Number of terms mined concurrently (default: TERM_WORKERS).",
+    )
+    args = parser.parse_args()
+
+    search_terms = load_search_terms(args.terms_file)
+    if args.telemetry:
+        telemetry.open(args.telemetry)
+    journal = CheckpointJournal(args.journal, resume=args.resume)
+    if args.since:
+        journal.load_snapshot(args.since)
+
+    logger.info(
+        "Starting GitHub mining for %d search terms (%d at a time, %d requests in flight).",
+        len(search_terms),
+        args.term_workers,
+        MAX_IN_FLIGHT,
+    )
+
+    failed: List[str] = []
+    try:
+        with ProgressTracker(search_terms, interval=PROGRESS_INTERVAL) as progress:
+            if args.mode == "dedup":
+                search_dedup_and_save_management(
+                    search_terms,
+                    journal=journal,
+                    partition=args.partition,
+                    progress=progress,
+                    term_workers=args.term_workers,
+                )
+            else:
+                failed = run_terms(
+                    search_terms,
+                    journal=journal,
+                    partition=args.partition,
+                    term_workers=args.term_workers,
+                    progress=progress,
+                )
+    finally:
+        journal.close()
+        telemetry.close()
+
+    if failed:
+        logger.error("Mining failed for %d terms (rerun with --resume): %s", len(failed), failed)
+    else:
+        logger.info("GitHub mining process completed for all terms.")
+    logger.info("HTTP client statistics:\n%s", client.report())
+    logger.info("Where the time went:\n%s", telemetry.report())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,749 @@
+"""
+Performance benchmarks for the mining pipeline, run against the local mock GitHub API,
+and for the data treatment stages, run on the fixtures of a previous run.
+
+Usage:
+  poetry run python benchmark.py enrichment --repos 200 --latency 0.02 --workers 1 8 16
+  poetry run python benchmark.py commit-count --repos 100
+  poetry run python benchmark.py cache --repos 100
+  poetry run python benchmark.py backends --repos 200
+  poetry run python benchmark.py partition --repos 3000
+  poetry run python benchmark.py contributors --repos 200
+  poetry run python benchmark.py mining --latency 0.02 --term-workers 4
+  poetry run python benchmark.py language --rows 5000 --workers 1 4
+  poetry run python benchmark.py exclusion --rows 1000000
+  poetry run python benchmark.py exclusion-filter --rows 200000
+  poetry run python benchmark.py dedup --rows 1000000 --chunksize 100000
+  poetry run python benchmark.py merge --rows 1000000
+  poetry run python benchmark.py concat --copies 20 --workers 1 4
+  poetry run python benchmark.py rules --rows 1000000
+  poetry run python benchmark.py diff --rows 1000000
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from functools import partial
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+# `api_search` reads these at import time; the mock server does not need a token.
+os.environ.setdefault("PER_PAGE", "50")
+os.environ.setdefault("MAX_RESP", "400")
+# Benchmarks must hit the mock server, not a response cache left by a previous run.
+os.environ["HTTP_CACHE_PATH"] = ""
+
+import api_search  # noqa: E402
+import data_treatment  # noqa: E402
+import language  # noqa: E402
+from dedup import merge_duplicate_repos, stream_drop_duplicates  # noqa: E402
+from exclusion import ExclusionMatcher  # noqa: E402
+from language_cache import LanguageCache  # noqa: E402
+from mock_github import MockGitHub, repos_from_csv, synthetic_repos  # noqa: E402
+from rate_limit import TokenBucket  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from rules import RULES_PATH, RuleSet  # noqa: E402
+import snapshot_diff  # noqa: E402
+import storage  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "dataset", "_raw_data-[experiment_used]"
+)
+
+
+def bench_enrichment(args: argparse.Namespace) -> None:
+    """Time `HandleCsv.save_to_csv` for each worker count and report the speedup."""
+    repos = synthetic_repos(args.repos, seed=args.seed)
+
+    with MockGitHub(repos, latency=args.latency) as server, tempfile.TemporaryDirectory() as tmp:
+        api_search.API_URL = server.url
+        baseline = None
+        outputs = []
+
+        print(f"Enrichment of {len(repos)} repositories (latency {args.latency * 1000:.0f} ms/request)")
+        for workers in args.workers:
+            handler = api_search.HandleCsv(repos, "bench", max_workers=workers)
+            handler.output_path = os.path.join(tmp, f"workers_{workers}.csv")
+            api_search.client.stats.reset()
+
+            start = time.perf_counter()
+            handler.save_to_csv()
+            elapsed = time.perf_counter() - start
+
+            baseline = baseline or elapsed
+            with open(handler.output_path, encoding="utf-8") as file:
+                outputs.append(file.read())
+            summary = api_search.client.stats.summary()
+            print(
+                f"  workers={workers:<4d} {elapsed:8.2f} s  speedup x{baseline / elapsed:.1f}"
+                f"  ({summary['requests']} requests, {summary['connections']} connections)"
+            )
+
+        identical = all(output == outputs[0] for output in outputs)
+        print(f"  identical output across runs: {identical}")
+
+
+def bench_commit_count(args: argparse.Namespace) -> None:
+    """Cross-check 'link' against 'walk' commit counting and compare request counts."""
+    repos = synthetic_repos(args.repos, seed=args.seed)
+
+    with MockGitHub(repos, latency=args.latency) as server:
+        api_search.API_URL = server.url
+        print(f"Commit counting for {len(repos)} repositories")
+
+        counts = {}
+        for mode in api_search.COUNT_MODES:
+            server.reset_counters()
+            start = time.perf_counter()
+            counts[mode] = [
+                (
+                    api_search.count_total_commits(repo["owner"]["login"], repo["name"], mode=mode),
+                    api_search.count_commits_2024(repo["owner"]["login"], repo["name"], mode=mode),
+                )
+                for repo in repos
+            ]
+            elapsed = time.perf_counter() - start
+            print(
+                f"  mode={mode:<5s} {server.requests:7d} requests "
+                f"({server.requests / len(repos):.1f}/repo)  {elapsed:8.2f} s"
+            )
+
+        expected = [(repo["_commits"], repo["_commits_2024"]) for repo in repos]
+        for mode, values in counts.items():
+            mismatches = sum(value != truth for value, truth in zip(values, expected))
+            print(f"  mode={mode:<5s} mismatches against fixtures: {mismatches}")
+
+
+def bench_cache(args: argparse.Namespace) -> None:
+    """Run the same enrichment cold, warm (fresh entries) and stale (conditional requests)."""
+    repos = synthetic_repos(args.repos, seed=args.seed)
+
+    with MockGitHub(repos, latency=args.latency) as server, tempfile.TemporaryDirectory() as tmp:
+        api_search.API_URL = server.url
+        cache = ResponseCache(os.path.join(tmp, "cache.sqlite"))
+        api_search.client.cache = cache
+        print(f"Response cache over {len(repos)} repositories (latency {args.latency * 1000:.0f} ms/request)")
+
+        try:
+            for label, ttl in (("cold", 3600), ("warm", 3600), ("stale", 0)):
+                cache.ttl = ttl
+                server.reset_counters()
+                api_search.client.stats.reset()
+                handler = api_search.HandleCsv(repos, "bench")
+                handler.output_path = os.path.join(tmp, f"{label}.csv")
+
+                start = time.perf_counter()
+                handler.save_to_csv()
+                elapsed = time.perf_counter() - start
+
+                cached = api_search.client.stats.summary()["cache"]
+                print(
+                    f"  {label:<6s} {elapsed:8.2f} s  {server.requests:6d} requests sent "
+                    f"| {cached.get('fresh', 0):6d} served from cache "
+                    f"| {server.not_modified:6d} answered 304"
+                )
+        finally:
+            api_search.client.cache = None
+            cache.close()
+
+
+def bench_backends(args: argparse.Namespace) -> None:
+    """Compare the REST and GraphQL enrichment backends: requests per repo, wall time, output."""
+    repos = synthetic_repos(args.repos, seed=args.seed)
+    # A few empty repositories: no default branch in GraphQL, `409` on the REST commits.
+    for repo in repos[::25]:
+        repo["_commits"] = repo["_commits_2024"] = 0
+
+    runs = [(backend, 0) for backend in api_search.ENRICHMENT_BACKENDS]
+    if args.graphql_failures:
+        runs.append(("graphql", args.graphql_failures))
+
+    with MockGitHub(repos, latency=args.latency) as server, tempfile.TemporaryDirectory() as tmp:
+        api_search.API_URL = server.url
+        print(f"Enrichment backends over {len(repos)} repositories (latency {args.latency * 1000:.0f} ms/request)")
+
+        outputs = []
+        for backend, failures in runs:
+            api_search.ENRICHMENT_BACKEND = backend
+            server.graphql_failures = failures
+            server.reset_counters()
+            handler = api_search.HandleCsv(repos, "bench", max_workers=args.workers)
+            handler.output_path = os.path.join(tmp, f"{backend}-{failures}.csv")
+
+            start = time.perf_counter()
+            handler.save_to_csv()
+            elapsed = time.perf_counter() - start
+
+            with open(handler.output_path, encoding="utf-8") as file:
+                outputs.append(file.read())
+            label = f"{backend} (1 in {failures} queries/aliases failing)" if failures else backend
+            print(
+                f"  {label:<40s} {elapsed:8.2f} s  {server.requests:6d} requests "
+                f"({server.requests / len(repos):.2f}/repo)"
+            )
+
+        identical = all(output == outputs[0] for output in outputs)
+        print(f"  identical CSV columns and values: {identical}")
+        if not identical:
+            sys.exit(1)
+
+
+def bench_partition(args: argparse.Namespace) -> None:
+    """Compare a single capped search query with the partitioned search: coverage and requests."""
+    repos = synthetic_repos(args.repos, seed=args.seed)
+
+    with MockGitHub(repos, latency=args.latency) as server:
+        api_search.API_URL = server.url
+        api_search.SEARCH_WORKERS = args.workers
+        # The mock sends no rate-limit headers; lift the 30/min search quota.
+        api_search.scheduler.buckets["search"] = TokenBucket("search", 10 ** 6, 60)
+        print(f"Search over {len(repos)} matching repositories (latency {args.latency * 1000:.0f} ms/request)")
+
+        for label in ("single", "partition"):
+            server.reset_counters()
+            start = time.perf_counter()
+            if label == "single":
+                pages = api_search.iter_search_pages("bench", max_results=len(repos))
+                found = list(chain.from_iterable(pages))
+            else:
+                found = api_search.search_partitioned("bench")
+            elapsed = time.perf_counter() - start
+
+            unique = len({repo["id"] for repo in found})
+            print(
+                f"  {label:<10s} {elapsed:8.2f} s  {server.requests:6d} requests "
+                f"| {unique:6d} unique repositories ({unique / len(repos):.0%} recall)"
+            )
+
+
+def bench_contributors(args: argparse.Namespace) -> None:
+    """Compare contributor counting modes: requests and bytes per repo, exactness."""
+    repos = synthetic_repos(args.repos, seed=args.seed)
+
+    with MockGitHub(repos, latency=args.latency) as server:
+        api_search.API_URL = server.url
+        print(f"Contributor counting for {len(repos)} repositories")
+
+        for mode in api_search.CONTRIBUTOR_COUNT_MODES:
+            server.reset_counters()
+            api_search.client.stats.reset()
+            start = time.perf_counter()
+            counts = [
+                api_search.get_collaborators_count(repo["owner"]["login"], repo["name"], mode=mode)
+                for repo in repos
+            ]
+            elapsed = time.perf_counter() - start
+
+            received = api_search.client.stats.summary()["bytes"]
+            mismatches = sum(count != repo["_contributors"] for count, repo in zip(counts, repos))
+            print(
+                f"  mode={mode:<5s} {server.requests / len(repos):5.2f} requests/repo "
+                f"| {received / len(repos) / 1024:8.2f} KiB/repo | {elapsed:6.2f} s "
+                f"| {mismatches} counts differ from fixtures"
+            )
+
+
+def bench_mining(args: argparse.Namespace) -> None:
+    """Run `api_search.main()` end to end against fixtures replayed from a previous run."""
+    repos = repos_from_csv(args.fixtures)
+    rate_limits = {}
+    if args.search_limit:
+        rate_limits["search"] = (args.search_limit, 60)
+    if args.core_limit:
+        rate_limits["core"] = (args.core_limit, 3600)
+        rate_limits["graphql"] = (args.core_limit, 3600)
+
+    with MockGitHub(repos, latency=args.latency, rate_limits=rate_limits) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        api_search.API_URL = server.url
+        api_search.root = tmp
+        api_search.PROGRESS_INTERVAL = 3600
+        api_search.client.stats.reset()
+
+        argv = sys.argv
+        sys.argv = [
+            "api_search.py",
+            "--mode", args.mode,
+            "--term-workers", str(args.term_workers),
+            "--journal", os.path.join(tmp, "journal.jsonl"),
+        ]
+        start = time.perf_counter()
+        try:
+            api_search.main()
+        finally:
+            sys.argv = argv
+        elapsed = time.perf_counter() - start
+
+        output_folder = os.path.join(tmp, "dataset", "raw_data")
+        tables = storage.list_tables(output_folder) if os.path.isdir(output_folder) else []
+        rows = sum(len(storage.read_table(path, columns=["full_name"])) for path in tables)
+
+        summary = api_search.client.stats.summary()
+        print(
+            f"Full mining run over {len(repos)} fixture repositories "
+            f"(mode {args.mode}, {args.term_workers} term workers, latency {args.latency * 1000:.0f} ms)"
+        )
+        print(f"  wall time     {elapsed:8.2f} s")
+        print(f"  requests      {server.requests:8d}  ({server.rate_limited} answered 403 rate limited)")
+        print(f"  bytes         {server.bytes_sent / 1024:8.1f} KiB")
+        print(f"  latency       p50 {summary['p50'] * 1000:.1f} ms | p95 {summary['p95'] * 1000:.1f} ms")
+        for name, values in summary["endpoints"].items():
+            print(
+                f"    {name:<14s} {values['requests']:6d} requests | {values['bytes'] / 1024:8.1f} KiB "
+                f"| p50 {values['p50'] * 1000:6.1f} ms | p95 {values['p95'] * 1000:6.1f} ms"
+            )
+        print(f"  rows written  {rows:8d}  ({storage.default_format()})")
+
+
+def bench_language(args: argparse.Namespace) -> None:
+    """Per-row langdetect loop vs batched, pre-checked, memoized detection on a process pool."""
+    paths = storage.list_tables(args.fixtures) if os.path.isdir(args.fixtures) else [args.fixtures]
+    descriptions = list(
+        chain.from_iterable(storage.read_table(path, columns=["desc."])["desc."] for path in paths)
+    )
+    texts = [descriptions[index % len(descriptions)] for index in range(args.rows)]
+
+    language.seed_detector()
+    start = time.perf_counter()
+    baseline = [language.detect_language(language.normalize(text)) for text in texts]
+    elapsed = time.perf_counter() - start
+    print(f"Language detection of {len(texts)} descriptions ({os.cpu_count()} CPUs)")
+    print(f"  per-row loop              {elapsed:7.2f} s | {len(texts) / elapsed:8.0f} rows/s")
+
+    for workers in args.workers:
+        for precheck in (False, True):
+            languages, report = language.detect_languages(
+                texts, workers=workers, batch_size=args.batch_size, precheck=precheck
+            )
+            differ = sum(a != b for a, b in zip(languages, baseline))
+            print(
+                f"  workers={workers:<2d} precheck={'on ' if precheck else 'off'}  {report.seconds:7.2f} s "
+                f"| {report.rows_per_second:8.0f} rows/s | speedup x{elapsed / report.seconds:.1f} "
+                f"| {report.prechecked} pre-checked | {differ} differ from the loop"
+            )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LanguageCache(os.path.join(tmp, "langdetect.sqlite"), language.detector_version())
+        for label in ("cold cache", "warm cache"):
+            languages, report = language.detect_languages(
+                texts, workers=args.workers[-1], batch_size=args.batch_size, cache=cache
+            )
+            differ = sum(a != b for a, b in zip(languages, baseline))
+            print(
+                f"  {label:<25s} {report.seconds:7.2f} s | {report.rows_per_second:8.0f} rows/s "
+                f"| speedup x{elapsed / report.seconds:.1f} | {report.detected} detected "
+                f"| {differ} differ from the loop"
+            )
+        cache.close()
+
+
+def _synthetic_corpus(fixtures: str, rows: int, seed: int) -> pd.DataFrame:
+    """`rows` repositories sampled (with replacement) from the tables of a mining run."""
+    paths = storage.list_tables(fixtures) if os.path.isdir(fixtures) else [fixtures]
+    source = pd.concat([storage.read_table(path) for path in paths], ignore_index=True)
+    return source.sample(n=rows, replace=True, random_state=seed).reset_index(drop=True)
+
+
+def bench_exclusion(args: argparse.Namespace) -> None:
+    """Per-term substring scan vs one compiled pattern, on a synthetic corpus."""
+    corpus = _synthetic_corpus(args.fixtures, args.rows, args.seed)
+    texts = data_treatment.exclusion_texts(corpus).tolist()
+    terms = data_treatment.EXCLUSION_TERMS
+    print(f"Exclusion of {len(texts)} repositories by {len(terms)} terms")
+
+    start = time.perf_counter()
+    baseline = [any(term in text for term in terms) for text in texts]
+    elapsed = time.perf_counter() - start
+    print(f"  any(term in text)        {elapsed:7.2f} s | {len(texts) / elapsed:9.0f} rows/s | {sum(baseline)} excluded")
+
+    for word_boundaries in (False, True):
+        matcher = ExclusionMatcher(terms, word_boundaries=word_boundaries)
+        start = time.perf_counter()
+        matches = [matcher.match(text) for text in texts]
+        seconds = time.perf_counter() - start
+        excluded = [match is not None for match in matches]
+        label = "compiled, word bounds" if word_boundaries else "compiled, substrings"
+        print(
+            f"  {label:<24s} {seconds:7.2f} s | {len(texts) / seconds:9.0f} rows/s | {sum(excluded)} excluded "
+            f"| speedup x{elapsed / seconds:.1f} | {sum(a != b for a, b in zip(excluded, baseline))} differ"
+        )
+
+
+def _row_exclusion_text(repo: dict) -> str:
+    """Lower-cased name, description and search terms of one repository, as the former per-row filter built them."""
+    name = repo.get("name") or ""
+    desc = repo.get("desc.") or ""
+    terms = repo.get("search_term") or []
+    if isinstance(terms, str):
+        terms = [t.strip() for t in terms.split(",")]
+    return f"{name} {desc} {' '.join(terms)}".lower()
+
+
+def _dict_round_trip_filter(df: pd.DataFrame) -> pd.DataFrame:
+    """The former exclusion filter: rows as dicts, a Python loop, then a table of sorted columns."""
+    repos = storage.records(df)
+    for repo in repos:
+        raw_terms = repo.get("search_term") or ""
+        repo["search_term"] = [t.strip() for t in raw_terms.split(",")] if raw_terms else []
+    matcher = ExclusionMatcher(data_treatment.EXCLUSION_TERMS)
+    filtered = [repo for repo in repos if _row_exclusion_text(repo) not in matcher]
+    keys = sorted({k for repo in filtered for k in repo.keys()})
+    rows = [{**repo, "search_term": ",".join(repo["search_term"])} for repo in filtered]
+    return pd.DataFrame(rows, columns=keys)
+
+
+def _measured(func, conn) -> None:
+    # Runs in a forked child: reset the peak RSS, then report time, growth of the peak and func's summary.
+    with open("/proc/self/clear_refs", "w") as file:
+        file.write("5")
+    before = _proc_status_kib("VmRSS")
+    start = time.perf_counter()
+    summary = func()
+    seconds = time.perf_counter() - start
+    conn.send((seconds, (_proc_status_kib("VmHWM") - before) / 1024, summary))
+    conn.close()
+
+
+def _run_measured(func):
+    """Run `func` in a forked process; return its duration, peak memory growth (MiB) and result."""
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_measured, args=(func, sender))
+    process.start()
+    result = receiver.recv()
+    process.join()
+    return result
+
+
+def _proc_status_kib(field: str) -> int:
+    with open("/proc/self/status") as file:
+        for line in file:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+
+def _filter_summary(func, corpus: pd.DataFrame):
+    result = func(corpus)
+    return len(result), list(result.columns)
+
+
+def bench_exclusion_filter(args: argparse.Namespace) -> None:
+    """Dict round-trip vs columnar exclusion filter: time and peak memory (Linux only)."""
+    corpus = _synthetic_corpus(args.fixtures, args.rows, args.seed)
+    print(f"Exclusion filter of {len(corpus)} repositories ({len(corpus.columns)} columns)")
+
+    results = {}
+    for label, func in (
+        ("dicts + Python loop", _dict_round_trip_filter),
+        ("columnar str.contains", data_treatment.exclude_repos_by_terms),
+    ):
+        results[label] = _run_measured(partial(_filter_summary, func, corpus))
+
+    baseline_seconds, baseline_mib = results["dicts + Python loop"][:2]
+    for label, (seconds, mib, (rows, columns)) in results.items():
+        order = "input order" if columns == list(corpus.columns) else "re-sorted"
+        print(
+            f"  {label:<22s} {seconds:7.2f} s | {len(corpus) / seconds:9.0f} rows/s | peak +{mib:7.1f} MiB "
+            f"| {rows} kept, columns {order} | speedup x{baseline_seconds / seconds:.1f} "
+            f"| memory x{baseline_mib / max(mib, 0.1):.1f} less"
+        )
+
+
+def _in_memory_dedup(input_path: str, output_path: str):
+    data_treatment.remove_duplicates(input_path, output_path, chunksize=0)
+    return len(storage.read_table(output_path, columns=["full_name"]))
+
+
+def _streaming_dedup(input_path: str, output_path: str, chunksize: int):
+    return stream_drop_duplicates(input_path, output_path, chunksize=chunksize).rows_out
+
+
+def bench_dedup(args: argparse.Namespace) -> None:
+    """In-memory vs chunked streaming deduplication of a large table: time and peak memory (Linux only)."""
+    corpus = _synthetic_corpus(args.fixtures, args.rows, args.seed)
+    # Distinct repositories: the sampled ones renamed with one of `--distinct` suffixes.
+    suffixes = pd.Series(range(len(corpus))).sample(frac=1, random_state=args.seed) % args.distinct
+    for column in ("name", "full_name", "URL"):
+        corpus[column] = corpus[column] + "-" + suffixes.astype(str).to_numpy()
+
+    with tempfile.TemporaryDirectory() as folder:
+        input_path = os.path.join(folder, "concatenated" + storage.extension(args.format))
+        storage.write_table(corpus, input_path)
+        del corpus
+        print(f"Deduplication of {args.rows} rows ({os.path.getsize(input_path) / 2 ** 20:.0f} MiB {args.format})")
+
+        results = {
+            "in memory": _run_measured(
+                partial(_in_memory_dedup, input_path, os.path.join(folder, "memory" + storage.extension(args.format)))
+            )
+        }
+        for chunksize in args.chunksize:
+            output_path = os.path.join(folder, f"stream{chunksize}" + storage.extension(args.format))
+            results[f"streaming, {chunksize} rows"] = _run_measured(
+                partial(_streaming_dedup, input_path, output_path, chunksize)
+            )
+
+    for label, (seconds, mib, rows) in results.items():
+        print(f"  {label:<24s} {seconds:7.2f} s | {args.rows / seconds:9.0f} rows/s | peak +{mib:7.1f} MiB | {rows} kept")
+
+
+def bench_merge(args: argparse.Namespace) -> None:
+    """Keep-first deduplication vs merge by repository, on the experiment data and a synthetic table."""
+    fixtures = data_treatment.concat_tables([args.fixtures])
+    corpora = [("experiment data", fixtures)]
+    if args.rows:
+        corpus = _synthetic_corpus(args.fixtures, args.rows, args.seed)
+        # Several copies of each fixture repository, each found by several terms.
+        copies = pd.Series(range(len(corpus))).sample(frac=1, random_state=args.seed) % args.distinct
+        corpus["full_name"] = corpus["full_name"] + "-" + copies.astype(str).to_numpy()
+        corpora.append((f"synthetic, {args.rows} rows", corpus))
+
+    for label, df in corpora:
+        start = time.perf_counter()
+        kept = data_treatment.drop_duplicate_repos(df)
+        first_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        merged = merge_duplicate_repos(df)
+        seconds = time.perf_counter() - start
+        terms = merged["search_term"].str.count(",").add(1).sum()
+        print(f"{label}: {len(df)} rows, {len(merged)} repositories")
+        print(f"  keep first      {first_seconds:7.2f} s | {len(df) / first_seconds:10.0f} rows/s | {len(kept)} rows")
+        print(
+            f"  merge by repo   {seconds:7.2f} s | {len(df) / seconds:10.0f} rows/s | {len(merged)} rows, "
+            f"{terms / len(merged):.2f} search terms per repository"
+        )
+
+
+def bench_concat(args: argparse.Namespace) -> None:
+    """Serial vs threaded streaming concatenation of many tables."""
+    fixtures = storage.list_tables(args.fixtures)
+    with tempfile.TemporaryDirectory() as folder:
+        inputs = os.path.join(folder, "raw_data")
+        os.makedirs(inputs)
+        for copy in range(args.copies):
+            for path in fixtures:
+                name = f"{copy:03d}_" + os.path.splitext(os.path.basename(path))[0] + storage.extension(args.format)
+                storage.write_table(storage.read_table(path), os.path.join(inputs, name))
+        print(f"Concatenation of {args.copies * len(fixtures)} {args.format} tables")
+
+        for workers in args.workers:
+            output = os.path.join(folder, f"concatenated-{workers}" + storage.extension(args.format))
+            start = time.perf_counter()
+            with open(os.devnull, "w") as devnull:
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    reads = data_treatment.concat_to_table([inputs], output, workers=workers)
+                finally:
+                    sys.stdout = stdout
+            elapsed = time.perf_counter() - start
+            rows = sum(read.rows for read in reads)
+            parse = [read.seconds for read in reads]
+            print(
+                f"  {workers:2d} threads  {elapsed:7.2f} s | {rows / elapsed:9.0f} rows/s | parse per file: "
+                f"median {sorted(parse)[len(parse) // 2] * 1000:.1f} ms, max {max(parse) * 1000:.1f} ms"
+            )
+
+
+def bench_diff(args: argparse.Namespace) -> None:
+    """Snapshot diff of two synthetic runs with known added, removed and changed repositories."""
+    corpus = _synthetic_corpus(args.fixtures, args.rows, args.seed)
+    corpus["full_name"] = corpus["full_name"] + "-" + pd.Series(range(len(corpus))).astype(str).to_numpy()
+    rng = np.random.default_rng(args.seed)
+    share = args.changes / 3
+    removed = rng.random(len(corpus)) < share
+    changed = rng.random(len(corpus)) < share
+    old = corpus[~(rng.random(len(corpus)) < share)]  # rows missing from the old run are "added"
+    new = corpus[~removed].copy()
+    new.loc[changed[~removed], "stars"] += 1
+    print(f"Diff of {len(old)} vs {len(new)} repositories")
+
+    start = time.perf_counter()
+    diff = snapshot_diff.diff_snapshots(old, new)
+    elapsed = time.perf_counter() - start
+    rows = len(old) + len(new)
+    print(f"  {elapsed:7.2f} s | {rows / elapsed:9.0f} rows/s | {diff}")
+
+
+def bench_rules(args: argparse.Namespace) -> None:
+    """Per-row screening loop vs the vectorized rule engine, on a synthetic corpus."""
+    corpus = _synthetic_corpus(args.fixtures, args.rows, args.seed)
+    rule_set = RuleSet.from_file(args.rules)
+    rule_set.reference_date = args.reference_date
+    print(f"Screening of {len(corpus)} repositories by {len(rule_set.rules)} rules of {args.rules}")
+
+    # The criteria of the default rules file, checked one repository at a time.
+    cutoff = rule_set.reference() - pd.Timedelta(days=365)
+    matcher = ExclusionMatcher(data_treatment.EXCLUSION_TERMS)
+    start = time.perf_counter()
+    baseline = [
+        repo["stars"] is not None
+        and repo["stars"] > 10
+        and repo["last_commit"] is not None
+        and repo["last_commit"] > cutoff
+        and matcher.match(_row_exclusion_text(repo)) is None
+        for repo in storage.records(corpus)
+    ]
+    elapsed = time.perf_counter() - start
+    print(f"  per-row loop       {elapsed:7.2f} s | {len(corpus) / elapsed:9.0f} rows/s | {sum(baseline)} kept")
+
+    start = time.perf_counter()
+    trace = rule_set.evaluate(corpus)
+    seconds = time.perf_counter() - start
+    kept = (trace["decision"] == "include").tolist()
+    print(
+        f"  vectorized rules   {seconds:7.2f} s | {len(corpus) / seconds:9.0f} rows/s | {sum(kept)} kept "
+        f"| speedup x{elapsed / seconds:.1f} | {sum(a != b for a, b in zip(kept, baseline))} differ"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the GitHub mining pipeline.")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    enrichment = subparsers.add_parser(
+        "enrichment", help="Sequential vs concurrent repository enrichment."
+    )
+    enrichment.add_argument("--repos", type=int, default=200, help="Number of mock repositories.")
+    enrichment.add_argument("--latency", type=float, default=0.02, help="Mock latency (s/request).")
+    enrichment.add_argument("--workers", type=int, nargs="+", default=[1, 8, 16])
+    enrichment.add_argument("--seed", type=int, default=0)
+    enrichment.set_defaults(func=bench_enrichment)
+
+    commit_count = subparsers.add_parser(
+        "commit-count", help="Link-header vs page-walking commit counting."
+    )
+    commit_count.add_argument("--repos", type=int, default=100, help="Number of mock repositories.")
+    commit_count.add_argument("--latency", type=float, default=0.0, help="Mock latency (s/request).")
+    commit_count.add_argument("--seed", type=int, default=0)
+    commit_count.set_defaults(func=bench_commit_count)
+
+    cache = subparsers.add_parser("cache", help="Cold vs warm vs revalidated response cache.")
+    cache.add_argument("--repos", type=int, default=100, help="Number of mock repositories.")
+    cache.add_argument("--latency", type=float, default=0.02, help="Mock latency (s/request).")
+    cache.add_argument("--seed", type=int, default=0)
+    cache.set_defaults(func=bench_cache)
+
+    backends = subparsers.add_parser("backends", help="REST vs GraphQL enrichment backend.")
+    backends.add_argument("--repos", type=int, default=200, help="Number of mock repositories.")
+    backends.add_argument("--latency", type=float, default=0.02, help="Mock latency (s/request).")
+    backends.add_argument("--workers", type=int, default=8)
+    backends.add_argument("--seed", type=int, default=0)
+    backends.add_argument(
+        "--graphql-failures",
+        type=int,
+        default=3,
+        help="Also run GraphQL with every Nth query and alias failing as HTTP 200 with errors (0: skip).",
+    )
+    backends.set_defaults(func=bench_backends)
+
+    partition = subparsers.add_parser(
+        "partition", help="Single capped search query vs partitioned search."
+    )
+    partition.add_argument("--repos", type=int, default=3000, help="Number of mock repositories.")
+    partition.add_argument("--latency", type=float, default=0.02, help="Mock latency (s/request).")
+    partition.add_argument("--workers", type=int, default=4, help="Concurrent query slices.")
+    partition.add_argument("--seed", type=int, default=0)
+    partition.set_defaults(func=bench_partition)
+
+    contributors = subparsers.add_parser(
+        "contributors", help="Link-header vs first-page contributor counting."
+    )
+    contributors.add_argument("--repos", type=int, default=200, help="Number of mock repositories.")
+    contributors.add_argument("--latency", type=float, default=0.0, help="Mock latency (s/request).")
+    contributors.add_argument("--seed", type=int, default=0)
+    contributors.set_defaults(func=bench_contributors)
+
+    mining = subparsers.add_parser(
+        "mining", help="End-to-end api_search.main() run on fixtures from a previous run."
+    )
+    mining.add_argument("--fixtures", default=FIXTURES_PATH, help="CSV file or folder of a mining run.")
+    mining.add_argument("--latency", type=float, default=0.02, help="Mock latency (s/request).")
+    mining.add_argument("--mode", choices=("per-term", "dedup"), default="per-term")
+    mining.add_argument("--term-workers", type=int, default=api_search.TERM_WORKERS)
+    mining.add_argument(
+        "--search-limit", type=int, default=30, help="Search requests per minute (0: unlimited)."
+    )
+    mining.add_argument(
+        "--core-limit", type=int, default=5000, help="Core/GraphQL requests per hour (0: unlimited)."
+    )
+    mining.set_defaults(func=bench_mining)
+
+    language_parser = subparsers.add_parser(
+        "language", help="Per-row vs batched parallel language detection."
+    )
+    language_parser.add_argument("--fixtures", default=FIXTURES_PATH, help="Table or folder of a mining run.")
+    language_parser.add_argument("--rows", type=int, default=5000, help="Descriptions to detect (fixtures repeated).")
+    language_parser.add_argument("--workers", type=int, nargs="+", default=[1, language.LANGDETECT_WORKERS])
+    language_parser.add_argument("--batch-size", type=int, default=language.LANGDETECT_BATCH_SIZE)
+    language_parser.set_defaults(func=bench_language)
+
+    exclusion = subparsers.add_parser(
+        "exclusion", help="Per-term substring scan vs compiled exclusion matcher."
+    )
+    exclusion.add_argument("--fixtures", default=FIXTURES_PATH, help="Table or folder of a mining run.")
+    exclusion.add_argument("--rows", type=int, default=1_000_000, help="Synthetic repositories.")
+    exclusion.add_argument("--seed", type=int, default=0)
+    exclusion.set_defaults(func=bench_exclusion)
+
+    exclusion_filter = subparsers.add_parser(
+        "exclusion-filter", help="Dict round-trip vs columnar exclusion filter (time and peak memory)."
+    )
+    exclusion_filter.add_argument("--fixtures", default=FIXTURES_PATH, help="Table or folder of a mining run.")
+    exclusion_filter.add_argument("--rows", type=int, default=200_000, help="Synthetic repositories.")
+    exclusion_filter.add_argument("--seed", type=int, default=0)
+    exclusion_filter.set_defaults(func=bench_exclusion_filter)
+
+    dedup = subparsers.add_parser("dedup", help="In-memory vs streaming deduplication (time and peak memory).")
+    dedup.add_argument("--fixtures", default=FIXTURES_PATH, help="Table or folder of a mining run.")
+    dedup.add_argument("--rows", type=int, default=1_000_000, help="Rows of the synthetic concatenated table.")
+    dedup.add_argument("--distinct", type=int, default=1000, help="Copies of each fixture repository.")
+    dedup.add_argument("--chunksize", type=int, nargs="+", default=[100_000])
+    dedup.add_argument("--format", choices=sorted(storage.FORMATS), default="csv")
+    dedup.add_argument("--seed", type=int, default=0)
+    dedup.set_defaults(func=bench_dedup)
+
+    merge = subparsers.add_parser("merge", help="Keep-first deduplication vs merge by repository.")
+    merge.add_argument("--fixtures", default=FIXTURES_PATH, help="Table or folder of a mining run.")
+    merge.add_argument("--rows", type=int, default=1_000_000, help="Rows of the synthetic table (0: fixtures only).")
+    merge.add_argument("--distinct", type=int, default=1000, help="Copies of each fixture repository.")
+    merge.add_argument("--seed", type=int, default=0)
+    merge.set_defaults(func=bench_merge)
+
+    concat = subparsers.add_parser("concat", help="Serial vs threaded streaming concatenation.")
+    concat.add_argument("--fixtures", default=FIXTURES_PATH, help="Folder of a mining run.")
+    concat.add_argument("--copies", type=int, default=20, help="Copies of each fixture table.")
+    concat.add_argument("--workers", type=int, nargs="+", default=[1, data_treatment.CONCAT_WORKERS])
+    concat.add_argument("--format", choices=sorted(storage.FORMATS), default="csv")
+    concat.set_defaults(func=bench_concat)
+
+    diff = subparsers.add_parser("diff", help="Snapshot diff of two large synthetic runs.")
+    diff.add_argument("--fixtures", default=FIXTURES_PATH, help="Table or folder of a mining run.")
+    diff.add_argument("--rows", type=int, default=1_000_000, help="Repositories per run.")
+    diff.add_argument("--changes", type=float, default=0.03, help="Share of added, removed and changed repositories.")
+    diff.add_argument("--seed", type=int, default=0)
+    diff.set_defaults(func=bench_diff)
+
+    rules = subparsers.add_parser("rules", help="Per-row screening loop vs vectorized rule engine.")
+    rules.add_argument("--fixtures", default=FIXTURES_PATH, help="Table or folder of a mining run.")
+    rules.add_argument("--rows", type=int, default=1_000_000, help="Synthetic repositories.")
+    rules.add_argument("--rules", default=RULES_PATH, help="Rules file.")
+    rules.add_argument("--reference-date", default="2025-01-20", help="Reference date of relative rules.")
+    rules.add_argument("--seed", type=int, default=0)
+    rules.set_defaults(func=bench_rules)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    main()
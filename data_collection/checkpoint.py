@@ -0,0 +1,244 @@
+"""
+Checkpoint journal for resumable and incremental mining runs.
+
+The journal is an append-only JSONL file. Each line records one unit of completed
+work:
+
+- `{"type": "page", "term", "page", "repos"}`: a search results page;
+- `{"type": "repo", "id", "full_name", "pushed_at", "metrics"}`: an enriched repository;
+- `{"type": "output", "term", "path"}`: a CSV written for a term.
+
+A restarted run replays the journal and skips every page, repository and term
+already recorded. Within a run, terms mined concurrently claim each repository
+before enriching it, so a repository found by several terms is fetched once.
+Independently, a previous snapshot (the tables of an earlier run) can be loaded as
+a baseline: repositories whose `pushed_at` did not change since that snapshot
+reuse its metrics instead of being re-enriched.
+"""
+
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+import storage
+
+logger = logging.getLogger(__name__)
+
+# Search API fields used when writing the CSV; the rest is not worth journaling.
+REPO_FIELDS = (
+    "id",
+    "name",
+    "full_name",
+    "html_url",
+    "description",
+    "pushed_at",
+    "stargazers_count",
+    "fork",
+    "forks",
+    "language",
+    "size",
+    "score",
+    "is_template",
+    "archived",
+    "disabled",
+    "contributors_url",
+    "collaborators_url",
+)
+
+METRIC_FIELDS = ("total_commits", "commits_2024", "collaborators")
+
+
+def slim_repo(repo: Dict) -> Dict:
+    """Keep only the repository fields needed downstream (plus the owner login)."""
+    slim = {field: repo.get(field) for field in REPO_FIELDS}
+    slim["owner"] = {"login": repo["owner"]["login"]}
+    if "search_terms" in repo:
+        slim["search_terms"] = repo["search_terms"]
+    return slim
+
+
+class CheckpointJournal:
+    """
+    Append-only record of the work done by a mining run.
+    """
+
+    def __init__(self, path: Optional[str] = None, resume: bool = False) -> None:
+        """
+        Open the journal.
+
+        Parameters
+        ----------
+        path : str, optional
+            JSONL file. If None, the journal only lives in memory (useful to apply a
+            snapshot baseline without checkpointing).
+        resume : bool, optional
+            Replay an existing journal instead of starting a new one.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._pages: Dict[Tuple[str, int], List[Dict]] = {}
+        self._repos: Dict[int, Dict] = {}
+        self._outputs: Dict[str, str] = {}
+        self._baseline: Dict[str, Dict] = {}
+        self._claims: Dict[int, Future] = {}
+        self._file = None
+
+        if path is None:
+            return
+
+        if resume and os.path.exists(path):
+            self._replay(path)
+            logger.info(
+                "Resuming from journal %s: %d pages, %d repositories, %d finished terms.",
+                path,
+                len(self._pages),
+                len(self._repos),
+                len(self._outputs),
+            )
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._file = open(path, mode="a" if resume else "w", encoding="utf-8")
+
+    def _replay(self, path: str) -> None:
+        with open(path, mode="r", encoding="utf-8") as file:
+            for line_number, line in enumerate(file, start=1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a truncated last line behind.
+                    logger.warning("Skipping unreadable journal line %d.", line_number)
+                    continue
+                self._apply(record)
+
+    def _apply(self, record: Dict) -> None:
+        kind = record.get("type")
+        if kind == "page":
+            self._pages[(record["term"], record["page"])] = record["repos"]
+        elif kind == "repo":
+            self._repos[record["id"]] = record
+        elif kind == "output":
+            self._outputs[record["term"]] = record["path"]
+
+    def _append(self, record: Dict, remember: bool = True) -> None:
+        with self._lock:
+            if remember:
+                self._apply(record)
+            if self._file is not None:
+                self._file.write(json.dumps(record) + "\n")
+                self._file.flush()
+
+    def load_snapshot(self, path: str) -> int:
+        """
+        Use the tables of a previous run as a baseline for incremental enrichment.
+
+        Parameters
+        ----------
+        path : str
+            A table produced by `HandleCsv` (any `storage` format), or a folder of
+            such tables.
+
+        Returns
+        -------
+        int
+            Number of repositories in the baseline.
+        """
+        files = storage.list_tables(path) if os.path.isdir(path) else [path]
+
+        for file_path in files:
+            try:
+                df = storage.read_table(file_path, columns=["full_name", "last_commit", *METRIC_FIELDS])
+            except ValueError as exc:
+                logger.warning("Skipping snapshot table %s: %s", file_path, exc)
+                continue
+            df = df.dropna(subset=list(METRIC_FIELDS))
+            pushed_at = df["last_commit"].dt.strftime(storage.DATETIME_FORMAT)
+            for row, pushed in zip(storage.records(df), pushed_at):
+                self._baseline[row["full_name"]] = {
+                    "pushed_at": pushed if isinstance(pushed, str) else None,
+                    "metrics": {field: int(row[field]) for field in METRIC_FIELDS},
+                }
+
+        logger.info("Loaded snapshot baseline of %d repositories from %s", len(self._baseline), path)
+        return len(self._baseline)
+
+    def page(self, term: str, page: int) -> Optional[List[Dict]]:
+        """Return the journaled repositories of a search page, if it was completed."""
+        return self._pages.get((term, page))
+
+    def record_page(self, term: str, page: int, repos: List[Dict]) -> None:
+        # Only replayed pages are looked up, so live pages are not kept in memory.
+        self._append(
+            {"type": "page", "term": term, "page": page, "repos": [slim_repo(r) for r in repos]},
+            remember=False,
+        )
+
+    def metrics_for(self, repo: Dict) -> Optional[Dict[str, int]]:
+        """
+        Return already known metrics for `repo`, if still valid.
+
+        Metrics from this run's journal are reused as they are; metrics from the
+        snapshot baseline only when `pushed_at` did not change since.
+        """
+        journaled = self._repos.get(repo["id"])
+        if journaled is not None and journaled["pushed_at"] == repo["pushed_at"]:
+            return journaled["metrics"]
+
+        previous = self._baseline.get(repo["full_name"])
+        if previous is not None and previous["pushed_at"] == repo["pushed_at"]:
+            return previous["metrics"]
+        return None
+
+    def claim(self, repo: Dict) -> Optional[Future]:
+        """
+        Reserve the enrichment of `repo` for the calling thread.
+
+        Returns None if the caller now owns it (and must `record_repo` or `release`
+        it), or the future metrics of the thread that claimed it first.
+        """
+        with self._lock:
+            future = self._claims.get(repo["id"])
+            if future is not None:
+                return future
+            self._claims[repo["id"]] = Future()
+            return None
+
+    def release(self, repos: List[Dict]) -> None:
+        """Fail the claims of `repos` that were not recorded, e.g. after an error."""
+        with self._lock:
+            futures = [self._claims.pop(repo["id"], None) for repo in repos]
+        for repo, future in zip(repos, futures):
+            if future is not None and not future.done():
+                future.set_exception(RuntimeError(f"Enrichment of {repo['full_name']} failed."))
+
+    def record_repo(self, repo: Dict, metrics: Dict[str, int]) -> None:
+        self._append(
+            {
+                "type": "repo",
+                "id": repo["id"],
+                "full_name": repo["full_name"],
+                "pushed_at": repo["pushed_at"],
+                "metrics": metrics,
+            }
+        )
+        with self._lock:
+            future = self._claims.pop(repo["id"], None)
+        if future is not None:
+            future.set_result(metrics)
+
+    def output_for(self, term: str) -> Optional[str]:
+        """Return the CSV already written for `term` in this run, if any."""
+        return self._outputs.get(term)
+
+    def record_output(self, term: str, path: str) -> None:
+        self._append({"type": "output", "term": term, "path": path})
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
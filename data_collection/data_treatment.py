@@ -1,11 +1,18 @@
-import csv
 import logging
 import os
-from typing import List, Dict, Optional
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
 
 import pandas as pd
-from langdetect import detect, LangDetectException
 
+import language
+import storage
+from dedup import DEDUP_CHUNKSIZE, DEDUP_COLUMNS, stream_drop_duplicates
+from exclusion import ExclusionMatcher, lowercase_text
+from rules import EXCLUSION_RULE, RULES_PATH, RuleSet
 from utils import format_datetime, Menu
 
 logger = logging.getLogger(__name__)
@@ -15,41 +22,174 @@ ROOT = os.getcwd()
 list_file = Menu.list_files_2_menu
 recursive_list = Menu.recursive_folder_navigation
 
+# Threads reading the input tables of a concatenation.
+CONCAT_WORKERS = int(os.getenv("CONCAT_WORKERS", "4"))
 
-def concat_csv_files(folder_path: str) -> None:
+# Repositories mentioning any of these (name, description or search terms) are excluded.
+# The terms and columns are those of the exclusion rule of `screening_rules.json`, so
+# the `exclusion` and `rules` stages always screen with the same list.
+_EXCLUSION_RULES = RuleSet.from_file(RULES_PATH)
+EXCLUSION_TERMS = set(_EXCLUSION_RULES.rule(EXCLUSION_RULE).value)
+# Match exclusion terms as whole words only ("tool" no longer matches "toolkit").
+EXCLUSION_WORD_BOUNDARIES = os.getenv("EXCLUSION_WORD_BOUNDARIES", "false").lower() in ("1", "true", "yes")
+# Columns matched against the exclusion terms, and how their lists are separated.
+EXCLUSION_COLUMNS = tuple(_EXCLUSION_RULES.rule(EXCLUSION_RULE).columns)
+EXCLUSION_LIST_COLUMNS = _EXCLUSION_RULES.list_columns
+
+
+@dataclass
+class TableRead:
+    """Outcome of reading one input table: rows, parse time, and the error if it was rejected."""
+
+    path: str
+    rows: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def _input_tables(paths: List[str]) -> List[str]:
+    """Expand folders into their tables, sorted by name; files are kept in the given order."""
+    return [table for path in paths for table in (storage.list_tables(path) if os.path.isdir(path) else [path])]
+
+
+def _read_checked(path: str) -> Tuple[Optional[pd.DataFrame], TableRead]:
+    """Read a table and validate its header against the declared schema (`storage.COLUMNS`)."""
+    start = time.perf_counter()
+    try:
+        df = storage.read_table(path)
+    except Exception as exc:
+        return None, TableRead(path, seconds=time.perf_counter() - start, error=str(exc))
+
+    missing, unexpected = storage.check_header(df.columns)
+    if missing:
+        return None, TableRead(path, seconds=time.perf_counter() - start, error=f"missing columns {missing}")
+    if unexpected:
+        logger.warning("Ignoring unexpected columns %s of %s", unexpected, path)
+    df = df[list(storage.COLUMNS)]
+    return df, TableRead(path, rows=len(df), seconds=time.perf_counter() - start)
+
+
+def read_tables(paths: List[str], workers: int = CONCAT_WORKERS) -> Iterator[Tuple[Optional[pd.DataFrame], TableRead]]:
+    """
+    Read tables in parallel, yielding them in input order.
+
+    At most `workers` tables are read ahead of the one being consumed, so memory
+    stays bounded by a few tables.
+
+    Args:
+        paths (List[str]): Tables, or folders whose tables are all read (sorted by name).
+        workers (int): Reading threads.
+
+    Yields:
+        Tuple[Optional[pd.DataFrame], TableRead]: The table with the columns of `storage.COLUMNS`
+        (None if it could not be read or its header lacks columns), and its read report.
+    """
+    tables = _input_tables(paths)
+    workers = max(1, workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for table in tables:
+            pending.append(executor.submit(_read_checked, table))
+            if len(pending) > workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _report_read(read: TableRead) -> None:
+    file_name = os.path.basename(read.path)
+    if read.error:
+        print(f"Error reading file {file_name}: {read.error}")
+    else:
+        print(f"Processing file: {file_name} ({read.rows} rows, parsed in {read.seconds:.3f} s)")
+
+
+def concat_tables(paths: List[str], workers: int = CONCAT_WORKERS) -> pd.DataFrame:
     """
-    Reads CSV files in a folder, adds a 'Keyword' column with a keyword extracted from the file name,
-    and saves all the concatenated data into a new CSV file.
+    Read tables (CSV, Parquet or Feather) and concatenate them into one DataFrame.
 
     Args:
-        folder_path (str): Path to the folder containing the CSV files.
+        paths (List[str]): Tables, or folders whose tables are all read.
+        workers (int): Reading threads.
+
+    Returns:
+        pd.DataFrame: The concatenated rows (empty if no table could be read).
     """
     lista_dfs = []
+    for df, read in read_tables(paths, workers):
+        _report_read(read)
+        if df is not None:
+            lista_dfs.append(df)
+
+    if not lista_dfs:
+        return pd.DataFrame(columns=list(storage.COLUMNS))
+    return pd.concat(lista_dfs, ignore_index=True)
+
+
+def concat_to_table(paths: List[str], output_file: str, workers: int = CONCAT_WORKERS) -> List[TableRead]:
+    """
+    Concatenate tables into `output_file`, writing each one as soon as it is read.
+
+    Only a few tables are in memory at a time (see `read_tables`); the output is
+    created with the first table that could be read.
+
+    Args:
+        paths (List[str]): Tables, or folders whose tables are all read.
+        output_file (str): Concatenated table; its extension selects the format.
+        workers (int): Reading threads.
+
+    Returns:
+        List[TableRead]: Rows, parse time and error of every input table, in order.
+    """
+    reads = []
+    writer = None
+    start = time.perf_counter()
+    try:
+        for df, read in read_tables(paths, workers):
+            _report_read(read)
+            reads.append(read)
+            if df is None:
+                continue
+            if writer is None:
+                os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+                writer = storage.TableWriter(output_file, columns=storage.COLUMNS)
+            writer.write_frame(df)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    parsed = [read for read in reads if not read.error]
+    logger.info(
+        "[Concat] %d rows from %d of %d tables in %.2f s (%.2f s of parsing, %d threads)",
+        sum(read.rows for read in parsed),
+        len(parsed),
+        len(reads),
+        time.perf_counter() - start,
+        sum(read.seconds for read in parsed),
+        workers,
+    )
+    return reads
+
 
-    # Iterates over the files in the folder and processes only CSV files
-    for file_name in os.listdir(folder_path):
-        if file_name.endswith('.csv'):
-            file_path = os.path.join(folder_path, file_name)
-            print(f"Processing file: {file_name}")
-
-            try:
-                # Reads the CSV file and adds the 'Keyword' column
-                df = pd.read_csv(file_path)
-                lista_dfs.append(df)
-            except Exception as e:
-                print(f"Error reading file {file_name}: {e}")
-    # Concatenate DataFrames and save to a new CSV file
-    if lista_dfs:
-        folder_name = folder_path.split('/')[-1]
-        df_concat = pd.concat(lista_dfs, ignore_index=True)
-        output_folder = f"dataset/processed_data"
-        os.makedirs(output_folder, exist_ok=True)
-        output_file = os.path.join(output_folder, f"[CONCATENATED]-{folder_name}-{format_datetime()}.csv")
-
-        df_concat.to_csv(output_file, index=False)
+def concat_csv_files(folder_path: str) -> None:
+    """
+    Reads the tables (CSV, Parquet or Feather) in a folder and streams all the
+    concatenated data into a new table, in the `STORAGE_FORMAT` format.
+
+    Args:
+        folder_path (str): Path to the folder containing the tables.
+    """
+    folder_name = folder_path.split('/')[-1]
+    output_folder = f"dataset/processed_data"
+    output_file = os.path.join(
+        output_folder, f"[CONCATENATED]-{folder_name}-{format_datetime()}{storage.extension()}"
+    )
+
+    reads = concat_to_table([folder_path], output_file)
+    if any(not read.error for read in reads):
         print(f"Concatenated file & saved in: {output_file}")
     else:
-        print("No CSV file processed.")
+        print("No table processed.")
 
 def get_valid_option(valid_options):
     """
@@ -84,7 +224,7 @@ def handle_remove_duplicates():
     """Handle removing duplicates from a file."""
     path = recursive_list(ROOT, "Folder")
     file_name = list_file(path, "File")
-    file_out_name = f"[NO-DUPLICATED]_repo-files_{format_datetime()}.csv"
+    file_out_name = f"[NO-DUPLICATED]_repo-files_{format_datetime()}{storage.extension()}"
     input_file = os.path.join(ROOT, "dataset/processed_data", file_name)
     output_file = os.path.join(ROOT, "dataset/processed_data", file_out_name)
 
@@ -100,7 +240,7 @@ def handle_filter_descriptions():
     path = recursive_list(ROOT, "Folder")
     file_name = list_file(path, "File")
 
-    file_out_name = f"[ENGLISH-DESC]_repo-files_{format_datetime()}.csv"
+    file_out_name = f"[ENGLISH-DESC]_repo-files_{format_datetime()}{storage.extension()}"
     input_file = os.path.join(ROOT, "dataset/processed_data", file_name)
     output_file = os.path.join(ROOT, "dataset/processed_data", file_out_name)
 
@@ -112,93 +252,170 @@ def handle_filter_descriptions():
 
 
 def _read_csv_safe(file_path: str) -> pd.DataFrame:
-    """Read CSV with sane defaults and clear error if the file is missing/corrupt."""
+    """Read a table (any storage format) with typed columns and a clear error if the file is missing."""
     if not os.path.exists(file_path):
-        raise FileNotFoundError(f"CSV not found: {file_path}")
-    return pd.read_csv(file_path)
+        raise FileNotFoundError(f"Table not found: {file_path}")
+    return storage.read_table(file_path)
 
 
-def remove_duplicates(input_file: str, output_file: str) -> None:
+def drop_duplicate_repos(df: pd.DataFrame, subset: Optional[List[str]] = None) -> pd.DataFrame:
     """
-    Read a CSV file and remove duplicate rows based on 'name', 'full_name', and 'URL' columns.
+    Remove duplicate rows based on the 'name', 'full_name', and 'URL' columns.
 
-    :param input_file: Path to the input CSV file.
-    :param output_file: Path to the CSV file without duplicates.
+    :param df: Repositories table.
+    :param subset: Columns identifying a repository (default: DEDUP_COLUMNS).
+    :return: The rows without duplicates (first occurrence kept).
     """
-    df = _read_csv_safe(input_file)
-
     # Ensure subset columns exist; if any is missing, fall back to all columns to preserve behavior.
-    subset_cols = ["name", "full_name", "URL"]
+    subset_cols = subset or DEDUP_COLUMNS
     existing_subset = [c for c in subset_cols if c in df.columns]
     if not existing_subset:
         logger.warning(
             "None of expected columns %s found. Falling back to full-row duplicate removal.",
             subset_cols,
         )
-        df_unique = df.drop_duplicates()
-    else:
-        df_unique = df.drop_duplicates(subset=existing_subset)
+        return df.drop_duplicates()
+    return df.drop_duplicates(subset=existing_subset)
+
+
+def remove_duplicates(input_file: str, output_file: str, chunksize: int = DEDUP_CHUNKSIZE) -> None:
+    """
+    Read a table and remove duplicate rows based on 'name', 'full_name', and 'URL' columns.
+
+    :param input_file: Path to the input table (CSV, Parquet or Feather).
+    :param output_file: Path to the table without duplicates; its extension selects the format.
+    :param chunksize: If set, stream the table this many rows at a time instead of loading it (see `dedup`).
+    """
+    if chunksize:
+        if not os.path.exists(input_file):
+            raise FileNotFoundError(f"Table not found: {input_file}")
+        stream_drop_duplicates(input_file, output_file, chunksize=chunksize)
+        logger.info("File saved without duplicates at '%s'.", output_file)
+        return
+
+    df_unique = drop_duplicate_repos(_read_csv_safe(input_file))
 
     # Persist
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    df_unique.to_csv(output_file, index=False)
+    storage.write_table(df_unique, output_file)
     logger.info("File saved without duplicates at '%s'.", output_file)
 
 
 def filter_english_descriptions(input_file: str, output_file: str) -> None:
     """
-    Read a CSV file, keep only rows whose 'desc.' language is English, and save to output.
+    Read a table, keep only rows whose 'desc.' language is English, and save to output.
 
-    :param input_file: Path to the input CSV file.
-    :param output_file: Path to the filtered CSV file (English descriptions only).
+    :param input_file: Path to the input table (CSV, Parquet or Feather).
+    :param output_file: Path to the filtered table (English descriptions only).
     """
-    df = _read_csv_safe(input_file)
+    df_english = keep_english_descriptions(_read_csv_safe(input_file))
+    storage.write_table(df_english, output_file)
+    logger.info("File saved with English descriptions at '%s'.", output_file)
 
+
+def keep_english_descriptions(
+    df: pd.DataFrame,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    precheck: bool = True,
+    cache: bool = True,
+) -> pd.DataFrame:
+    """
+    Keep only rows whose 'desc.' language is English.
+
+    Descriptions are detected in batches on a process pool with a fixed langdetect
+    seed, after an ASCII pre-check for obvious English; each distinct description is
+    detected once and remembered in the persistent memo cache (see `language`).
+
+    :param df: Repositories table.
+    :param workers: Detection processes (default: LANGDETECT_WORKERS).
+    :param batch_size: Descriptions per process task (default: LANGDETECT_BATCH_SIZE).
+    :param precheck: Accept obvious English descriptions without running langdetect.
+    :param cache: Use the language memo cache (LANGDETECT_CACHE_PATH, if enabled).
+    :return: The English rows; no rows if the 'desc.' column is missing.
+    """
     if "desc." not in df.columns:
         logger.warning(
-            "Column 'desc.' was not found. Saving empty file to preserve pipeline behavior."
+            "Column 'desc.' was not found. Keeping no rows to preserve pipeline behavior."
         )
-        pd.DataFrame(columns=df.columns).to_csv(output_file, index=False)
-        return
+        return df.iloc[0:0]
+
+    # Empty/undetectable descriptions get no language and are dropped.
+    languages, _ = language.detect_languages(
+        df["desc."].tolist(),
+        workers=workers or language.LANGDETECT_WORKERS,
+        batch_size=batch_size or language.LANGDETECT_BATCH_SIZE,
+        precheck=precheck,
+        cache=language.default_cache() if cache else None,
+    )
+    return df[[lang == "en" for lang in languages]]
 
-    english_rows = []
-    for _, row in df.iterrows():
-        description = "" if pd.isna(row["desc."]) else str(row["desc."])
-        if not description.strip():
-            continue
-        try:
-            if detect(description) == "en":
-                english_rows.append(row)
-        except LangDetectException:
-            # Ignore rows with empty/undetectable descriptions
-            continue
 
-    df_english = pd.DataFrame(english_rows)
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    df_english.to_csv(output_file, index=False)
-    logger.info("File saved with English descriptions at '%s'.", output_file)
+def exclusion_texts(df: pd.DataFrame) -> pd.Series:
+    """
+    Lower-cased name, description and search terms of every repository, as matched by exclusion terms.
+
+    :param df: Repositories table.
+    :return: One string per row, aligned with df (comma-separated search terms are joined by spaces).
+    """
+    return lowercase_text(df, EXCLUSION_COLUMNS, list_columns=EXCLUSION_LIST_COLUMNS)
 
 
-def load_repos_from_csv(file_path: str) -> List[Dict]:
+def match_exclusion_terms(
+    df: pd.DataFrame,
+    exclusion_terms=None,
+    word_boundaries: bool = EXCLUSION_WORD_BOUNDARIES,
+) -> pd.Series:
     """
-    Load repositories from a single CSV file.
+    Find the exclusion term matching each repository, for filtering and auditing.
 
-    Expected columns (min): 'name', 'desc.', 'search_term'
-    - 'search_term' may contain comma-separated values; we'll split and strip.
+    :param df: Repositories table.
+    :param exclusion_terms: Terms (default: EXCLUSION_TERMS).
+    :param word_boundaries: Only match whole words instead of any substring.
+    :return: The first matching term of each row (None if the row is kept), aligned with df.
     """
-    repos: List[Dict] = []
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"CSV not found: {file_path}")
+    matcher = ExclusionMatcher(EXCLUSION_TERMS if exclusion_terms is None else exclusion_terms, word_boundaries)
+    if not matcher.terms or df.empty:
+        return pd.Series(None, index=df.index, dtype=object, name="excluded_by")
+    matches = exclusion_texts(df).str.extract(f"({matcher.pattern})", expand=False)
+    return matches.astype(object).where(matches.notna(), None).rename("excluded_by")
+
+
+def exclude_repos_by_terms(
+    df: pd.DataFrame,
+    exclusion_terms=None,
+    word_boundaries: bool = EXCLUSION_WORD_BOUNDARIES,
+    audit_path: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Drop the repositories whose name, description or search terms contain an exclusion term.
 
-    with open(file_path, mode="r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            raw_terms = row.get("search_term") or ""
-            terms = [t.strip() for t in raw_terms.split(",")] if raw_terms else []
-            row["search_term"] = terms
-            repos.append(row)
-    logger.info("[CSV] Loaded %d repositories from %s", len(repos), file_path)
-    return repos
+    All terms are compiled into one pattern (see `exclusion`) and matched by a single
+    `str.contains` over the lower-cased text column; only the excluded rows are matched
+    again to tell which term excluded them.
+
+    :param df: Repositories table.
+    :param exclusion_terms: Terms (default: EXCLUSION_TERMS).
+    :param word_boundaries: Only match whole words ("tool" no longer matches "toolkit").
+    :param audit_path: If set, the excluded repositories and the term that excluded each are saved there.
+    :return: The remaining rows, columns and their order unchanged.
+    """
+    matcher = ExclusionMatcher(EXCLUSION_TERMS if exclusion_terms is None else exclusion_terms, word_boundaries)
+    if not matcher.terms or df.empty:
+        return df
+    excluded = exclusion_texts(df).str.contains(matcher.pattern, regex=True).to_numpy(dtype=bool)
+    excluded_by = match_exclusion_terms(df[excluded], matcher.terms, word_boundaries)
+    logger.info(
+        "[Filter] Excluded %d of %d repositories: %s",
+        int(excluded.sum()),
+        len(df),
+        {term: int(count) for term, count in excluded_by.value_counts().items()},
+    )
+    if audit_path:
+        audit_columns = [column for column in ("full_name", "URL") if column in df.columns]
+        audit = df.loc[excluded, audit_columns].assign(excluded_by=excluded_by)
+        storage.write_table(audit, audit_path)
+        logger.info("[Filter] Exclusion audit saved to '%s'", audit_path)
+    return df[~excluded]
 
 
 def filter_repos_by_exclusion_terms(
@@ -206,14 +423,14 @@ def filter_repos_by_exclusion_terms(
     term: Optional[str] = None,
 ) -> Optional[str]:
     """
-    Filter a SINGLE CSV file by exclusion terms and save the result.
+    Filter a SINGLE table by exclusion terms and save the result.
 
     Args:
-        output_path: directory for the filtered CSV. If None, uses ROOT/dataset/processed_data.
+        output_path: directory for the filtered table. If None, uses ROOT/dataset/processed_data.
         term: label used in the output filename (e.g., the search seed). If None, inferred from filename.
 
     Returns:
-        The saved CSV filepath, or None if there was nothing to save.
+        The saved table filepath, or None if there was nothing to save.
     """
     folder_path = f"{ROOT}/dataset/processed_data"
     file_path = list_file(folder_path, "File")  # kept as-is to preserve current behavior
@@ -230,60 +447,37 @@ def filter_repos_by_exclusion_terms(
         term = tokens[1] if len(tokens) >= 2 else tokens[0]
         logger.debug("[Filter] Inferred term '%s' from filename '%s'", term, base)
 
-    exclusion_terms = {
-        "courses", "toy", "tutorial", "classes", "books", "book",
-        "guidelines", "tools", "tool", "demos", "demo", "simulator",
-        "simulators", "class", "course", "toys", "cutting-edge", "library",
-        "cuttingedge", "cutting_edge", "cutting edge",
-    }
-
-    repos = load_repos_from_csv(file_path)
+    df = _read_csv_safe(file_path)
+    logger.info("[Load] Loaded %d repositories from %s", len(df), file_path)
+    filtered = exclude_repos_by_terms(df)
 
-    def _concat_text(repo: Dict) -> str:
-        name = repo.get("name") or ""
-        desc = repo.get("desc.") or ""
-        terms_txt = " ".join(repo.get("search_term", []) or [])
-        return f"{name} {desc} {terms_txt}".lower()
-
-    filtered_repos: List[Dict] = []
-    for repo in repos:
-        haystack = _concat_text(repo)
-        if any(term_ex in haystack for term_ex in exclusion_terms):
-            continue
-        filtered_repos.append(repo)
-
-    saved = save_filtered_repository(filtered_repos, output_path, term)
+    saved = save_filtered_repository(filtered, output_path, term)
     logger.info(
         "[Filter] Input: %d repos | Filtered: %d repos | Saved: %s",
-        len(repos),
-        len(filtered_repos),
+        len(df),
+        len(filtered),
         saved or "nothing",
     )
     return saved
 
 
 def save_filtered_repository(
-    repos: List[Dict],
+    df: pd.DataFrame,
     output_path: str,
     term: str,
 ) -> Optional[str]:
     """
-    Persist filtered repositories to CSV.
+    Persist filtered repositories to a table in the `STORAGE_FORMAT` format.
+    Columns keep the order of the input table.
     Returns the saved filepath or None if nothing to save.
     """
-    if not repos:
+    if df.empty:
         logger.warning("[Save] No repositories to save after filtering.")
         return None
 
-    filename = f"[EXCLUSION-TERM]_{term}_{format_datetime()}.csv"
+    filename = f"[EXCLUSION-TERM]_{term}_{format_datetime()}{storage.extension()}"
     file_path = os.path.join(output_path, filename)
-
-    # Collect all keys across repos to keep columns stable
-    keys = sorted({k for repo in repos for k in repo.keys()})
-    with open(file_path, mode="w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=keys)
-        writer.writeheader()
-        writer.writerows(repos)
+    storage.write_table(df, file_path)
 
     logger.info("[Save] Filtered repositories saved to '%s'", file_path)
     return file_path
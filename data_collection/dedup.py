@@ -0,0 +1,289 @@
+"""
+Deduplication of repository tables, including tables that do not fit in memory.
+
+`stream_drop_duplicates` reads the input tables chunk by chunk (`storage.iter_table`)
+and writes the unique rows as it goes. Every row is reduced to a 64-bit hash of its
+key columns (`pandas.util.hash_pandas_object`); the hashes already seen are kept in
+a `HashSet` of sorted NumPy runs, 8 bytes per distinct repository, instead of the
+rows themselves. Memory is thus bounded by one chunk plus the hash set, whatever the
+size of the input, and the first occurrence of each repository is kept, as
+`DataFrame.drop_duplicates` does.
+
+Two different keys sharing a 64-bit hash would make the second one a duplicate; the
+odds stay below one in a million up to about 6 million distinct repositories.
+
+`merge_duplicate_repos` deduplicates in memory by repository instead: rows of the
+same repository (GitHub id when the table has one, otherwise the case-insensitive
+`full_name`) become one row with the metrics of the most recent `last_commit`, and
+the `search_term` values of all of them, so no search term that found a
+repository is lost.
+
+  python dedup.py dataset/processed_data/[CONCATENATED]-raw_data-(timestamp).csv out.parquet --chunksize 100000
+  python dedup.py dataset/raw_data merged.csv --merge
+"""
+
+import argparse
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+import storage
+
+logger = logging.getLogger(__name__)
+
+# Columns identifying a repository when removing duplicates.
+DEDUP_COLUMNS = ["name", "full_name", "URL"]
+
+# Rows per chunk of the streaming deduplication; 0 deduplicates in memory.
+DEDUP_CHUNKSIZE = int(os.getenv("DEDUP_CHUNKSIZE", "0"))
+
+
+class HashSet:
+    """
+    Set of 64-bit hashes stored as sorted NumPy runs.
+
+    New hashes become a run; runs of similar sizes are merged, so there are about
+    log2(n) runs and each hash is merged about log2(n) times.
+    """
+
+    def __init__(self) -> None:
+        self._runs: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return sum(len(run) for run in self._runs)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(run.nbytes for run in self._runs)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """Return whether each of `hashes` is in the set."""
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            positions = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            found |= run[positions] == hashes
+        return found
+
+    def add(self, hashes: np.ndarray) -> None:
+        """Add distinct hashes that are not in the set yet."""
+        if not len(hashes):
+            return
+        self._runs.append(np.sort(hashes))
+        while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+            newer, older = self._runs.pop(), self._runs.pop()
+            # Concatenated sorted runs are merged in linear time by the stable sort.
+            self._runs.append(np.sort(np.concatenate([older, newer]), kind="stable"))
+
+
+def row_hashes(df: pd.DataFrame, subset: Sequence[str]) -> np.ndarray:
+    """64-bit hash of the `subset` columns of each row (compared as strings, so chunks agree)."""
+    return pd.util.hash_pandas_object(df[list(subset)].astype("string"), index=False).to_numpy()
+
+
+def repo_keys(df: pd.DataFrame, key: Optional[str] = None) -> pd.Series:
+    """
+    Stable identifier of the repository of each row.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Repositories table.
+    key : str, optional
+        Key column. Default: `id` if present, otherwise `full_name`; text keys are
+        compared stripped and lower-cased, as GitHub names are case-insensitive.
+    """
+    key = key or ("id" if "id" in df.columns else "full_name")
+    if key not in df.columns:
+        raise ValueError(f"Key column {key!r} not in the table.")
+    keys = df[key]
+    if pd.api.types.is_string_dtype(keys) or keys.dtype == object:
+        keys = keys.astype("string").str.strip().str.lower()
+    return keys.rename("_key")
+
+
+def merge_search_terms(search_terms: pd.Series, groups: np.ndarray) -> pd.Series:
+    """
+    Sorted, distinct, comma-separated search terms of each repository.
+
+    Parameters
+    ----------
+    search_terms : pandas.Series
+        Comma-separated search terms of each row.
+    groups : numpy.ndarray
+        Repository of each row, as integer codes (see `merge_duplicate_repos`).
+
+    Returns
+    -------
+    pandas.Series
+        The merged terms, indexed by group code (missing when a repository has none).
+    """
+    terms = pd.DataFrame({"group": groups, "term": search_terms.astype("string").str.split(",")}).explode("term")
+    terms["term"] = terms["term"].str.strip()
+    terms = terms[terms["term"].notna() & (terms["term"] != "")].drop_duplicates().sort_values(["group", "term"])
+
+    # Sorted by group: each repository's terms are one contiguous slice, joined without a groupby per repository.
+    codes = terms["group"].to_numpy()
+    values = terms["term"].to_numpy(dtype=object)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=int)
+    ends = np.r_[starts[1:], len(codes)]
+    return pd.Series([",".join(values[a:b]) for a, b in zip(starts, ends)], index=codes[starts], dtype="string")
+
+
+def merge_duplicate_repos(df: pd.DataFrame, key: Optional[str] = None) -> pd.DataFrame:
+    """
+    Merge the rows of each repository into one.
+
+    The row with the most recent `last_commit` provides the metrics (the first one
+    on ties), `search_term` lists the distinct terms of all rows, sorted, and the
+    repositories keep the order of their first occurrence.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Repositories table.
+    key : str, optional
+        Key column (see `repo_keys`).
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per repository, columns unchanged.
+    """
+    if df.empty:
+        return df
+    keys = repo_keys(df, key)
+    # Integer code of each repository, numbered in order of first occurrence.
+    groups = keys.groupby(keys, sort=False, dropna=False).ngroup().to_numpy()
+    ranked = df.assign(_group=groups)
+    if "last_commit" in df.columns:
+        ranked = ranked.sort_values("last_commit", ascending=False, na_position="last", kind="stable")
+    freshest = ranked.drop_duplicates("_group").sort_values("_group")
+    if "search_term" in df.columns:
+        freshest["search_term"] = merge_search_terms(df["search_term"], groups).reindex(freshest["_group"]).to_numpy()
+    logger.info("[Dedup] Merged %d rows into %d repositories.", len(df), len(freshest))
+    return freshest.drop(columns="_group")
+
+
+@dataclass
+class DedupReport:
+    rows_in: int = 0
+    rows_out: int = 0
+    chunks: int = 0
+    hash_bytes: int = 0
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        rate = self.rows_in / self.seconds if self.seconds else 0.0
+        return (
+            f"{self.rows_in} -> {self.rows_out} rows in {self.chunks} chunks, {self.seconds:.2f} s "
+            f"({rate:.0f} rows/s; hash set {self.hash_bytes / 2 ** 20:.1f} MiB)"
+        )
+
+
+def stream_drop_duplicates(
+    inputs: Union[str, Sequence[str]],
+    output_path: str,
+    subset: Optional[Sequence[str]] = None,
+    chunksize: int = 100_000,
+) -> DedupReport:
+    """
+    Copy the rows of `inputs` to `output_path` without duplicates, chunk by chunk.
+
+    Parameters
+    ----------
+    inputs : str or sequence of str
+        Tables, or folders whose tables are all read, in order (any `storage` format).
+    output_path : str
+        Output table; its extension selects the format.
+    subset : sequence of str, optional
+        Columns identifying a repository. Default: `DEDUP_COLUMNS`; the columns
+        missing from the first chunk are ignored, and whole rows are compared if
+        none of them is present.
+    chunksize : int, optional
+        Rows read at once.
+
+    Returns
+    -------
+    DedupReport
+        Row counts, chunks, size of the hash set and duration.
+    """
+    paths = [inputs] if isinstance(inputs, str) else list(inputs)
+    tables = [table for path in paths for table in (storage.list_tables(path) if os.path.isdir(path) else [path])]
+    report = DedupReport()
+    seen = HashSet()
+    writer = None
+    key_columns = None
+    start = time.perf_counter()
+
+    try:
+        for table in tables:
+            for chunk in storage.iter_table(table, chunksize):
+                if writer is None:
+                    key_columns = [column for column in (subset or DEDUP_COLUMNS) if column in chunk.columns]
+                    if not key_columns:
+                        logger.warning(
+                            "None of expected columns %s found. Falling back to full-row duplicate removal.",
+                            list(subset or DEDUP_COLUMNS),
+                        )
+                        key_columns = list(chunk.columns)
+                    folder = os.path.dirname(output_path)
+                    if folder:
+                        os.makedirs(folder, exist_ok=True)
+                    writer = storage.TableWriter(output_path, columns=chunk.columns)
+
+                hashes = row_hashes(chunk, key_columns)
+                keep = ~pd.Series(hashes).duplicated().to_numpy() & ~seen.contains(hashes)
+                seen.add(hashes[keep])
+                writer.write_frame(chunk[keep])
+
+                report.rows_in += len(chunk)
+                report.rows_out += int(keep.sum())
+                report.chunks += 1
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        logger.warning("No rows read from %s; nothing written.", paths)
+    report.hash_bytes = seen.nbytes
+    report.seconds = time.perf_counter() - start
+    logger.info("[Dedup] %s", report)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Remove duplicated repositories from tables larger than memory.")
+    parser.add_argument("inputs", nargs="+", help="Tables or folders of tables, in order.")
+    parser.add_argument("output", help="Output table; its extension selects the format.")
+    parser.add_argument("--subset", nargs="+", help=f"Key columns (default: {' '.join(DEDUP_COLUMNS)}).")
+    parser.add_argument("--chunksize", type=int, default=DEDUP_CHUNKSIZE or 100_000, help="Rows read at once.")
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="Merge the rows of each repository in memory (freshest metrics, all search terms).",
+    )
+    parser.add_argument("--key", help="Repository key of --merge (default: id, or full_name).")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if args.merge:
+        tables = [
+            table for path in args.inputs for table in (storage.list_tables(path) if os.path.isdir(path) else [path])
+        ]
+        df = pd.concat([storage.read_table(table) for table in tables], ignore_index=True)
+        start = time.perf_counter()
+        merged = merge_duplicate_repos(df, key=args.key)
+        seconds = time.perf_counter() - start
+        storage.write_table(merged, args.output)
+        print(f"{len(df)} -> {len(merged)} rows in {seconds:.2f} s ({len(df) / seconds:.0f} rows/s)")
+        return
+    print(stream_drop_duplicates(args.inputs, args.output, subset=args.subset, chunksize=args.chunksize))
+
+
+if __name__ == "__main__":
+    main()
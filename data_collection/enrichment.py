@@ -0,0 +1,310 @@
+"""
+Enrichment backends computing the per-repository metrics of the mined CSVs.
+
+- `EnrichmentEngine` (REST): one call per (repository, metric), on a thread pool.
+- `GraphQLEnricher`: commit counts of many repositories per aliased GraphQL query;
+  metrics GraphQL cannot provide (contributors) still go through REST fetchers.
+
+Both expose `enrich(repos, on_repo=None)` and return the same fields.
+"""
+
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from telemetry import Telemetry
+
+logger = logging.getLogger(__name__)
+
+Fetcher = Callable[[str, str], int]
+RepoCallback = Callable[[Dict, Dict[str, int]], None]
+Poster = Callable[[str, Dict], requests.Response]
+
+
+class EnrichmentEngine:
+    """
+    Fan out the per-repository enrichment calls to a bounded thread pool.
+
+    Every (repository, field) pair becomes one task, so a repository with a long
+    commit history does not block the other calls of the same batch. Results are
+    re-assembled in input order, which keeps the CSV output deterministic.
+    """
+
+    def __init__(
+        self,
+        fetchers: Dict[str, Fetcher],
+        max_workers: int = 1,
+        telemetry: Optional[Telemetry] = None,
+    ) -> None:
+        """
+        Initialize the enrichment engine.
+
+        Parameters
+        ----------
+        fetchers : dict
+            Mapping of output field name to a callable receiving `(owner, repo_name)`
+            and returning the metric value (e.g. `count_total_commits`).
+        max_workers : int, optional
+            Maximum number of concurrent calls. `1` keeps the sequential behavior.
+        telemetry : Telemetry, optional
+            Receives a 'repo' span per repository, from its first call to its last.
+        """
+        self.fetchers = fetchers
+        self.max_workers = max(1, max_workers)
+        self.telemetry = telemetry
+
+    def enrich(
+        self, repos: List[Dict], on_repo: Optional[RepoCallback] = None
+    ) -> List[Dict[str, int]]:
+        """
+        Compute every configured metric for the given repositories.
+
+        Parameters
+        ----------
+        repos : list of dict
+            Repository objects as returned by the GitHub Search API.
+        on_repo : callable, optional
+            Called with `(repo, metrics)` as soon as all metrics of a repository
+            are known (in completion order), e.g. to checkpoint progress.
+
+        Returns
+        -------
+        list of dict
+            One `{field: value}` mapping per repository, in the same order as `repos`.
+        """
+        tasks = [
+            (index, field, fetcher, repo["owner"]["login"], repo["name"])
+            for index, repo in enumerate(repos)
+            for field, fetcher in self.fetchers.items()
+        ]
+        results: List[Dict[str, int]] = [{} for _ in repos]
+
+        logger.info(
+            "Enriching %d repositories (%d calls, %d workers).",
+            len(repos),
+            len(tasks),
+            self.max_workers,
+        )
+
+        pending = [len(self.fetchers)] * len(repos)
+        started: List[Optional[tuple]] = [None] * len(repos)
+
+        def _call(index: int, fetcher: Fetcher, owner: str, name: str) -> int:
+            if started[index] is None:
+                started[index] = (time.time(), time.perf_counter())
+            return fetcher(owner, name)
+
+        def _done(index: int, field: str, value: int) -> None:
+            results[index][field] = value
+            pending[index] -= 1
+            if pending[index] > 0:
+                return
+            if self.telemetry is not None:
+                started_at, start = started[index]
+                self.telemetry.record_span(
+                    "repo", repos[index]["full_name"], started_at, time.perf_counter() - start
+                )
+            if on_repo is not None:
+                on_repo(repos[index], results[index])
+
+        if self.max_workers == 1:
+            for index, field, fetcher, owner, name in tasks:
+                _done(index, field, _call(index, fetcher, owner, name))
+            return results
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="enrich"
+        ) as executor:
+            futures = {
+                executor.submit(_call, index, fetcher, owner, name): (index, field)
+                for index, field, fetcher, owner, name in tasks
+            }
+            for future in as_completed(futures):
+                index, field = futures[future]
+                _done(index, field, future.result())
+
+        return results
+
+
+class GraphQLEnricher:
+    """
+    Batch commit counting through the GitHub GraphQL API.
+
+    Each query asks for `history.totalCount` of the default branch, overall and
+    within a date window, for `batch_size` aliased repositories at once. Batches
+    run concurrently; a batch that fails (including a `200` without `data`, as
+    for rate limits and timeouts) falls back to the REST fetchers, and so do the
+    repositories whose alias is missing or null. Only a repository without a
+    default branch (empty) counts 0 commits.
+    """
+
+    def __init__(
+        self,
+        post: Poster,
+        url: str,
+        window: Dict[str, str],
+        rest_fetchers: Dict[str, Fetcher],
+        fallback_fetchers: Dict[str, Fetcher],
+        batch_size: int = 50,
+        max_workers: int = 1,
+        telemetry: Optional[Telemetry] = None,
+    ) -> None:
+        """
+        Initialize the GraphQL backend.
+
+        Parameters
+        ----------
+        post : callable
+            Sends `(url, json_body)` and returns the response (e.g. `GitHubClient.post`).
+        url : str
+            GraphQL endpoint URL.
+        window : dict
+            `since`/`until` ISO timestamps of the `commits_2024` count.
+        rest_fetchers : dict
+            Metrics not available through GraphQL (e.g. `collaborators`), fetched
+            with `EnrichmentEngine`.
+        fallback_fetchers : dict
+            REST fetchers of `total_commits` and `commits_2024`, used for failed batches.
+        batch_size : int, optional
+            Repositories per GraphQL query.
+        max_workers : int, optional
+            Concurrent queries (and REST calls).
+        telemetry : Telemetry, optional
+            Receives a 'graphql_batch' span per query and the REST 'repo' spans.
+        """
+        self.post = post
+        self.url = url
+        self.window = window
+        self.rest_fetchers = rest_fetchers
+        self.fallback_fetchers = fallback_fetchers
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max(1, max_workers)
+        self.telemetry = telemetry
+
+    def build_query(self, repos: List[Dict]) -> str:
+        """Build one aliased query (`r0`, `r1`, ...) for a batch of repositories."""
+        window = f'since: {json.dumps(self.window["since"])}, until: {json.dumps(self.window["until"])}'
+        fields = [
+            f"r{index}: repository(owner: {json.dumps(repo['owner']['login'])}, "
+            f"name: {json.dumps(repo['name'])}) {{ defaultBranchRef {{ target {{ ... on Commit {{ "
+            f"total: history {{ totalCount }} window: history({window}) {{ totalCount }} "
+            f"}} }} }} }}"
+            for index, repo in enumerate(repos)
+        ]
+        return "query {\n  " + "\n  ".join(fields) + "\n}"
+
+    def _query_batch(self, repos: List[Dict]) -> List[Dict[str, int]]:
+        if self.telemetry is None:
+            return self._send_batch(repos)
+        with self.telemetry.span("graphql_batch", f"{len(repos)} repositories"):
+            return self._send_batch(repos)
+
+    def _send_batch(self, repos: List[Dict]) -> List[Dict[str, int]]:
+        try:
+            response = self.post(self.url, {"query": self.build_query(repos)})
+        except requests.RequestException as exc:
+            logger.error("GraphQL request error, falling back to REST for %d repos: %s", len(repos), exc)
+            return EnrichmentEngine(self.fallback_fetchers).enrich(repos)
+
+        if response.status_code != 200:
+            logger.error(
+                "GraphQL error %s, falling back to REST for %d repos: %s",
+                response.status_code,
+                len(repos),
+                response.text,
+            )
+            return EnrichmentEngine(self.fallback_fetchers).enrich(repos)
+
+        payload = response.json()
+        errors = payload.get("errors") or []
+        for error in errors:
+            logger.error("GraphQL error (%s): %s", error.get("type"), error.get("message"))
+
+        # Rate limits and timeouts are answered 200 without data.
+        data = payload.get("data")
+        if data is None:
+            logger.error("GraphQL query without data, falling back to REST for %d repos.", len(repos))
+            return EnrichmentEngine(self.fallback_fetchers).enrich(repos)
+
+        results: List[Dict[str, int]] = []
+        failed = []
+        for index, repo in enumerate(repos):
+            node = data.get(f"r{index}")
+            if node is None:
+                # NOT_FOUND, FORBIDDEN, ...: the node failed, not the repository.
+                failed.append(index)
+                results.append({})
+                continue
+            if node.get("defaultBranchRef") is None:
+                # An empty repository has no default branch, hence no commits.
+                results.append({"total_commits": 0, "commits_2024": 0})
+                continue
+            target = node["defaultBranchRef"].get("target") or {}
+            total = (target.get("total") or {}).get("totalCount")
+            window = (target.get("window") or {}).get("totalCount")
+            if total is None or window is None:
+                failed.append(index)
+                results.append({})
+                continue
+            results.append({"total_commits": total, "commits_2024": window})
+
+        if failed:
+            logger.error("GraphQL returned no counts for %d repos, falling back to REST.", len(failed))
+            fallback = EnrichmentEngine(self.fallback_fetchers).enrich([repos[index] for index in failed])
+            for index, values in zip(failed, fallback):
+                results[index] = values
+        return results
+
+    def enrich(
+        self, repos: List[Dict], on_repo: Optional[RepoCallback] = None
+    ) -> List[Dict[str, int]]:
+        """
+        Compute every metric for the given repositories.
+
+        Parameters
+        ----------
+        repos : list of dict
+            Repository objects as returned by the GitHub Search API.
+        on_repo : callable, optional
+            Called with `(repo, metrics)` once all metrics of a repository are known.
+
+        Returns
+        -------
+        list of dict
+            One `{field: value}` mapping per repository, in the same order as `repos`.
+        """
+        batches = [
+            (start, repos[start: start + self.batch_size])
+            for start in range(0, len(repos), self.batch_size)
+        ]
+        logger.info(
+            "Enriching %d repositories with %d GraphQL queries (%d workers).",
+            len(repos),
+            len(batches),
+            self.max_workers,
+        )
+
+        commits: List[Dict[str, int]] = [{} for _ in repos]
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="graphql"
+        ) as executor:
+            futures = {executor.submit(self._query_batch, batch): start for start, batch in batches}
+            for future in as_completed(futures):
+                start = futures[future]
+                for offset, values in enumerate(future.result()):
+                    commits[start + offset] = values
+
+        positions = {id(repo): index for index, repo in enumerate(repos)}
+
+        def _merge(repo: Dict, metrics: Dict[str, int]) -> None:
+            if on_repo is not None:
+                on_repo(repo, {**commits[positions[id(repo)]], **metrics})
+
+        rest = EnrichmentEngine(
+            self.rest_fetchers, max_workers=self.max_workers, telemetry=self.telemetry
+        ).enrich(repos, on_repo=_merge)
+        return [{**commit_metrics, **other} for commit_metrics, other in zip(commits, rest)]
@@ -0,0 +1,120 @@
+"""
+Compiled multi-pattern matching of exclusion terms.
+
+All terms are compiled into one regular expression shaped as a trie of the terms
+(e.g. `too(?:l(?:s)?|y(?:s)?)`), the regex counterpart of an Aho-Corasick
+automaton: a text is scanned once instead of once per term, each position only
+follows the branch of its next character, and the longest term starting at the
+leftmost match wins. The match tells which term excluded a repository. Two
+semantics are available:
+
+- substring (default, the behavior of the study): "tool" also matches "toolkit";
+- word boundaries: a term only matches when it is not preceded or followed by a
+  letter or digit, so "tool" matches "a tool" and "tool-chain" but not "toolkit".
+
+`lowercase_text` builds the matched text of a whole table as one string column, so
+the pattern can be applied by a single `Series.str.contains`.
+"""
+
+import re
+from typing import Dict, Iterable, Mapping, Optional, Sequence
+
+import pandas as pd
+
+# Word boundaries: no letter or digit right before or after a term ('_' and '-'
+# separate words). The lookbehind runs after the first character of the term
+# (see `trie_pattern`), hence its width of 2.
+_NOT_AFTER_WORD = r"(?<![^\W_].)"
+_NOT_BEFORE_WORD = r"(?![^\W_])"
+
+
+def lowercase_text(
+    df: pd.DataFrame, columns: Sequence[str], list_columns: Optional[Mapping[str, str]] = None
+) -> pd.Series:
+    """
+    Return the lower-cased `columns` of each row joined by spaces, as one string column.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Repositories table.
+    columns : sequence of str
+        Columns to join; missing values count as empty strings.
+    list_columns : mapping of str to str, optional
+        Columns holding separated lists (e.g. `{"search_term": ","}`); their items
+        are stripped and joined by spaces.
+    """
+    list_columns = list_columns or {}
+    joined = None
+    for column in columns:
+        text = df[column].astype("string").fillna("")
+        separator = list_columns.get(column)
+        if separator:
+            text = text.str.replace(rf"\s*{re.escape(separator)}\s*", " ", regex=True).str.strip()
+        # `+` concatenates the string arrays natively, `str.cat` goes through Python objects.
+        joined = text if joined is None else joined + " " + text
+    return joined.str.lower()
+
+
+def trie_pattern(terms: Iterable[str], after_first: str = "") -> str:
+    """
+    Return a regular expression matching any of `terms`, factored as a prefix trie.
+
+    `after_first` is inserted after the first character of every term. Conditions
+    on the text before a match (lookbehinds) go there rather than in front of the
+    pattern, so the regex engine can still skip to the candidate first characters.
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def _build(node: Dict, prefix: str = "") -> str:
+        branches = [
+            re.escape(char) + prefix + _build(child) for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        if "" in node:
+            # A term ends here: longer terms are optional (greedy, so the longest wins).
+            return f"(?:{'|'.join(branches)})?"
+        return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+    return _build(trie, after_first)
+
+
+class ExclusionMatcher:
+    """
+    Match a set of lower-case terms against lower-cased texts.
+    """
+
+    def __init__(self, terms: Iterable[str], word_boundaries: bool = False) -> None:
+        """
+        Compile the terms.
+
+        Parameters
+        ----------
+        terms : iterable of str
+            Exclusion terms; matching is case-insensitive.
+        word_boundaries : bool, optional
+            Only match whole words instead of any substring.
+        """
+        self.terms = sorted({term.lower() for term in terms if term})
+        self.word_boundaries = word_boundaries
+        if word_boundaries:
+            self.pattern = f"(?:{trie_pattern(self.terms, after_first=_NOT_AFTER_WORD)}){_NOT_BEFORE_WORD}"
+        else:
+            self.pattern = f"(?:{trie_pattern(self.terms)})"
+        self._regex = re.compile(self.pattern) if self.terms else None
+
+    def match(self, text: str) -> Optional[str]:
+        """Return the first term found in `text` (lower-cased by the caller), or None."""
+        if self._regex is None:
+            return None
+        found = self._regex.search(text)
+        return found.group(0) if found else None
+
+    def __contains__(self, text: str) -> bool:
+        return self.match(text) is not None
@@ -0,0 +1,432 @@
+"""
+Shared HTTP client for the GitHub API calls of the miner.
+
+All requests go through one `requests.Session` whose `HTTPAdapter` keeps a pool of
+keep-alive connections, so TCP/TLS handshakes are paid once per pooled connection
+instead of once per request. The client also records per-endpoint latency and the
+number/duration of new connections, which makes connection reuse measurable.
+
+When a `RateLimitScheduler` is given, every request first takes a token of its
+rate-limit resource, and rate-limited or failed responses are retried. When a
+`ResponseCache` is given, fresh cached responses are served without a request and
+stale ones are revalidated with conditional requests.
+
+`max_in_flight` bounds the number of requests on the wire at once across every
+thread using the client, so concurrent terms and enrichment pools share a single
+concurrency budget.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from rate_limit import RateLimitScheduler
+from response_cache import ResponseCache
+from utils import percentile
+
+if TYPE_CHECKING:
+    from telemetry import Telemetry
+
+logger = logging.getLogger(__name__)
+
+
+def endpoint_name(url: str) -> str:
+    """
+    Classify a GitHub API URL into the endpoint family used in the statistics.
+
+    Parameters
+    ----------
+    url : str
+        Requested URL.
+
+    Returns
+    -------
+    str
+        'search', 'commits', 'contributors', 'graphql', or the URL path for
+        anything else.
+    """
+    path = urlparse(url).path.rstrip("/")
+    if path.startswith("/search/"):
+        return "search"
+    if path.endswith("/graphql"):
+        return "graphql"
+    if path.endswith("/commits"):
+        return "commits"
+    if path.endswith("/contributors"):
+        return "contributors"
+    return path or "/"
+
+
+class ClientStats:
+    """
+    Thread-safe counters for requests, latencies and opened connections.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear every counter."""
+        with self._lock:
+            self.latencies: Dict[str, List[float]] = defaultdict(list)
+            self.bytes: Dict[str, int] = defaultdict(int)
+            self.connections = 0
+            self.connect_time = 0.0
+            self.cache: Dict[str, int] = defaultdict(int)
+
+    def record_request(self, endpoint: str, latency: float) -> None:
+        with self._lock:
+            self.latencies[endpoint].append(latency)
+
+    def record_bytes(self, endpoint: str, size: int) -> None:
+        """Count the (decoded) body bytes received from `endpoint`; cache hits are not counted."""
+        with self._lock:
+            self.bytes[endpoint] += size
+
+    def record_cache(self, outcome: str) -> None:
+        """Count a cache outcome: 'fresh' (no request sent) or 'revalidated' (304)."""
+        with self._lock:
+            self.cache[outcome] += 1
+
+    def record_connect(self, seconds: float) -> None:
+        with self._lock:
+            self.connections += 1
+            self.connect_time += seconds
+
+    @property
+    def requests(self) -> int:
+        with self._lock:
+            return sum(len(values) for values in self.latencies.values())
+
+    def summary(self) -> Dict:
+        """
+        Aggregate the counters.
+
+        Returns
+        -------
+        dict
+            Totals (`requests`, `bytes`, `connections`, `reused`, `connect_time`,
+            `handshake_saved`, `p50`, `p95`), the `cache` outcome counts and an
+            `endpoints` mapping with per-endpoint `requests`, `bytes`, `mean`,
+            `p50`, `p95` and `max` latency (seconds).
+        """
+        with self._lock:
+            requests_count = sum(len(values) for values in self.latencies.values())
+            reused = max(0, requests_count - self.connections)
+            mean_connect = self.connect_time / self.connections if self.connections else 0.0
+            every_latency = [value for values in self.latencies.values() for value in values]
+            endpoints = {
+                name: {
+                    "requests": len(values),
+                    "bytes": self.bytes.get(name, 0),
+                    "mean": sum(values) / len(values),
+                    "p50": percentile(values, 50),
+                    "p95": percentile(values, 95),
+                    "max": max(values),
+                }
+                for name, values in sorted(self.latencies.items())
+            }
+            return {
+                "requests": requests_count,
+                "bytes": sum(self.bytes.values()),
+                "connections": self.connections,
+                "reused": reused,
+                "connect_time": self.connect_time,
+                "handshake_saved": reused * mean_connect,
+                "p50": percentile(every_latency, 50),
+                "p95": percentile(every_latency, 95),
+                "cache": dict(self.cache),
+                "endpoints": endpoints,
+            }
+
+    def report(self) -> str:
+        """Return a human-readable multi-line report of `summary()`."""
+        summary = self.summary()
+        requests_count = summary["requests"]
+        reuse_ratio = summary["reused"] / requests_count if requests_count else 0.0
+        lines = [
+            f"requests: {requests_count} | received: {summary['bytes'] / 1024:.1f} KiB "
+            f"| new connections: {summary['connections']} "
+            f"| reused: {summary['reused']} ({reuse_ratio:.0%})",
+            f"time in handshakes: {summary['connect_time']:.2f} s "
+            f"| estimated handshake time saved: {summary['handshake_saved']:.2f} s",
+            f"cache: {summary['cache'].get('fresh', 0)} served without request "
+            f"| {summary['cache'].get('revalidated', 0)} revalidated (304)",
+            f"latency: p50 {summary['p50'] * 1000:.1f} ms | p95 {summary['p95'] * 1000:.1f} ms",
+        ]
+        for name, values in summary["endpoints"].items():
+            lines.append(
+                f"  {name:<14s} {values['requests']:7d} requests "
+                f"| {values['bytes'] / 1024:9.1f} KiB "
+                f"| mean {values['mean'] * 1000:8.1f} ms | p50 {values['p50'] * 1000:8.1f} ms "
+                f"| p95 {values['p95'] * 1000:8.1f} ms | max {values['max'] * 1000:8.1f} ms"
+            )
+        return "\n".join(lines)
+
+
+class _TimedConnectMixin:
+    """Report the duration of every new connection (TCP + TLS) to `stats`."""
+
+    stats: ClientStats
+
+    def connect(self) -> None:
+        start = time.perf_counter()
+        super().connect()
+        self.stats.record_connect(time.perf_counter() - start)
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """
+    `HTTPAdapter` whose connection pools time every newly opened connection.
+    """
+
+    def __init__(self, stats: ClientStats, **kwargs) -> None:
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        attrs = {"stats": self.stats}
+        http_conn = type("TimedHTTPConnection", (_TimedConnectMixin, HTTPConnection), attrs)
+        https_conn = type("TimedHTTPSConnection", (_TimedConnectMixin, HTTPSConnection), attrs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type("TimedHTTPConnectionPool", (HTTPConnectionPool,), {"ConnectionCls": http_conn}),
+            "https": type("TimedHTTPSConnectionPool", (HTTPSConnectionPool,), {"ConnectionCls": https_conn}),
+        }
+
+
+class GitHubClient:
+    """
+    Session-based client shared by every GitHub API helper.
+    """
+
+    def __init__(
+        self,
+        headers: Dict[str, str],
+        pool_size: int = 10,
+        timeout: Optional[float] = 30,
+        scheduler: Optional[RateLimitScheduler] = None,
+        max_retries: int = 0,
+        cache: Optional[ResponseCache] = None,
+        max_in_flight: Optional[int] = None,
+        telemetry: Optional["Telemetry"] = None,
+    ) -> None:
+        """
+        Initialize the client.
+
+        Parameters
+        ----------
+        headers : dict
+            Headers sent with every request (authorization, accept).
+        pool_size : int, optional
+            Maximum number of keep-alive connections kept per host. It should be at
+            least the number of threads issuing requests concurrently.
+        timeout : float, optional
+            Default timeout in seconds for requests without an explicit one.
+        scheduler : RateLimitScheduler, optional
+            Paces requests by rate-limit quota and decides which responses to retry.
+        max_retries : int, optional
+            Retries for rate-limited/5xx responses and network errors (requires
+            `scheduler`).
+        cache : ResponseCache, optional
+            Persistent response cache used for conditional requests.
+        max_in_flight : int, optional
+            Maximum number of concurrent requests across all threads (unbounded if
+            None). Waiting for a rate-limit token does not hold one of these slots.
+        telemetry : Telemetry, optional
+            Receives one structured record per request attempt.
+        """
+        self.timeout = timeout
+        self.cache = cache
+        self.scheduler = scheduler
+        self.max_retries = max_retries if scheduler else 0
+        self.stats = ClientStats()
+        self.telemetry = telemetry
+        self._in_flight = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        self.adapter = InstrumentedAdapter(
+            self.stats, pool_connections=pool_size, pool_maxsize=pool_size
+        )
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+    ) -> requests.Response:
+        """
+        Send a GET request through the pooled session (and the cache, if any).
+
+        Parameters
+        ----------
+        url : str
+            Requested URL.
+        params : dict, optional
+            Query parameters.
+        timeout : float, optional
+            Timeout in seconds. Default is the client timeout.
+
+        Returns
+        -------
+        requests.Response
+            The last response received (a cached `200` when the entry is fresh or
+            not modified). Network errors that persist after the retries raise
+            `requests.RequestException`.
+        """
+        if not self.cache:
+            return self._send("GET", url, params, timeout)
+
+        key = self.cache.key(url, params)
+        entry = self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            self.stats.record_cache("fresh")
+            return entry.to_response()
+
+        conditional = entry.conditional_headers() if entry is not None else None
+        response = self._send("GET", url, params, timeout, headers=conditional)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(key)
+            self.stats.record_cache("revalidated")
+            return entry.to_response()
+        if response.status_code == 200:
+            self.cache.store(key, response)
+        return response
+
+    def post(
+        self,
+        url: str,
+        json: Dict,
+        timeout: Optional[float] = None,
+    ) -> requests.Response:
+        """
+        Send a POST request with a JSON body (e.g. a GraphQL query), never cached.
+
+        Parameters
+        ----------
+        url : str
+            Requested URL.
+        json : dict
+            Request body.
+        timeout : float, optional
+            Timeout in seconds. Default is the client timeout.
+
+        Returns
+        -------
+        requests.Response
+            The last response received.
+        """
+        return self._send("POST", url, None, timeout, json=json)
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict],
+        timeout: Optional[float],
+        headers: Optional[Dict[str, str]] = None,
+        json: Optional[Dict] = None,
+    ) -> requests.Response:
+        """Send the request, pacing and retrying it through the scheduler if any."""
+        for attempt in range(self.max_retries + 1):
+            if self.scheduler:
+                self.scheduler.acquire(url)
+
+            try:
+                with self._in_flight or nullcontext():
+                    started_at = time.time()
+                    start = time.perf_counter()
+                    try:
+                        response = self.session.request(
+                            method,
+                            url,
+                            params=params,
+                            headers=headers,
+                            json=json,
+                            timeout=timeout or self.timeout,
+                        )
+                    except requests.RequestException as exc:
+                        self._record(method, url, started_at, time.perf_counter() - start, attempt, error=exc)
+                        raise
+                self._record(method, url, started_at, time.perf_counter() - start, attempt, response)
+            except requests.RequestException as exc:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.scheduler.backoff(attempt)
+                logger.warning("Request to %s failed (%s), retrying in %.1f s.", url, exc, delay)
+                time.sleep(delay)
+                continue
+
+            if not self.scheduler:
+                return response
+
+            self.scheduler.update(url, response)
+            if attempt == self.max_retries or not self.scheduler.should_retry(response):
+                return response
+
+            delay = self.scheduler.backoff(attempt)
+            logger.warning(
+                "Request to %s returned %s, retry %d/%d in %.1f s.",
+                url,
+                response.status_code,
+                attempt + 1,
+                self.max_retries,
+                delay,
+            )
+            time.sleep(delay)
+
+        return response
+
+    def _record(
+        self,
+        method: str,
+        url: str,
+        started_at: float,
+        latency: float,
+        attempt: int,
+        response: Optional[requests.Response] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """Add one attempt to the statistics and, if enabled, to the telemetry."""
+        endpoint = endpoint_name(url)
+        size = len(response.content) if response is not None else 0
+        self.stats.record_request(endpoint, latency)
+        self.stats.record_bytes(endpoint, size)
+        if self.telemetry is None:
+            return
+
+        remaining = response.headers.get("X-RateLimit-Remaining") if response is not None else None
+        self.telemetry.record_request(
+            method,
+            url,
+            endpoint,
+            started_at,
+            latency,
+            response.status_code if response is not None else None,
+            size=size,
+            ratelimit_remaining=int(remaining) if remaining and remaining.isdigit() else None,
+            retry=attempt,
+            error=type(error).__name__ if error is not None else None,
+        )
+
+    def report(self) -> str:
+        """Return the connection reuse and latency report."""
+        return self.stats.report()
+
+    def close(self) -> None:
+        self.session.close()
+        if self.cache:
+            self.cache.close()
@@ -0,0 +1,227 @@
+"""
+Batched language detection of repository descriptions.
+
+`langdetect` samples n-grams at random, so the same text can be classified
+differently from one run to the next unless `DetectorFactory.seed` is set; every
+detection here runs with `LANGDETECT_SEED`, in this process and in the workers.
+
+Descriptions are detected in batches on a process pool (`LANGDETECT_WORKERS`
+processes, `LANGDETECT_BATCH_SIZE` texts per task). Before that, a cheap pre-check
+accepts plain ASCII descriptions made of common English function words as English
+without running the detector; everything else goes through `langdetect`, once per
+distinct description, unless its result is already in the persistent memo cache
+(`LANGDETECT_CACHE_PATH`, see `language_cache`).
+"""
+
+import importlib.metadata
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from langdetect import DetectorFactory, LangDetectException, detect
+
+from language_cache import LanguageCache
+
+logger = logging.getLogger(__name__)
+
+LANGDETECT_SEED = int(os.getenv("LANGDETECT_SEED", "0"))
+# Empty or unset: one process per CPU.
+LANGDETECT_WORKERS = int(os.getenv("LANGDETECT_WORKERS") or os.cpu_count() or 1)
+LANGDETECT_BATCH_SIZE = int(os.getenv("LANGDETECT_BATCH_SIZE", "256"))
+
+# An empty LANGDETECT_CACHE_PATH disables the memo cache.
+LANGDETECT_CACHE_PATH = os.getenv(
+    "LANGDETECT_CACHE_PATH", os.path.join(os.getcwd(), ".cache", "langdetect.sqlite")
+)
+LANGDETECT_CACHE_MAX_ENTRIES = int(os.getenv("LANGDETECT_CACHE_MAX_ENTRIES", "1000000"))
+
+# Function words that are frequent in English and rare in other Latin-script
+# languages ("a", "in", "to", ... are left out on purpose).
+ENGLISH_MARKERS = frozenset(
+    {
+        "the", "and", "of", "for", "with", "this", "that", "is", "are", "was", "be",
+        "been", "it", "its", "from", "by", "on", "your", "you", "which", "can", "will",
+        "how", "what", "an", "or", "into", "using", "based", "has", "have", "their",
+        "our", "we", "these", "those", "such", "than", "other", "all", "more",
+    }
+)
+
+_WORD = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+
+@dataclass
+class DetectionReport:
+    rows: int = 0
+    prechecked: int = 0
+    cached: int = 0
+    detected: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.rows} descriptions in {self.seconds:.2f} s ({self.rows_per_second:.0f} rows/s; "
+            f"{self.prechecked} by the ASCII pre-check, {self.cached} distinct from the cache, "
+            f"{self.detected} distinct by langdetect)"
+        )
+
+
+def normalize(text) -> str:
+    """Return the description as a stripped string ('' for missing values)."""
+    if text is None or pd.isna(text):
+        return ""
+    return " ".join(str(text).split())
+
+
+def is_obvious_english(text: str, min_words: int = 4, min_share: float = 0.25) -> bool:
+    """
+    Cheap pre-check: plain ASCII text in which English function words are frequent.
+
+    Parameters
+    ----------
+    text : str
+        Normalized description.
+    min_words : int, optional
+        Shorter texts are left to the detector.
+    min_share : float, optional
+        Minimum share of `ENGLISH_MARKERS` among the words (at least two distinct).
+    """
+    if not text.isascii():
+        return False
+    words = _WORD.findall(text.lower())
+    if len(words) < min_words:
+        return False
+    markers = [word for word in words if word in ENGLISH_MARKERS]
+    return len(set(markers)) >= 2 and len(markers) / len(words) >= min_share
+
+
+def seed_detector(seed: int = LANGDETECT_SEED) -> None:
+    """Make `langdetect` deterministic in the current process."""
+    DetectorFactory.seed = seed
+
+
+def detector_version(seed: int = LANGDETECT_SEED) -> str:
+    """Identify the detector whose results are cached: library version and seed."""
+    try:
+        version = importlib.metadata.version("langdetect")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    return f"langdetect {version} seed {seed}"
+
+
+_default_cache: Optional[LanguageCache] = None
+
+
+def default_cache() -> Optional[LanguageCache]:
+    """Return the cache at `LANGDETECT_CACHE_PATH` (opened once), or None if disabled."""
+    global _default_cache
+    if _default_cache is None and LANGDETECT_CACHE_PATH:
+        _default_cache = LanguageCache(
+            LANGDETECT_CACHE_PATH, detector_version(), max_entries=LANGDETECT_CACHE_MAX_ENTRIES
+        )
+    return _default_cache
+
+
+def detect_language(text: str) -> Optional[str]:
+    """Return the language code of `text`, or None if it is empty or undetectable."""
+    if not text:
+        return None
+    try:
+        return detect(text)
+    except LangDetectException:
+        return None
+
+
+def _detect_batch(texts: List[str]) -> List[Optional[str]]:
+    return [detect_language(text) for text in texts]
+
+
+def detect_languages(
+    texts: Sequence,
+    workers: int = LANGDETECT_WORKERS,
+    batch_size: int = LANGDETECT_BATCH_SIZE,
+    precheck: bool = True,
+    seed: int = LANGDETECT_SEED,
+    cache: Optional[LanguageCache] = None,
+) -> Tuple[List[Optional[str]], DetectionReport]:
+    """
+    Detect the language of many descriptions.
+
+    Parameters
+    ----------
+    texts : sequence
+        Descriptions; missing values are allowed.
+    workers : int, optional
+        Detection processes. `1` detects in the calling process.
+    batch_size : int, optional
+        Descriptions per pool task.
+    precheck : bool, optional
+        Classify obvious English descriptions without running the detector.
+    seed : int, optional
+        `DetectorFactory.seed` of every detection.
+    cache : LanguageCache, optional
+        Memo cache consulted before, and updated after, running the detector. It
+        must have been opened for `detector_version(seed)`.
+
+    Returns
+    -------
+    tuple of (list, DetectionReport)
+        The language codes (None when empty or undetectable), in input order, and
+        a `DetectionReport` with the throughput.
+    """
+    if cache is not None and cache.detector != detector_version(seed):
+        raise ValueError(f"Cache of {cache.detector!r} cannot store results of {detector_version(seed)!r}.")
+
+    start = time.perf_counter()
+    texts = [normalize(text) for text in texts]
+    languages: List[Optional[str]] = [None] * len(texts)
+    report = DetectionReport(rows=len(texts))
+
+    # Rows left to the detector, grouped by distinct description.
+    pending: Dict[str, List[int]] = {}
+    for index, text in enumerate(texts):
+        if not text:
+            continue
+        if precheck and is_obvious_english(text):
+            languages[index] = "en"
+            report.prechecked += 1
+        else:
+            pending.setdefault(text, []).append(index)
+
+    keys = {text: LanguageCache.key(text) for text in pending} if cache is not None else {}
+    known = cache.get_many(keys.values()) if cache is not None else {}
+    distinct = [text for text in pending if keys.get(text) not in known]
+    report.cached = len(pending) - len(distinct)
+    report.detected = len(distinct)
+
+    batches = [distinct[i: i + batch_size] for i in range(0, len(distinct), max(1, batch_size))]
+    if workers <= 1 or len(batches) <= 1:
+        seed_detector(seed)
+        results = [_detect_batch(batch) for batch in batches]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=seed_detector, initargs=(seed,)
+        ) as executor:
+            results = list(executor.map(_detect_batch, batches))
+
+    detected = dict(zip(distinct, chain.from_iterable(results)))
+    if cache is not None:
+        cache.store_many({keys[text]: language for text, language in detected.items()})
+
+    for text, indexes in pending.items():
+        language = detected[text] if text in detected else known[keys[text]]
+        for index in indexes:
+            languages[index] = language
+
+    report.seconds = time.perf_counter() - start
+    logger.info("Language detection: %s", report)
+    return languages, report
@@ -0,0 +1,132 @@
+"""
+Persistent memo cache of language detection results (SQLite).
+
+Results are keyed by a hash of the normalized description, so a description is
+only detected once across terms, runs and updated datasets. Every entry records
+the detector that produced it (library version and seed); entries of another
+detector are ignored and overwritten. The least recently used entries are dropped
+whenever the cache grows beyond `max_entries`.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Keys per SQL statement, below SQLite's host parameter limit.
+_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS languages (
+    key         TEXT PRIMARY KEY,
+    language    TEXT,
+    detector    TEXT NOT NULL,
+    stored_at   REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS languages_accessed_at ON languages (accessed_at);
+"""
+
+
+def _chunks(items: list) -> Iterable[list]:
+    for start in range(0, len(items), _CHUNK):
+        yield items[start: start + _CHUNK]
+
+
+class LanguageCache:
+    """
+    Thread-safe SQLite store of `normalized text hash -> language`.
+    """
+
+    def __init__(self, path: str, detector: str, max_entries: int = 1_000_000) -> None:
+        """
+        Open (or create) the cache file.
+
+        Parameters
+        ----------
+        path : str
+            SQLite file path.
+        detector : str
+            Version of the detector (library version and seed); only entries
+            stored by the same detector are returned.
+        max_entries : int, optional
+            Upper bound of the number of stored results.
+        """
+        self.path = path
+        self.detector = detector
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def key(text: str) -> str:
+        """Cache key of an (already normalized) description."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Return the cached language of every known key (marking them as recently used).
+
+        Undetectable descriptions are cached too, with a None language.
+        """
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, Optional[str]] = {}
+        with self._lock:
+            for chunk in _chunks(keys):
+                rows = self._conn.execute(
+                    f"SELECT key, language FROM languages WHERE detector = ? "
+                    f"AND key IN ({','.join('?' * len(chunk))})",
+                    (self.detector, *chunk),
+                ).fetchall()
+                found.update(rows)
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE languages SET accessed_at = ? WHERE key = ?", [(now, key) for key in found]
+            )
+            self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def store_many(self, languages: Dict[str, Optional[str]]) -> None:
+        """Store `key -> language` results of the current detector."""
+        if not languages:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO languages (key, language, detector, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(key, language, self.detector, now, now) for key, language in languages.items()],
+            )
+            entries = self._conn.execute("SELECT COUNT(*) FROM languages").fetchone()[0]
+            if entries > self.max_entries:
+                self._evict_to_size(entries)
+            self._conn.commit()
+
+    def _evict_to_size(self, entries: int) -> None:
+        """Drop least recently used entries until the cache is back under 90% of `max_entries`."""
+        excess = entries - int(self.max_entries * 0.9)
+        self._conn.execute(
+            "DELETE FROM languages WHERE key IN "
+            "(SELECT key FROM languages ORDER BY accessed_at LIMIT ?)",
+            (excess,),
+        )
+        logger.info("Evicted %d cached languages to stay under %d entries.", excess, self.max_entries)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,564 @@
+"""
+Local stand-in for the GitHub REST API used by `api_search.py`.
+
+Serves the endpoints the miner depends on (repository search, commits,
+contributors and the GraphQL commit-count queries) from in-memory fixtures, with
+an optional artificial latency per request. Fixtures are either synthetic
+(`synthetic_repos`) or replayed from the CSVs of a previous mining run
+(`repos_from_csv`), in which case a search only returns the repositories found
+for that term. Search queries honor the `pushed:` and `stars:` qualifiers and,
+like GitHub, only the first 1000 results of a query can be paged through.
+Responses carry `Link` pagination headers and an `ETag`, and conditional
+requests with a matching `If-None-Match` are answered with `304 Not Modified`.
+With `rate_limits`, every response carries the `X-RateLimit-*` headers of its
+resource and requests beyond the quota get a `403` until the window resets. With
+`graphql_failures`, GraphQL queries fail the way GitHub reports it: `200` with
+`errors` and null `data` or aliases. It allows the mining pipeline to be
+exercised and benchmarked without a token or network access.
+
+Usage:
+  with MockGitHub(synthetic_repos(200), latency=0.05) as server:
+      api_search.API_URL = server.url
+      ...
+"""
+
+import csv
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import os
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from rate_limit import resource_for
+
+
+def synthetic_repos(count: int, seed: int = 0) -> List[Dict]:
+    """
+    Build `count` fake repositories shaped like GitHub Search API items.
+
+    The private `_commits`, `_commits_2024`, `_contributors` and `_anonymous` keys
+    drive the commits and contributors endpoints and are stripped from search
+    responses.
+
+    Parameters
+    ----------
+    count : int
+        Number of repositories to generate.
+    seed : int, optional
+        Seed for the random generator, so fixtures are reproducible.
+
+    Returns
+    -------
+    list of dict
+        Repository fixtures.
+    """
+    rng = random.Random(seed)
+    today = datetime.now().date()
+    repos: List[Dict] = []
+    for index in range(count):
+        owner = f"owner{index % 37}"
+        name = f"edge-repo-{index}"
+        total = rng.randint(1, 1500)
+        repos.append(
+            {
+                "id": 100000 + index,
+                "name": name,
+                "full_name": f"{owner}/{name}",
+                "owner": {"login": owner},
+                "html_url": f"https://github.com/{owner}/{name}",
+                "description": f"Synthetic edge ai repository {index}",
+                "pushed_at": f"{today - timedelta(days=rng.randint(0, 364))}T10:00:00Z",
+                "stargazers_count": rng.randint(11, 50000),
+                "fork": False,
+                "forks": rng.randint(0, 5000),
+                "language": "Python",
+                "size": rng.randint(10, 100000),
+                "score": 1.0,
+                "is_template": False,
+                "archived": False,
+                "disabled": False,
+                "contributors_url": f"https://api.github.com/repos/{owner}/{name}/contributors",
+                "collaborators_url": f"https://api.github.com/repos/{owner}/{name}/collaborators{{/collaborator}}",
+                "_commits": total,
+                "_commits_2024": rng.randint(0, total),
+                "_contributors": rng.randint(1, 300),
+                "_anonymous": rng.randint(0, 20),
+            }
+        )
+    return repos
+
+
+def repos_from_csv(path: str, rebase_dates: bool = True) -> List[Dict]:
+    """
+    Build fixtures from the CSVs of a mining run (e.g. `_raw_data-[experiment_used]`).
+
+    Rows of the same repository found by several terms become one fixture whose
+    private `_terms` set limits the searches returning it.
+
+    Parameters
+    ----------
+    path : str
+        A CSV produced by `HandleCsv`, or a folder of such CSVs.
+    rebase_dates : bool, optional
+        Shift every `pushed_at` so that the most recent one is today; otherwise
+        an old snapshot falls outside the "pushed in the last year" query.
+
+    Returns
+    -------
+    list of dict
+        Repository fixtures, in order of first appearance.
+    """
+    if os.path.isdir(path):
+        files = sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".csv"))
+    else:
+        files = [path]
+
+    repos: Dict[str, Dict] = {}
+    for file_path in files:
+        with open(file_path, mode="r", encoding="utf-8-sig", newline="") as file:
+            for row in csv.DictReader(file):
+                repo = repos.get(row["full_name"])
+                if repo is None:
+                    owner, name = row["full_name"].split("/", 1)
+                    repo = repos[row["full_name"]] = {
+                        # The CSVs carry no id: derive a stable one from the name.
+                        "id": int(hashlib.sha1(row["full_name"].encode("utf-8")).hexdigest()[:12], 16),
+                        "name": name,
+                        "full_name": row["full_name"],
+                        "owner": {"login": owner},
+                        "html_url": row["URL"],
+                        "description": row["desc."] or None,
+                        "pushed_at": row["last_commit"],
+                        "stargazers_count": int(row["stars"]),
+                        "fork": row["fork"] == "True",
+                        "forks": int(row["forks"]),
+                        "language": row["lang"] or None,
+                        "size": int(row["size"]),
+                        "score": float(row["score"]),
+                        "is_template": row["template"] == "True",
+                        "archived": row["archived"] == "True",
+                        "disabled": row["disabled"] == "True",
+                        "contributors_url": row["contributors_url"],
+                        "collaborators_url": row["collaborators_url"],
+                        "_commits": int(row["total_commits"]),
+                        "_commits_2024": int(row["commits_2024"]),
+                        "_contributors": int(row["collaborators"]),
+                        "_anonymous": 0,
+                        "_terms": set(),
+                    }
+                repo["_terms"].update(term.strip() for term in row["search_term"].split(","))
+
+    fixtures = list(repos.values())
+    if rebase_dates and fixtures:
+        latest = max(datetime.strptime(repo["pushed_at"], "%Y-%m-%dT%H:%M:%SZ") for repo in fixtures)
+        shift = datetime.now() - latest
+        for repo in fixtures:
+            pushed_at = datetime.strptime(repo["pushed_at"], "%Y-%m-%dT%H:%M:%SZ") + shift
+            repo["pushed_at"] = pushed_at.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return fixtures
+
+
+# Matches one aliased field of the queries built by `GraphQLEnricher`.
+_GRAPHQL_REPOSITORY = re.compile(
+    r'(\w+): repository\(owner: "((?:[^"\\]|\\.)*)", name: "((?:[^"\\]|\\.)*)"\)'
+)
+
+
+# `pushed:` and `stars:` qualifiers of a search query, e.g. `stars:>10`, `pushed:A..B`.
+_QUALIFIER = re.compile(r"\b(pushed|stars):(\S+)")
+
+# Search results beyond this rank cannot be paged through.
+SEARCH_RESULT_CAP = 1000
+
+
+def _in_range(value, expression: str, parse: Callable) -> bool:
+    if ".." in expression:
+        low, high = expression.split("..", 1)
+        return (low == "*" or value >= parse(low)) and (high == "*" or value <= parse(high))
+    for operator, check in (
+        (">=", lambda a, b: a >= b),
+        ("<=", lambda a, b: a <= b),
+        (">", lambda a, b: a > b),
+        ("<", lambda a, b: a < b),
+    ):
+        if expression.startswith(operator):
+            return check(value, parse(expression[len(operator):]))
+    return value == parse(expression)
+
+
+def _matches(repo: Dict, query: str) -> bool:
+    """Whether a fixture matches the term and the `pushed:`/`stars:` qualifiers of `query`."""
+    term = query.split(" in:", 1)[0].strip()
+    if "_terms" in repo and term not in repo["_terms"]:
+        return False
+    for qualifier, expression in _QUALIFIER.findall(query):
+        if qualifier == "pushed":
+            matched = _in_range(repo["pushed_at"][:10], expression, str)
+        else:
+            matched = _in_range(repo["stargazers_count"], expression, int)
+        if not matched:
+            return False
+    return True
+
+
+def _contributor(index: int, anonymous: bool = False) -> Dict:
+    """A contributor object with the fields (and roughly the size) GitHub returns."""
+    if anonymous:
+        return {"email": f"anon{index}@example.com", "name": f"anon{index}", "type": "Anonymous", "contributions": 1}
+
+    login = f"user{index}"
+    base = f"https://api.github.com/users/{login}"
+    return {
+        "login": login,
+        "id": 1000 + index,
+        "node_id": f"MDQ6VXNlcj{index:08d}",
+        "avatar_url": f"https://avatars.githubusercontent.com/u/{1000 + index}?v=4",
+        "gravatar_id": "",
+        "url": base,
+        "html_url": f"https://github.com/{login}",
+        "followers_url": f"{base}/followers",
+        "following_url": f"{base}/following{{/other_user}}",
+        "gists_url": f"{base}/gists{{/gist_id}}",
+        "starred_url": f"{base}/starred{{/owner}}{{/repo}}",
+        "subscriptions_url": f"{base}/subscriptions",
+        "organizations_url": f"{base}/orgs",
+        "repos_url": f"{base}/repos",
+        "events_url": f"{base}/events{{/privacy}}",
+        "received_events_url": f"{base}/received_events",
+        "type": "User",
+        "user_view_type": "public",
+        "site_admin": False,
+        "contributions": 1,
+    }
+
+
+def _public(repo: Dict) -> Dict:
+    return {key: value for key, value in repo.items() if not key.startswith("_")}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls on keep-alive.
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def log_message(self, format, *args) -> None:  # noqa: A002 - signature from base class
+        pass
+
+    def do_GET(self) -> None:  # noqa: N802 - name required by BaseHTTPRequestHandler
+        parsed = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        parts = [part for part in parsed.path.split("/") if part]
+        self.server.mock.count_request()
+
+        if self.server.mock.latency:
+            time.sleep(self.server.mock.latency)
+        if not self._take_quota(parsed.path):
+            return
+
+        if parts == ["search", "repositories"]:
+            repos = [repo for repo in self.server.mock.repos if _matches(repo, query.get("q", ""))]
+            if query.get("sort") == "stars":
+                repos.sort(key=lambda repo: repo["stargazers_count"], reverse=query.get("order") != "asc")
+            self._send_page(
+                parsed.path,
+                query,
+                min(len(repos), SEARCH_RESULT_CAP),
+                lambda i: _public(repos[i]),
+                envelope=True,
+                total_count=len(repos),
+            )
+            return
+
+        if len(parts) == 4 and parts[0] == "repos":
+            repo = self.server.mock.find(parts[1], parts[2])
+            if repo is None:
+                self._send_json(404, {"message": "Not Found"})
+            elif parts[3] == "commits" and not repo["_commits"]:
+                self._send_json(409, {"message": "Git Repository is empty."})
+            elif parts[3] == "commits":
+                bounded = "since" in query or "until" in query
+                count = repo["_commits_2024"] if bounded else repo["_commits"]
+                self._send_page(parsed.path, query, count, lambda i: {"sha": f"{i:040x}"})
+            elif parts[3] == "contributors":
+                anonymous = repo["_anonymous"] if query.get("anon") in ("1", "true") else 0
+                self._send_page(
+                    parsed.path,
+                    query,
+                    repo["_contributors"] + anonymous,
+                    lambda i: _contributor(i, anonymous=i >= repo["_contributors"]),
+                )
+            else:
+                self._send_json(404, {"message": "Not Found"})
+            return
+
+        self._send_json(404, {"message": "Not Found"})
+
+    def do_POST(self) -> None:  # noqa: N802 - name required by BaseHTTPRequestHandler
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        self.server.mock.count_request()
+
+        if self.server.mock.latency:
+            time.sleep(self.server.mock.latency)
+        if not self._take_quota(self.path):
+            return
+
+        if urlparse(self.path).path != "/graphql":
+            self._send_json(404, {"message": "Not Found"})
+            return
+
+        failures = self.server.mock.graphql_failures
+        queries = self.server.mock.count_graphql_query()
+        if failures and queries % failures == 0:
+            # Like GitHub, a rate-limited (or timed out) query is answered 200 without data.
+            self._send_json(
+                200,
+                {"data": None, "errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]},
+            )
+            return
+
+        data, errors = {}, []
+        for position, (alias, owner, name) in enumerate(
+            _GRAPHQL_REPOSITORY.findall(body.get("query", "")), start=1
+        ):
+            repo = self.server.mock.find(json.loads(f'"{owner}"'), json.loads(f'"{name}"'))
+            if repo is None:
+                data[alias] = None
+                errors.append({"type": "NOT_FOUND", "path": [alias], "message": "Not Found"})
+                continue
+            if failures and position % failures == 0:
+                data[alias] = None
+                errors.append({"type": "FORBIDDEN", "path": [alias], "message": "Resource not accessible"})
+                continue
+            if not repo["_commits"]:
+                data[alias] = {"defaultBranchRef": None}
+                continue
+            data[alias] = {
+                "defaultBranchRef": {
+                    "target": {
+                        "total": {"totalCount": repo["_commits"]},
+                        "window": {"totalCount": repo["_commits_2024"]},
+                    }
+                }
+            }
+
+        self._send_json(200, {"data": data, **({"errors": errors} if errors else {})})
+
+    def _take_quota(self, path: str) -> bool:
+        """Count the request against its resource; answer `403` and return False if exhausted."""
+        self._resource = resource_for(path)
+        allowed = self.server.mock.take_quota(self._resource)
+        if not allowed:
+            self._send_json(
+                403,
+                {"message": f"API rate limit exceeded for resource '{self._resource}'."},
+            )
+        return allowed
+
+    def _send_page(
+        self,
+        path: str,
+        query: Dict,
+        total: int,
+        make_item: Callable[[int], Dict],
+        envelope: bool = False,
+        total_count: Optional[int] = None,
+    ) -> None:
+        per_page = min(int(query.get("per_page", 30)), 100)
+        page = int(query.get("page", 1))
+        last_page = max(1, math.ceil(total / per_page))
+        start = (page - 1) * per_page
+        chunk = [make_item(i) for i in range(start, min(start + per_page, total))]
+
+        links = []
+        if page < last_page:
+            links.append(self._link(path, query, page + 1, "next"))
+            links.append(self._link(path, query, last_page, "last"))
+        headers = {"Link": ", ".join(links)} if links else {}
+
+        if envelope:
+            body = {"total_count": total if total_count is None else total_count, "items": chunk}
+        else:
+            body = chunk
+        self._send_json(200, body, headers)
+
+    def _link(self, path: str, query: Dict, page: int, rel: str) -> str:
+        params = urlencode({**query, "page": page})
+        return f'<{self.server.mock.url}{path}?{params}>; rel="{rel}"'
+
+    def _send_json(self, status: int, body, headers: Optional[Dict] = None) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            self.server.mock.count_not_modified()
+            # Like GitHub, a 304 does not count against the rate limit.
+            self.server.mock.refund_quota(self._resource)
+            status, payload = 304, b""
+        headers = {**self.server.mock.quota_headers(self._resource), **(headers or {})}
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("ETag", etag)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.mock.count_bytes(len(payload))
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    mock: "MockGitHub"
+
+
+class MockGitHub:
+    """
+    Threaded local HTTP server replaying GitHub API responses from fixtures.
+    """
+
+    def __init__(
+        self,
+        repos: List[Dict],
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        rate_limits: Optional[Dict[str, Tuple[int, float]]] = None,
+        graphql_failures: int = 0,
+    ) -> None:
+        """
+        Initialize the mock server (it is started by `start` or `with`).
+
+        Parameters
+        ----------
+        repos : list of dict
+            Repository fixtures (see `synthetic_repos` and `repos_from_csv`).
+        latency : float, optional
+            Seconds to sleep before answering each request.
+        host : str, optional
+            Interface to bind.
+        port : int, optional
+            Port to bind; `0` picks a free port.
+        rate_limits : dict, optional
+            `(limit, window in seconds)` per rate-limit resource ('search', 'core',
+            'graphql'), e.g. `rate_limit.DEFAULT_QUOTAS`. Unlimited (and without
+            `X-RateLimit-*` headers) if None.
+        graphql_failures : int, optional
+            Every Nth GraphQL query is answered `200` with `"data": null` and a
+            `RATE_LIMITED` error, and the Nth repository of the other queries with a
+            null alias and a `FORBIDDEN` error. `0` never fails.
+        """
+        self.repos = repos
+        self.latency = latency
+        self._by_name = {(repo["owner"]["login"], repo["name"]): repo for repo in repos}
+        self._server = _Server((host, port), _Handler)
+        self._server.mock = self
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.rate_limits = rate_limits or {}
+        self._quota = {
+            resource: [limit, time.time() + window]
+            for resource, (limit, window) in self.rate_limits.items()
+        }
+        self.graphql_failures = graphql_failures
+        self.graphql_queries = 0
+        self.requests = 0
+        self.not_modified = 0
+        self.rate_limited = 0
+        self.bytes_sent = 0
+
+    @property
+    def url(self) -> str:
+        """Base URL to be used in place of `https://api.github.com`."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def count_graphql_query(self) -> int:
+        """Count one GraphQL query and return how many were received so far."""
+        with self._lock:
+            self.graphql_queries += 1
+            return self.graphql_queries
+
+    def count_not_modified(self) -> None:
+        with self._lock:
+            self.not_modified += 1
+
+    def count_bytes(self, size: int) -> None:
+        with self._lock:
+            self.bytes_sent += size
+
+    def reset_counters(self) -> None:
+        """Reset the number of requests, GraphQL queries, `304`/`403` answers and body bytes served."""
+        with self._lock:
+            self.graphql_queries = 0
+            self.requests = 0
+            self.not_modified = 0
+            self.rate_limited = 0
+            self.bytes_sent = 0
+
+    def take_quota(self, resource: str) -> bool:
+        """Count one request of `resource`; False if its quota is exhausted."""
+        with self._lock:
+            quota = self._quota.get(resource)
+            if quota is None:
+                return True
+            limit, window = self.rate_limits[resource]
+            if time.time() >= quota[1]:
+                quota[:] = [limit, time.time() + window]
+            if quota[0] <= 0:
+                self.rate_limited += 1
+                return False
+            quota[0] -= 1
+            return True
+
+    def refund_quota(self, resource: str) -> None:
+        with self._lock:
+            quota = self._quota.get(resource)
+            if quota is not None:
+                quota[0] = min(quota[0] + 1, self.rate_limits[resource][0])
+
+    def quota_headers(self, resource: str) -> Dict[str, str]:
+        """`X-RateLimit-*` headers of `resource` (none when it is unlimited)."""
+        with self._lock:
+            quota = self._quota.get(resource)
+            if quota is None:
+                return {}
+            limit = self.rate_limits[resource][0]
+            return {
+                "X-RateLimit-Limit": str(limit),
+                "X-RateLimit-Remaining": str(quota[0]),
+                "X-RateLimit-Reset": str(int(quota[1])),
+                "X-RateLimit-Used": str(limit - quota[0]),
+                "X-RateLimit-Resource": resource,
+            }
+
+    def find(self, owner: str, name: str) -> Optional[Dict]:
+        """Return the fixture for `owner/name`, or None if unknown."""
+        return self._by_name.get((owner, name))
+
+    def start(self) -> "MockGitHub":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockGitHub":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
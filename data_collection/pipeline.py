@@ -0,0 +1,231 @@
+"""
+Non-interactive runner of the data_treatment stages.
+
+A pipeline lists its inputs (tables or folders of tables) and its stages; the rows
+are passed from stage to stage in memory and only the stages marked `write` save
+an artifact, named like the outputs of the interactive menu. Stages:
+
+- `concat`: read and concatenate the inputs (always the first step);
+- `dedup`: drop duplicated repositories (option `subset`);
+- `merge`: merge the rows of each repository instead, keeping the freshest metrics
+  and all the search terms (option `key`, see `dedup.merge_duplicate_repos`);
+- `changed`: keep the repositories added or changed since a previous run (options
+  `since`: its tables or folders, `key`, and `log`: a table of the changes, see
+  `snapshot_diff`), so the next stages only process what is new;
+- `english`: keep English descriptions (options `workers`, `batch_size`, `precheck`, `cache`);
+- `exclusion`: drop repositories matching exclusion terms (options `terms`,
+  `word_boundaries`, and `audit`: a table listing the term excluding each repository);
+- `rules`: keep the repositories satisfying a rules file (options `path`, default
+  `screening_rules.json`, `reference_date`, and `trace`: a table of the decision and
+  the rules involved for each repository, see `rules`).
+
+From the command line:
+
+  python pipeline.py dataset/raw_data --stages concat dedup english exclusion --write all
+
+or from a JSON file (`python pipeline.py --config pipeline.json`):
+
+  {
+    "inputs": ["dataset/raw_data"],
+    "output_dir": "dataset/processed_data",
+    "label": "raw_data",
+    "stages": ["concat", "dedup", "english", {"name": "exclusion", "write": true}]
+  }
+
+Without `stages`, the stages run are concat, dedup, english and exclusion. Without
+any `write`, only the last stage is saved. `data_treatment.main_menu`
+remains the interactive front end of the same stage functions.
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+import data_treatment
+import dedup
+import rules
+import snapshot_diff
+import storage
+from utils import format_datetime
+
+logger = logging.getLogger(__name__)
+
+StageFunction = Callable[..., pd.DataFrame]
+
+# Stage name -> (function of the rows, artifact name template). `concat` reads the
+# pipeline inputs instead of transforming rows.
+STAGES: Dict[str, Tuple[Optional[StageFunction], str]] = {
+    "concat": (None, "[CONCATENATED]-{label}-{timestamp}"),
+    "dedup": (data_treatment.drop_duplicate_repos, "[NO-DUPLICATED]_repo-files_{timestamp}"),
+    "merge": (dedup.merge_duplicate_repos, "[MERGED]_repo-files_{timestamp}"),
+    "changed": (snapshot_diff.keep_changed_repos, "[CHANGED]_{label}_{timestamp}"),
+    "english": (data_treatment.keep_english_descriptions, "[ENGLISH-DESC]_repo-files_{timestamp}"),
+    "exclusion": (data_treatment.exclude_repos_by_terms, "[EXCLUSION-TERM]_{label}_{timestamp}"),
+    "rules": (rules.screen_repos, "[SCREENED]_{label}_{timestamp}"),
+}
+DEFAULT_STAGES = ["concat", "dedup", "english", "exclusion"]
+
+# Options each stage accepts, mapped to the keyword argument of its function.
+STAGE_OPTIONS = {
+    "dedup": {"subset": "subset"},
+    "merge": {"key": "key"},
+    "changed": {"since": "since", "key": "key", "log": "changes_path"},
+    "english": {"workers": "workers", "batch_size": "batch_size", "precheck": "precheck", "cache": "cache"},
+    "exclusion": {"terms": "exclusion_terms", "word_boundaries": "word_boundaries", "audit": "audit_path"},
+    "rules": {"path": "rules_path", "reference_date": "reference_date", "trace": "trace_path"},
+}
+
+
+@dataclass
+class Stage:
+    name: str
+    options: Dict = field(default_factory=dict)
+    write: bool = False
+
+    @classmethod
+    def parse(cls, spec) -> "Stage":
+        """Build a stage from a name or a `{"name": ..., "write": ..., **options}` mapping."""
+        if isinstance(spec, str):
+            spec = {"name": spec}
+        spec = dict(spec)
+        name = spec.pop("name", None)
+        write = bool(spec.pop("write", False))
+        if name not in STAGES:
+            raise ValueError(f"Unknown stage {name!r}, expected one of {sorted(STAGES)}.")
+        unknown = set(spec) - set(STAGE_OPTIONS.get(name, {}))
+        if unknown:
+            raise ValueError(f"Unknown option(s) {sorted(unknown)} for stage {name!r}.")
+        return cls(name, spec, write)
+
+
+@dataclass
+class PipelineResult:
+    rows: pd.DataFrame
+    artifacts: Dict[str, str] = field(default_factory=dict)
+    # (stage, rows in, rows out, seconds) in execution order.
+    timings: List[Tuple[str, int, int, float]] = field(default_factory=list)
+
+
+def run_pipeline(
+    inputs: List[str],
+    stages: List[Stage],
+    output_dir: Optional[str] = None,
+    label: Optional[str] = None,
+    fmt: Optional[str] = None,
+) -> PipelineResult:
+    """
+    Run `stages` over the concatenated `inputs`.
+
+    Parameters
+    ----------
+    inputs : list of str
+        Tables, or folders whose tables are all read (any `storage` format).
+    stages : list of Stage
+        Stages in execution order; `concat` may only come first and is implied
+        when missing. If no stage is marked `write`, the last one is.
+    output_dir : str, optional
+        Folder of the artifacts. Default: `dataset/processed_data`.
+    label : str, optional
+        Used in the artifact names. Default: the name of the first input.
+    fmt : str, optional
+        Storage format of the artifacts. Default: `STORAGE_FORMAT`.
+
+    Returns
+    -------
+    PipelineResult
+        Rows after the last stage, written artifacts by stage and stage timings.
+    """
+    if not inputs:
+        raise ValueError("The pipeline needs at least one input.")
+    if any(stage.name == "concat" for stage in stages[1:]):
+        raise ValueError("The 'concat' stage can only be the first stage.")
+    # Copies: the caller's stages are left as they are, so a list can be run again.
+    stages = [replace(stage) for stage in stages]
+    if not stages or stages[0].name != "concat":
+        stages.insert(0, Stage("concat"))
+    if not any(stage.write for stage in stages):
+        stages[-1].write = True
+
+    output_dir = output_dir or os.path.join(data_treatment.ROOT, "dataset/processed_data")
+    label = label or os.path.splitext(os.path.basename(os.path.normpath(inputs[0])))[0]
+    timestamp = format_datetime()
+
+    result = PipelineResult(pd.DataFrame())
+    df = result.rows
+    for stage in stages:
+        function, template = STAGES[stage.name]
+        kwargs = {STAGE_OPTIONS[stage.name][key]: value for key, value in stage.options.items()}
+
+        rows_in = len(df)
+        start = time.perf_counter()
+        df = data_treatment.concat_tables(inputs) if function is None else function(df, **kwargs)
+        elapsed = time.perf_counter() - start
+        result.timings.append((stage.name, rows_in, len(df), elapsed))
+        logger.info("[Pipeline] %-9s %7d -> %7d rows in %.2f s", stage.name, rows_in, len(df), elapsed)
+
+        if stage.write:
+            name = template.format(label=label, timestamp=timestamp) + storage.extension(fmt)
+            result.artifacts[stage.name] = storage.write_table(df, os.path.join(output_dir, name))
+            logger.info("[Pipeline] %s saved to %s", stage.name, result.artifacts[stage.name])
+
+    result.rows = df
+    return result
+
+
+def load_config(path: str) -> Dict:
+    """Read a JSON pipeline definition (see the module docstring)."""
+    with open(path, mode="r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the data treatment stages without the interactive menu.")
+    parser.add_argument("inputs", nargs="*", help="Tables or folders of tables to process.")
+    parser.add_argument("--config", help="JSON pipeline definition; command-line values override it.")
+    parser.add_argument("--stages", nargs="+", choices=sorted(STAGES), help="Stages to run, in order.")
+    parser.add_argument(
+        "--write",
+        nargs="+",
+        metavar="STAGE",
+        help="Stages whose output is saved ('all' for every stage; default: the last stage).",
+    )
+    parser.add_argument("--output-dir", help="Folder of the artifacts (default: dataset/processed_data).")
+    parser.add_argument("--label", help="Label used in the artifact names (default: name of the first input).")
+    parser.add_argument("--format", choices=sorted(storage.FORMATS), help="Artifact format (default: STORAGE_FORMAT).")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    config = load_config(args.config) if args.config else {}
+    inputs = args.inputs or config.get("inputs", [])
+    stages = [Stage.parse(spec) for spec in (args.stages or config.get("stages", DEFAULT_STAGES))]
+    if args.write:
+        # `concat` always runs, even when it is implied.
+        names = {"all", "concat"} | {stage.name for stage in stages}
+        absent = [name for name in args.write if name not in names]
+        if absent:
+            parser.error(f"--write: {', '.join(absent)} not among the stages to run ({', '.join(sorted(names))}).")
+        if "concat" in args.write and (not stages or stages[0].name != "concat"):
+            stages.insert(0, Stage("concat"))
+        for stage in stages:
+            stage.write = "all" in args.write or stage.name in args.write
+
+    result = run_pipeline(
+        inputs,
+        stages,
+        output_dir=args.output_dir or config.get("output_dir"),
+        label=args.label or config.get("label"),
+        fmt=args.format or config.get("format"),
+    )
+    for stage, path in result.artifacts.items():
+        print(f"{stage:<10s} {path}")
+
+
+if __name__ == "__main__":
+    main()
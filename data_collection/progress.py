@@ -0,0 +1,180 @@
+"""
+Live progress of a mining run, per search term.
+
+Each term reports the search pages it fetched, the repositories found and the
+repositories enriched so far. Once the number of repositories to expect is known
+(the `total_count` of the search, capped by the result limit), an ETA is derived
+from the enrichment rate of the term. A background thread logs the table at a
+fixed interval while terms run concurrently.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TermProgress:
+    pages: int = 0
+    found: int = 0
+    enriched: int = 0
+    expected: Optional[int] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def eta(self, now: float) -> Optional[float]:
+        """Seconds left at the current enrichment rate, or None if unknown."""
+        if self.finished_at is not None:
+            return 0.0
+        if self.started_at is None or not self.enriched or self.expected is None:
+            return None
+        rate = self.enriched / (now - self.started_at)
+        return max(0, self.expected - self.enriched) / rate
+
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "--:--"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+
+class ProgressTracker:
+    """
+    Thread-safe per-term counters with periodic logging.
+    """
+
+    def __init__(self, terms: Optional[List[str]] = None, interval: float = 30.0) -> None:
+        """
+        Initialize the tracker.
+
+        Parameters
+        ----------
+        terms : list of str, optional
+            Terms of the run, listed (as pending) before they start. Other terms
+            are added when they first report progress.
+        interval : float, optional
+            Seconds between two progress logs of the background thread.
+        """
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._terms: Dict[str, TermProgress] = {term: TermProgress() for term in terms or []}
+        self._started_at = time.time()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _term(self, term: str) -> TermProgress:
+        progress = self._terms.setdefault(term, TermProgress())
+        if progress.started_at is None:
+            progress.started_at = time.time()
+        return progress
+
+    def start_term(self, term: str) -> None:
+        with self._lock:
+            self._term(term)
+
+    def add_page(self, term: str, repos: int, total_count: Optional[int] = None) -> None:
+        """Count a search page of `repos` new repositories (and its `total_count`, if known)."""
+        with self._lock:
+            progress = self._term(term)
+            progress.pages += 1
+            progress.found += repos
+            if total_count is not None and progress.expected is None:
+                progress.expected = total_count
+
+    def set_expected(self, term: str, repos: int) -> None:
+        """Set the number of repositories the term is expected to enrich."""
+        with self._lock:
+            self._term(term).expected = repos
+
+    def add_enriched(self, term: str, repos: int = 1) -> None:
+        with self._lock:
+            self._term(term).enriched += repos
+
+    def finish_term(self, term: str) -> None:
+        with self._lock:
+            progress = self._term(term)
+            progress.finished_at = time.time()
+            progress.expected = progress.enriched
+
+    def report(self) -> str:
+        """Return one line per term plus an overall line with the run ETA."""
+        now = time.time()
+        with self._lock:
+            terms = dict(self._terms)
+
+        lines = []
+        for term, progress in terms.items():
+            if progress.started_at is None:
+                state = "pending"
+            elif progress.finished_at is not None:
+                state = "done"
+            else:
+                state = f"ETA {_format_seconds(progress.eta(now))}"
+            expected = "?" if progress.expected is None else str(progress.expected)
+            lines.append(
+                f"  {term:<24s} {progress.pages:5d} pages | {progress.found:6d} found "
+                f"| {progress.enriched:6d}/{expected:<6s} enriched | {state}"
+            )
+
+        finished = sum(progress.finished_at is not None for progress in terms.values())
+        lines.insert(
+            0,
+            f"{finished}/{len(terms)} terms done | elapsed {_format_seconds(now - self._started_at)} "
+            f"| ETA {_format_seconds(self.eta(now, terms))}",
+        )
+        return "\n".join(lines)
+
+    def eta(self, now: Optional[float] = None, terms: Optional[Dict[str, TermProgress]] = None) -> Optional[float]:
+        """
+        Estimate the seconds left for the whole run.
+
+        The overall enrichment rate so far is applied to the repositories still
+        expected; terms whose size is not known yet are assumed to be as large as
+        the average known term.
+        """
+        now = now or time.time()
+        if terms is None:
+            with self._lock:
+                terms = dict(self._terms)
+
+        known = [progress.expected for progress in terms.values() if progress.expected is not None]
+        enriched = sum(progress.enriched for progress in terms.values())
+        if not known or not enriched:
+            return None
+
+        average = sum(known) / len(known)
+        expected = sum(
+            average if progress.expected is None else max(progress.expected, progress.enriched)
+            for progress in terms.values()
+        )
+        rate = enriched / (now - self._started_at)
+        return max(0.0, expected - enriched) / rate
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            logger.info("Mining progress:\n%s", self.report())
+
+    def start(self) -> "ProgressTracker":
+        """Start logging the progress every `interval` seconds."""
+        self._thread = threading.Thread(target=self._run, name="progress", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the periodic logging and log the final state."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        logger.info("Mining progress:\n%s", self.report())
+
+    def __enter__(self) -> "ProgressTracker":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,194 @@
+"""
+Rate-limit-aware request scheduling for the GitHub API.
+
+GitHub accounts each request against a resource quota ('search': 30 requests per
+minute, 'core': 5000 per hour for authenticated tokens, 'graphql': 5000 points per
+hour) and reports the current state in the `X-RateLimit-Remaining` /
+`X-RateLimit-Reset` headers. The scheduler keeps one token bucket per resource,
+refreshed from those headers, so requests are sent back-to-back while quota is
+left and only wait when a bucket is empty. Rate-limited (403/429) and server-error
+(5xx) responses are retried with jittered exponential backoff.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Documented defaults for an authenticated token: (requests, window in seconds).
+DEFAULT_QUOTAS = {
+    "search": (30, 60),
+    "core": (5000, 3600),
+    "graphql": (5000, 3600),
+}
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def resource_for(url: str) -> str:
+    """Return the GitHub rate-limit resource that `url` is accounted against."""
+    path = urlparse(url).path
+    if path.startswith("/search/"):
+        return "search"
+    if path.rstrip("/").endswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+def _header_int(response: requests.Response, name: str) -> Optional[int]:
+    value = response.headers.get(name)
+    try:
+        return int(float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """
+    Quota of a single rate-limit resource.
+
+    Tokens are handed out until the bucket is empty; then callers block until the
+    reset time announced by GitHub (or the end of a `Retry-After` pause).
+    """
+
+    def __init__(self, name: str, limit: int, window: float) -> None:
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset_at = time.time() + window
+        self.paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """Take one token, blocking while the quota is exhausted or paused."""
+        with self._cond:
+            while True:
+                now = time.time()
+                if now >= self.reset_at and self.remaining <= 0:
+                    # The window elapsed without fresh headers: assume a full quota.
+                    self.remaining = self.limit
+                    self.reset_at = now + self.window
+
+                wait = self.paused_until - now
+                if wait <= 0 and self.remaining <= 0:
+                    wait = self.reset_at - now
+
+                if wait <= 0:
+                    self.remaining -= 1
+                    return
+
+                logger.info("Rate limit '%s' exhausted, waiting %.1f s.", self.name, wait)
+                self._cond.wait(timeout=wait)
+
+    def update(self, remaining: Optional[int], reset_at: Optional[float], limit: Optional[int]) -> None:
+        """
+        Synchronize the bucket with the rate-limit headers of a response.
+
+        A (future) reset time different from the tracked one starts a new window
+        and replaces the local estimate. Responses of concurrent requests can arrive
+        out of order, so within the same window the smallest `remaining` wins.
+        """
+        with self._cond:
+            if limit:
+                self.limit = limit
+            if (
+                reset_at is not None
+                and reset_at > time.time()
+                and abs(reset_at - self.reset_at) > 1
+            ):
+                self.reset_at = reset_at
+                if remaining is not None:
+                    self.remaining = remaining
+            elif remaining is not None:
+                self.remaining = min(self.remaining, remaining)
+            self._cond.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """Block every request of this resource for `seconds` (e.g. `Retry-After`)."""
+        with self._cond:
+            self.paused_until = max(self.paused_until, time.time() + seconds)
+
+
+class RateLimitScheduler:
+    """
+    Per-resource token buckets plus the retry policy shared by all API calls.
+    """
+
+    def __init__(
+        self,
+        quotas: Optional[Dict[str, tuple]] = None,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        Parameters
+        ----------
+        quotas : dict, optional
+            Initial `(limit, window)` per resource, used until the first response
+            headers arrive. Default is `DEFAULT_QUOTAS`.
+        backoff_base : float, optional
+            Base delay in seconds of the exponential backoff.
+        backoff_max : float, optional
+            Upper bound in seconds of a single backoff delay.
+        """
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.buckets = {
+            name: TokenBucket(name, limit, window)
+            for name, (limit, window) in (quotas or DEFAULT_QUOTAS).items()
+        }
+        self._lock = threading.Lock()
+
+    def bucket(self, resource: str) -> TokenBucket:
+        with self._lock:
+            if resource not in self.buckets:
+                limit, window = DEFAULT_QUOTAS["core"]
+                self.buckets[resource] = TokenBucket(resource, limit, window)
+            return self.buckets[resource]
+
+    def acquire(self, url: str) -> None:
+        """Wait for a token of the resource `url` is accounted against."""
+        self.bucket(resource_for(url)).acquire()
+
+    def update(self, url: str, response: requests.Response) -> None:
+        """Refresh the matching bucket from the rate-limit headers of `response`."""
+        resource = response.headers.get("X-RateLimit-Resource") or resource_for(url)
+        bucket = self.bucket(resource)
+        bucket.update(
+            _header_int(response, "X-RateLimit-Remaining"),
+            _header_int(response, "X-RateLimit-Reset"),
+            _header_int(response, "X-RateLimit-Limit"),
+        )
+
+        retry_after = _header_int(response, "Retry-After")
+        if retry_after is not None and response.status_code in (403, 429):
+            bucket.pause(retry_after)
+
+    @staticmethod
+    def is_rate_limited(response: requests.Response) -> bool:
+        """Whether a 403/429 response was caused by a (primary or secondary) rate limit."""
+        if response.status_code == 429:
+            return True
+        if response.status_code != 403:
+            return False
+        return (
+            response.headers.get("X-RateLimit-Remaining") == "0"
+            or "Retry-After" in response.headers
+            or "rate limit" in response.text.lower()
+        )
+
+    def should_retry(self, response: requests.Response) -> bool:
+        return response.status_code in RETRY_STATUS or self.is_rate_limited(response)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for the given (0-based) attempt."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
@@ -0,0 +1,220 @@
+"""
+Persistent on-disk cache of GitHub API responses (SQLite).
+
+Responses are keyed by URL and query parameters. A cached entry younger than the
+TTL is served without any request; an older one is revalidated with
+`If-None-Match` / `If-Modified-Since`, and a `304 Not Modified` answer (which
+GitHub does not count against the rate limit) reuses the stored body. Entries not
+used for `max_age` seconds are evicted, and the least recently used ones are
+dropped whenever the cache grows beyond `max_bytes`.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+# Describe the transfer of the original body, not the decoded one that is stored.
+_TRANSFER_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key           TEXT PRIMARY KEY,
+    url           TEXT NOT NULL,
+    headers       TEXT NOT NULL,
+    body          BLOB NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    size          INTEGER NOT NULL,
+    stored_at     REAL NOT NULL,
+    accessed_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+@dataclass
+class CachedResponse:
+    key: str
+    url: str
+    headers: Dict[str, str]
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers turning the next request for this entry into a conditional one."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self) -> requests.Response:
+        """Rebuild a `200 OK` `requests.Response` from the stored entry."""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        response.encoding = "utf-8"
+        return response
+
+
+class ResponseCache:
+    """
+    Thread-safe SQLite store of successful GET responses.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 86400,
+        max_age: float = 30 * 86400,
+        max_bytes: int = 512 * 1024 * 1024,
+    ) -> None:
+        """
+        Open (or create) the cache file.
+
+        Parameters
+        ----------
+        path : str
+            SQLite file path.
+        ttl : float, optional
+            Seconds during which an entry is served without revalidation.
+        max_age : float, optional
+            Entries not used for this many seconds are evicted.
+        max_bytes : int, optional
+            Upper bound of the total size of the stored bodies.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+        with self._lock:
+            self._evict_expired()
+            self._total_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict] = None) -> str:
+        """Stable cache key for a URL and its (unordered) query parameters."""
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.sha256(f"{url}?{query}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the entry stored under `key` (marking it as recently used), if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, headers, body, etag, last_modified, stored_at "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+
+        url, headers, body, etag, last_modified, stored_at = row
+        return CachedResponse(key, url, json.loads(headers), body, etag, last_modified, stored_at)
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.stored_at < self.ttl
+
+    def store(self, key: str, response: requests.Response) -> None:
+        """Store a successful response under `key`."""
+        body = response.content
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, headers, body, etag, last_modified, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.url,
+                    json.dumps(
+                        {
+                            name: value
+                            for name, value in response.headers.items()
+                            if name.lower() not in _TRANSFER_HEADERS
+                        }
+                    ),
+                    body,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    len(body),
+                    now,
+                    now,
+                ),
+            )
+            self._total_bytes += len(body) - (previous[0] if previous else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict_to_size()
+            self._conn.commit()
+
+    def refresh(self, key: str) -> None:
+        """Restart the TTL of an entry after a `304 Not Modified` revalidation."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key),
+            )
+            self._conn.commit()
+
+    def _evict_expired(self) -> None:
+        deleted = self._conn.execute(
+            "DELETE FROM responses WHERE accessed_at < ?", (time.time() - self.max_age,)
+        ).rowcount
+        self._conn.commit()
+        if deleted:
+            logger.info("Evicted %d expired cached responses.", deleted)
+
+    def _evict_to_size(self) -> None:
+        """Drop least recently used entries until the cache is back under 90% of `max_bytes`."""
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        logger.info("Evicted %d cached responses to stay under %d bytes.", len(evicted), self.max_bytes)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,232 @@
+"""
+Inclusion/exclusion rules of the study, loaded from a JSON file.
+
+A rules file lists the screening criteria instead of keeping them as constants in
+the code (see `screening_rules.json`):
+
+  {
+    "reference_date": null,
+    "list_columns": {"search_term": ","},
+    "rules": [
+      {"name": "min_stars", "action": "include", "column": "stars", "op": ">", "value": 10},
+      {"name": "pushed_last_year", "action": "include", "column": "last_commit", "op": ">",
+       "value": {"days_before_reference": 365}},
+      {"name": "exclusion_terms", "action": "exclude", "columns": ["name", "desc.", "search_term"],
+       "op": "contains_any", "value": ["tutorial", "toy"], "word_boundaries": false}
+    ]
+  }
+
+Every rule is compiled into a vectorized boolean mask over the whole table. A
+repository is kept when all `include` rules hold and no `exclude` rule does;
+missing values never satisfy a condition. Operators: `>`, `>=`, `<`, `<=`, `==`,
+`!=`, `in`, `not_in`, `is_null`, `not_null` and `contains_any` (any of the terms
+occurs in the lower-cased text of `columns`, see `exclusion`). Relative dates
+(`{"days_before_reference": N}`) are resolved against `reference_date`, the day of
+the run when null, which the decision trace records so that a screening can be
+reproduced.
+"""
+
+import json
+import logging
+import operator
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+import storage
+from exclusion import ExclusionMatcher, lowercase_text
+
+logger = logging.getLogger(__name__)
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "screening_rules.json")
+
+# Rule of `RULES_PATH` whose terms the `exclusion` stage and the interactive menu use.
+EXCLUSION_RULE = "exclusion_terms"
+
+ACTIONS = ("include", "exclude")
+
+_COMPARISONS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+OPERATORS = (*_COMPARISONS, "in", "not_in", "is_null", "not_null", "contains_any")
+
+
+@dataclass
+class Rule:
+    name: str
+    action: str
+    op: str
+    columns: List[str]
+    value: Any = None
+    word_boundaries: bool = False
+
+    @classmethod
+    def parse(cls, spec: Dict) -> "Rule":
+        """Build a rule from its JSON object, validating the action and operator."""
+        spec = dict(spec)
+        name = spec.pop("name", None)
+        if not name:
+            raise ValueError(f"Rule without a name: {spec}")
+        action = spec.pop("action", None)
+        if action not in ACTIONS:
+            raise ValueError(f"Rule {name!r}: action must be one of {ACTIONS}, got {action!r}.")
+        op = spec.pop("op", None)
+        if op not in OPERATORS:
+            raise ValueError(f"Rule {name!r}: op must be one of {OPERATORS}, got {op!r}.")
+        columns = spec.pop("columns", None) or [spec.pop("column", None)]
+        if None in columns:
+            raise ValueError(f"Rule {name!r} needs a 'column' or 'columns'.")
+        rule = cls(name, action, op, list(columns), spec.pop("value", None), bool(spec.pop("word_boundaries", False)))
+        spec.pop("description", None)
+        if spec:
+            raise ValueError(f"Rule {name!r}: unknown field(s) {sorted(spec)}.")
+        return rule
+
+
+@dataclass
+class RuleSet:
+    rules: List[Rule]
+    reference_date: Optional[str] = None
+    # Columns holding separated lists (e.g. search terms), matched as space-separated words.
+    list_columns: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_file(cls, path: str = RULES_PATH) -> "RuleSet":
+        """Load a rules file (see the module docstring)."""
+        with open(path, mode="r", encoding="utf-8") as file:
+            config = json.load(file)
+        rules = [Rule.parse(spec) for spec in config.get("rules", [])]
+        names = [rule.name for rule in rules]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicated rule names in {path}.")
+        return cls(rules, config.get("reference_date"), config.get("list_columns", {}))
+
+    def rule(self, name: str) -> Rule:
+        """Return the rule called `name`."""
+        for rule in self.rules:
+            if rule.name == name:
+                return rule
+        raise KeyError(f"No rule named {name!r}.")
+
+    def reference(self) -> pd.Timestamp:
+        """The date relative values are resolved against (UTC midnight)."""
+        day = self.reference_date or datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        return pd.Timestamp(day, tz="UTC")
+
+    def _value(self, rule: Rule, series: pd.Series) -> Any:
+        value = rule.value
+        if isinstance(value, dict) and "days_before_reference" in value:
+            return self.reference() - pd.Timedelta(days=value["days_before_reference"])
+        if isinstance(series.dtype, pd.DatetimeTZDtype) and isinstance(value, str):
+            return pd.Timestamp(value, tz="UTC") if pd.Timestamp(value).tz is None else pd.Timestamp(value)
+        return value
+
+    def mask(self, rule: Rule, df: pd.DataFrame) -> pd.Series:
+        """Return where the condition of `rule` holds (False for missing values)."""
+        missing = [column for column in rule.columns if column not in df.columns]
+        if missing:
+            raise ValueError(f"Rule {rule.name!r}: column(s) {missing} not in the table.")
+
+        if rule.op == "contains_any":
+            matcher = ExclusionMatcher(rule.value or [], word_boundaries=rule.word_boundaries)
+            if not matcher.terms:
+                return pd.Series(False, index=df.index)
+            result = lowercase_text(df, rule.columns, self.list_columns).str.contains(matcher.pattern, regex=True)
+        else:
+            series = df[rule.columns[0]]
+            if rule.op == "is_null":
+                result = series.isna()
+            elif rule.op == "not_null":
+                result = series.notna()
+            elif rule.op in ("in", "not_in"):
+                result = series.isin(rule.value)
+                result = result if rule.op == "in" else ~result & series.notna()
+            else:
+                result = _COMPARISONS[rule.op](series, self._value(rule, series))
+        return pd.Series(result, index=df.index).astype("boolean").fillna(False).astype(bool)
+
+    def evaluate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Evaluate every rule over the whole table.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The decision trace, aligned with `df`: `full_name` (if present), one
+            boolean column per rule (whether its condition holds), `decision`
+            ('include'/'exclude'), `reasons` (names of the failed include rules and
+            matched exclude rules, ';'-separated) and `reference_date`.
+        """
+        masks = pd.DataFrame({rule.name: self.mask(rule, df) for rule in self.rules}, index=df.index)
+        # True where the rule rejects the repository.
+        rejected = pd.DataFrame(
+            {rule.name: ~masks[rule.name] if rule.action == "include" else masks[rule.name] for rule in self.rules},
+            index=df.index,
+        )
+        trace = df[["full_name"]].copy() if "full_name" in df.columns else pd.DataFrame(index=df.index)
+        trace = trace.join(masks)
+        keep = ~rejected.any(axis=1) if self.rules else pd.Series(True, index=df.index)
+        trace["decision"] = keep.map({True: "include", False: "exclude"})
+        labels = pd.Series([f"{rule.name};" for rule in self.rules], index=rejected.columns, dtype=object)
+        trace["reasons"] = rejected.astype(object).dot(labels).str.rstrip(";") if self.rules else ""
+        trace["reference_date"] = self.reference().strftime("%Y-%m-%d")
+        return trace
+
+    def apply(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Return the repositories kept by the rules, and the decision trace of all of them."""
+        trace = self.evaluate(df)
+        kept = df[trace["decision"] == "include"]
+        logger.info(
+            "[Rules] Kept %d of %d repositories (reference date %s); rejections per rule: %s",
+            len(kept),
+            len(df),
+            self.reference().strftime("%Y-%m-%d"),
+            {
+                rule.name: int((~trace[rule.name] if rule.action == "include" else trace[rule.name]).sum())
+                for rule in self.rules
+            },
+        )
+        return kept, trace
+
+
+def screen_repos(
+    df: pd.DataFrame,
+    rules_path: str = RULES_PATH,
+    reference_date: Optional[str] = None,
+    trace_path: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Keep the repositories satisfying a rules file, optionally saving the decision trace.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Repositories table.
+    rules_path : str, optional
+        Rules file. Default: `screening_rules.json` next to this module.
+    reference_date : str, optional
+        Overrides the `reference_date` of the file (YYYY-MM-DD).
+    trace_path : str, optional
+        Table the decision trace is written to (any `storage` format).
+
+    Returns
+    -------
+    pandas.DataFrame
+        The kept rows, columns unchanged.
+    """
+    rule_set = RuleSet.from_file(rules_path)
+    if reference_date:
+        rule_set.reference_date = reference_date
+    kept, trace = rule_set.apply(df)
+    if trace_path:
+        storage.write_table(trace, trace_path)
+        logger.info("[Rules] Decision trace saved to '%s'", trace_path)
+    return kept
@@ -0,0 +1,242 @@
+"""
+Differences between two mining runs (snapshots).
+
+A snapshot is the set of tables of one run, e.g. the folder
+`dataset/_raw_data-[experiment_used]` (one `RAW_<term>_repos_<date>` table per search
+term); its rows are merged by repository first (see `dedup.merge_duplicate_repos`).
+The two snapshots are then joined on the repository key through hash indexes, and
+the compared columns of each repository present in both are reduced to one 64-bit
+hash, so unchanged repositories are recognized without comparing them column by
+column. The result is a compact change log, one row per added, removed or changed
+repository:
+
+  key, full_name, change, changed_columns,
+  stars_old, stars_new, stars_delta, commits_2024_old, ..., collaborators_delta
+
+`keep_changed_repos` (the `changed` pipeline stage) keeps only the added and changed
+repositories of a run, so the following stages only process what is new:
+
+  python snapshot_diff.py "dataset/_raw_data-[experiment_used]" dataset/raw_data --output changes.csv
+  python pipeline.py dataset/raw_data --config changed.json   # stages: merge, changed, english, exclusion
+"""
+
+import argparse
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+import storage
+from dedup import merge_duplicate_repos, repo_keys
+
+logger = logging.getLogger(__name__)
+
+# Metrics whose old value, new value and difference are reported.
+DELTA_COLUMNS = ("stars", "commits_2024", "collaborators")
+
+# Columns not compared: the search score depends on the query, not on the repository.
+IGNORED_COLUMNS = ("score",)
+
+CHANGES = ("added", "removed", "changed")
+
+
+@dataclass
+class SnapshotDiff:
+    changes: pd.DataFrame
+    # Row counts of both snapshots and duration of the comparison.
+    old_rows: int = 0
+    new_rows: int = 0
+    seconds: float = 0.0
+    counts: dict = field(default_factory=dict)
+
+    def keys(self, *changes: str) -> pd.Index:
+        """Keys of the repositories with one of `changes` (default: added and changed)."""
+        changes = changes or ("added", "changed")
+        return pd.Index(self.changes.loc[self.changes["change"].isin(changes), "key"])
+
+    def __str__(self) -> str:
+        return (
+            f"{self.old_rows} -> {self.new_rows} repositories: "
+            + ", ".join(f"{self.counts.get(change, 0)} {change}" for change in CHANGES)
+            + f" ({self.seconds:.2f} s)"
+        )
+
+
+def read_snapshot(paths: Union[str, Sequence[str]], key: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read the tables of a run, one row per repository, indexed by repository key.
+
+    Parameters
+    ----------
+    paths : str or sequence of str
+        Tables, or folders whose tables are all read (any `storage` format).
+    key : str, optional
+        Key column (see `dedup.repo_keys`).
+    """
+    paths = [paths] if isinstance(paths, str) else list(paths)
+    tables = [table for path in paths for table in (storage.list_tables(path) if os.path.isdir(path) else [path])]
+    if not tables:
+        raise FileNotFoundError(f"No table in {paths}")
+    df = merge_duplicate_repos(pd.concat([storage.read_table(table) for table in tables], ignore_index=True), key)
+    return _indexed(df, key)
+
+
+def _indexed(df: pd.DataFrame, key: Optional[str] = None) -> pd.DataFrame:
+    keys = repo_keys(df, key)
+    if keys.duplicated().any():
+        raise ValueError("A snapshot must have one row per repository (see dedup.merge_duplicate_repos).")
+    return df.set_index(pd.Index(keys, name="key"))
+
+
+def _rows_differ(old: pd.DataFrame, new: pd.DataFrame) -> np.ndarray:
+    """Whether the 64-bit hashes of aligned rows differ; columns typed differently are hashed as text."""
+    mismatched = [column for column in old.columns if old[column].dtype != new[column].dtype]
+    if mismatched:
+        old = old.astype({column: "string" for column in mismatched})
+        new = new.astype({column: "string" for column in mismatched})
+    # Most text values are distinct (names, URLs), so factorizing them first does not pay off.
+    old_hashes = pd.util.hash_pandas_object(old, index=False, categorize=False).to_numpy()
+    return old_hashes != pd.util.hash_pandas_object(new, index=False, categorize=False).to_numpy()
+
+
+def diff_snapshots(old: pd.DataFrame, new: pd.DataFrame, key: Optional[str] = None) -> SnapshotDiff:
+    """
+    Compare two snapshots.
+
+    Parameters
+    ----------
+    old, new : pandas.DataFrame
+        One row per repository, as returned by `read_snapshot` (or any table with
+        unique repository keys).
+    key : str, optional
+        Key column, for tables not indexed by `read_snapshot`.
+
+    Returns
+    -------
+    SnapshotDiff
+        The change log (columns `key`, `full_name`, `change`, `changed_columns` and
+        `<metric>_old`, `<metric>_new`, `<metric>_delta` for `DELTA_COLUMNS`), sorted
+        by change then key, and the counts per change.
+    """
+    start = time.perf_counter()
+    if old.index.name != "key":
+        old = _indexed(old, key)
+    if new.index.name != "key":
+        new = _indexed(new, key)
+
+    # One hash lookup of the new keys in the old index gives every set.
+    positions = old.index.get_indexer(new.index)
+    in_old = positions >= 0
+    in_new = np.zeros(len(old), dtype=bool)
+    in_new[positions[in_old]] = True
+    added = new.index[~in_old]
+    removed = old.index[~in_new]
+    common = new.index[in_old]
+
+    compared = [column for column in new.columns if column in old.columns and column not in IGNORED_COLUMNS]
+    old_common = old[compared].iloc[positions[in_old]]
+    new_common = new[compared].iloc[np.flatnonzero(in_old)]
+    differs = _rows_differ(old_common, new_common)
+    changed = common[differs]
+
+    # Names of the differing columns of the changed repositories only.
+    before = old_common[differs].astype("string")
+    after = new_common[differs].astype("string")
+    unequal = ~((before == after).fillna(False) | (before.isna() & after.isna()))
+    labels = pd.Series([f"{column};" for column in compared], index=compared, dtype=object)
+    changed_columns = unequal.astype(object).dot(labels).str.rstrip(";") if len(changed) else pd.Series(dtype=object)
+
+    # One lookup of every reported repository in each snapshot.
+    keys = added.append(removed).append(changed)
+    metrics = [metric for metric in DELTA_COLUMNS if metric in old.columns or metric in new.columns]
+    old_rows = old.reindex(keys, columns=["full_name", *metrics])
+    new_rows = new.reindex(keys, columns=["full_name", *metrics])
+
+    changes = pd.DataFrame({"key": keys})
+    changes["full_name"] = new_rows["full_name"].fillna(old_rows["full_name"]).to_numpy()
+    changes["change"] = np.repeat(CHANGES, [len(added), len(removed), len(changed)])
+    changes["changed_columns"] = np.concatenate(
+        [np.full(len(added) + len(removed), "", dtype=object), changed_columns.to_numpy(dtype=object)]
+    )
+    for metric in metrics:
+        before = old_rows[metric].astype("Int64").to_numpy()
+        after = new_rows[metric].astype("Int64").to_numpy()
+        changes[f"{metric}_old"] = pd.array(before, dtype="Int64")
+        changes[f"{metric}_new"] = pd.array(after, dtype="Int64")
+        changes[f"{metric}_delta"] = changes[f"{metric}_new"] - changes[f"{metric}_old"]
+
+    changes["change"] = pd.Categorical(changes["change"], categories=CHANGES)
+    changes = changes.sort_values(["change", "key"], kind="stable", ignore_index=True)
+    changes["change"] = changes["change"].astype("string")
+
+    diff = SnapshotDiff(
+        changes,
+        old_rows=len(old),
+        new_rows=len(new),
+        seconds=time.perf_counter() - start,
+        counts={"added": len(added), "removed": len(removed), "changed": len(changed)},
+    )
+    logger.info("[Diff] %s", diff)
+    return diff
+
+
+def keep_changed_repos(
+    df: pd.DataFrame,
+    since: Union[str, List[str]],
+    key: Optional[str] = None,
+    changes_path: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Keep the repositories added or changed since a previous snapshot.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Current run, one row per repository (e.g. after the `merge` stage).
+    since : str or list of str
+        Tables or folders of the previous run.
+    key : str, optional
+        Key column (see `dedup.repo_keys`).
+    changes_path : str, optional
+        Table the change log is written to.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The added and changed rows of `df`, in their order, columns unchanged.
+    """
+    diff = diff_snapshots(read_snapshot(since, key), _indexed(df, key))
+    if changes_path:
+        storage.write_table(diff.changes, changes_path)
+        logger.info("[Diff] Change log saved to '%s'", changes_path)
+    keep = np.asarray(repo_keys(df, key).isin(diff.keys("added", "changed")), dtype=bool)
+    return df[keep]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the repositories of two mining runs.")
+    parser.add_argument("old", nargs="+", help="Tables or folders of the previous run.")
+    parser.add_argument("new", help="Table or folder of the current run.")
+    parser.add_argument("--output", help="Change log table (any storage format).")
+    parser.add_argument("--changed-rows", help="Table of the added and changed repositories of the current run.")
+    parser.add_argument("--key", help="Repository key (default: id, or full_name).")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    new = read_snapshot(args.new, args.key)
+    diff = diff_snapshots(read_snapshot(args.old, args.key), new)
+    print(diff)
+    if args.output:
+        storage.write_table(diff.changes, args.output)
+        print(f"Change log: {args.output}")
+    if args.changed_rows:
+        storage.write_table(new.loc[new.index.isin(diff.keys())].reset_index(drop=True), args.changed_rows)
+        print(f"Changed repositories: {args.changed_rows}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,479 @@
+"""
+Typed storage of the repository tables produced and consumed by data_collection.
+
+Every stage (mining, concatenation, deduplication, filtering) reads and writes its
+tables through this module. The format follows the file extension:
+
+- `.csv`: plain text, the format of the replication package (default);
+- `.parquet` / `.feather`: columnar files keeping the column types, so the next
+  stage does not parse text again. Both need the optional `pyarrow` dependency
+  (`poetry install --extras parquet`).
+
+The format of newly written tables is chosen with `STORAGE_FORMAT` (`csv`,
+`parquet` or `feather`). Whatever the format, the columns get the same types:
+integer counts, a UTC datetime `last_commit`, boolean flags and string text.
+`export_csv` turns any table back into the CSV layout of the replication package.
+"""
+
+import argparse
+import csv
+import logging
+import os
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Columns of a mined table, in the order `HandleCsv` writes them.
+COLUMNS = (
+    "name",
+    "full_name",
+    "URL",
+    "desc.",
+    "total_commits",
+    "last_commit",
+    "commits_2024",
+    "stars",
+    "fork",
+    "forks",
+    "lang",
+    "size",
+    "score",
+    "template",
+    "archived",
+    "disabled",
+    "contributors_url",
+    "collaborators_url",
+    "collaborators",
+    "search_term",
+)
+
+INT_COLUMNS = ("total_commits", "commits_2024", "stars", "forks", "size", "collaborators")
+BOOL_COLUMNS = ("fork", "template", "archived", "disabled")
+FLOAT_COLUMNS = ("score",)
+DATETIME_COLUMNS = ("last_commit",)
+
+# Serialization of `last_commit` in CSV files, as returned by the GitHub API.
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Types given to the CSV parser, so that nothing is inferred; `last_commit` is read
+# as text and parsed by `apply_schema`.
+CSV_DTYPES = {
+    **{column: "string" for column in COLUMNS},
+    **{column: "Int64" for column in INT_COLUMNS},
+    **{column: "boolean" for column in BOOL_COLUMNS},
+    **{column: "float64" for column in FLOAT_COLUMNS},
+}
+
+FORMATS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+DEFAULT_FORMAT = "csv"
+
+_BOOLEANS = {"true": True, "false": False, "1": True, "0": False}
+
+
+def default_format() -> str:
+    """Return the format of newly written tables (`STORAGE_FORMAT`, default 'csv')."""
+    fmt = os.getenv("STORAGE_FORMAT", DEFAULT_FORMAT).strip().lower() or DEFAULT_FORMAT
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown STORAGE_FORMAT {fmt!r}, expected one of {sorted(FORMATS)}.")
+    return fmt
+
+
+def extension(fmt: Optional[str] = None) -> str:
+    """Return the file extension of `fmt` (default: `default_format()`)."""
+    return FORMATS[fmt or default_format()]
+
+
+def table_format(path: str) -> str:
+    """Return the format of the table at `path`, from its extension."""
+    suffix = os.path.splitext(path)[1].lower()
+    for fmt, ext in FORMATS.items():
+        if suffix == ext:
+            return fmt
+    raise ValueError(f"Unsupported table file {path!r}, expected one of {sorted(FORMATS.values())}.")
+
+
+def is_table(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in FORMATS.values()
+
+
+def list_tables(folder: str) -> List[str]:
+    """Return the paths of the tables (any format) in `folder`, sorted by name."""
+    return sorted(
+        os.path.join(folder, name)
+        for name in os.listdir(folder)
+        if is_table(name) and not name.startswith(".")
+    )
+
+
+def with_extension(path: str, fmt: Optional[str] = None) -> str:
+    """Replace the extension of `path` with the one of `fmt`."""
+    return os.path.splitext(path)[0] + extension(fmt)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "Parquet/Feather storage needs pyarrow: run `poetry install --extras parquet` "
+            "or set STORAGE_FORMAT=csv."
+        ) from None
+    return pyarrow
+
+
+def _to_bool(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_bool_dtype(series):
+        return series.astype("boolean")
+    mapped = series.map(lambda value: _BOOLEANS.get(str(value).strip().lower()) if pd.notna(value) else None)
+    return mapped.astype("boolean")
+
+
+def check_header(columns: Sequence[str]) -> Tuple[List[str], List[str]]:
+    """
+    Compare the header of a table with `COLUMNS`.
+
+    Returns
+    -------
+    tuple of (list, list)
+        The missing columns and the unexpected ones.
+    """
+    return [column for column in COLUMNS if column not in columns], [
+        column for column in columns if column not in COLUMNS
+    ]
+
+
+def _read_csv(path: str, **kwargs):
+    """`pandas.read_csv` with the declared `CSV_DTYPES`, falling back to inference on malformed values."""
+    try:
+        return pd.read_csv(path, dtype=CSV_DTYPES, **kwargs)
+    except (TypeError, ValueError) as exc:
+        # e.g. "12.0" in a count column: let `apply_schema` coerce what it can.
+        logger.debug("Declared types do not fit %s (%s); inferring them.", path, exc)
+        return pd.read_csv(path, **kwargs)
+
+
+def _iter_csv(path: str, chunksize: int, usecols: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """CSV chunks with the declared `CSV_DTYPES`; from the first malformed chunk on, read as text."""
+    done = 0
+    with pd.read_csv(path, chunksize=chunksize, usecols=usecols, dtype=CSV_DTYPES) as reader:
+        while True:
+            try:
+                chunk = next(reader)
+            except StopIteration:
+                return
+            except (TypeError, ValueError) as exc:
+                # As `_read_csv`: let `apply_schema` coerce what it can.
+                logger.debug("Declared types do not fit chunk %d of %s (%s); reading it as text.", done, path, exc)
+                break
+            done += 1
+            yield apply_schema(chunk)
+
+    # A failed chunk cannot be parsed again; the text reader skips the chunks already read.
+    with pd.read_csv(path, chunksize=chunksize, usecols=usecols, dtype=str) as reader:
+        for index, chunk in enumerate(reader):
+            if index >= done:
+                yield apply_schema(chunk)
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast the known columns of `df` to their types.
+
+    Counts become nullable integers, `last_commit` a UTC datetime, flags nullable
+    booleans and the remaining known columns strings. Unparsable values become
+    missing; unknown columns are left as they are.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Table as read from any format.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The same table (a copy) with typed columns.
+    """
+    df = df.copy()
+    for column in df.columns:
+        dtype = df[column].dtype
+        if column in INT_COLUMNS:
+            if dtype != "Int64":
+                df[column] = pd.to_numeric(df[column], errors="coerce").astype("Int64")
+        elif column in BOOL_COLUMNS:
+            if dtype != "boolean":
+                df[column] = _to_bool(df[column])
+        elif column in FLOAT_COLUMNS:
+            if dtype != "float64":
+                df[column] = pd.to_numeric(df[column], errors="coerce").astype("float64")
+        elif column in DATETIME_COLUMNS:
+            if not isinstance(dtype, pd.DatetimeTZDtype):
+                df[column] = pd.to_datetime(df[column], utc=True, errors="coerce", format="ISO8601")
+        elif column in COLUMNS:
+            if dtype != pd.StringDtype():
+                df[column] = df[column].astype("string")
+    return df
+
+
+def _csv_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Return `df` with the datetimes written the way the GitHub API returns them."""
+    df = df.copy()
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.DatetimeTZDtype) or pd.api.types.is_datetime64_dtype(df[column]):
+            df[column] = df[column].dt.strftime(DATETIME_FORMAT)
+    return df
+
+
+def read_table(path: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Read a table written by any stage.
+
+    Parameters
+    ----------
+    path : str
+        `.csv`, `.parquet` or `.feather` file.
+    columns : sequence of str, optional
+        Read only these columns (columnar formats skip the others entirely).
+
+    Returns
+    -------
+    pandas.DataFrame
+        The typed table (see `apply_schema`).
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Table not found: {path}")
+
+    fmt = table_format(path)
+    if fmt == "csv":
+        df = _read_csv(path, usecols=list(columns) if columns else None)
+    else:
+        _require_pyarrow()
+        if fmt == "parquet":
+            df = pd.read_parquet(path, columns=list(columns) if columns else None)
+        else:
+            df = pd.read_feather(path, columns=list(columns) if columns else None)
+    return apply_schema(df)
+
+
+def iter_table(path: str, chunksize: int, columns: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Read a table chunk by chunk, so that only `chunksize` rows are in memory at once.
+
+    Parameters
+    ----------
+    path : str
+        `.csv`, `.parquet` or `.feather` file.
+    chunksize : int
+        Rows per chunk (Feather chunks never span two record batches).
+    columns : sequence of str, optional
+        Read only these columns.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Typed chunks (see `apply_schema`), indexed by row position in the table.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Table not found: {path}")
+
+    fmt = table_format(path)
+    start = 0
+    if fmt == "csv":
+        yield from _iter_csv(path, chunksize, list(columns) if columns else None)
+        return
+
+    pa = _require_pyarrow()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=list(columns) if columns else None)
+    else:
+        reader = pa.ipc.open_file(pa.memory_map(path))
+        batches = (
+            reader.get_batch(index).select(list(columns)) if columns else reader.get_batch(index)
+            for index in range(reader.num_record_batches)
+        )
+    for batch in batches:
+        for offset in range(0, batch.num_rows, chunksize):
+            chunk = batch.slice(offset, chunksize).to_pandas()
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            yield apply_schema(chunk)
+
+
+def write_table(df: pd.DataFrame, path: str) -> str:
+    """
+    Write `df` in the format given by the extension of `path`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Table to write; its known columns are typed first.
+    path : str
+        Output file, created with its folder.
+
+    Returns
+    -------
+    str
+        `path`.
+    """
+    fmt = table_format(path)
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    df = apply_schema(df)
+    if fmt == "csv":
+        _csv_frame(df).to_csv(path, index=False)
+    else:
+        _require_pyarrow()
+        if fmt == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.reset_index(drop=True).to_feather(path)
+    return path
+
+
+def export_csv(path: str, output_path: Optional[str] = None) -> str:
+    """
+    Convert a table to the CSV layout of the replication package.
+
+    Parameters
+    ----------
+    path : str
+        Table in any format.
+    output_path : str, optional
+        CSV file to write. Default: `path` with a `.csv` extension.
+
+    Returns
+    -------
+    str
+        Path of the CSV file.
+    """
+    output_path = output_path or with_extension(path, "csv")
+    if os.path.abspath(output_path) == os.path.abspath(path):
+        return path
+    write_table(read_table(path), output_path)
+    logger.info("Exported %s to %s", path, output_path)
+    return output_path
+
+
+class TableWriter:
+    """
+    Append rows to a table batch by batch, in any format.
+
+    CSV batches are flushed and fsync'ed; Parquet batches become row groups and
+    Feather batches record batches, so an interrupted run keeps the CSV rows
+    written so far and memory stays bounded for every format.
+    """
+
+    def __init__(self, path: str, columns: Sequence[str] = COLUMNS, fmt: Optional[str] = None) -> None:
+        """
+        Open the table.
+
+        Parameters
+        ----------
+        path : str
+            Output file; its extension selects the format.
+        columns : sequence of str, optional
+            Column names, in the order of the values of each row.
+        fmt : str, optional
+            Format, for a path without a table extension (e.g. a temporary file).
+        """
+        self.path = path
+        self.columns = list(columns)
+        self.format = fmt or table_format(path)
+        self._file = None
+        self._csv = None
+        self._writer = None
+        self._schema = None
+        self._pa = None
+
+        if self.format == "csv":
+            self._file = open(path, mode="w", newline="", encoding="utf-8")
+            # Same line endings as `write_table` (pandas), so both paths give identical files.
+            self._csv = csv.writer(self._file, lineterminator="\n")
+            self._csv.writerow(self.columns)
+        else:
+            self._pa = _require_pyarrow()
+
+    def write_rows(self, rows: List[list]) -> None:
+        """Append `rows` (lists of values in `columns` order) as one batch."""
+        if self.format == "csv":
+            self._csv.writerows(rows)
+            self._sync()
+            return
+        self.write_frame(pd.DataFrame(rows, columns=self.columns))
+
+    def write_frame(self, df: pd.DataFrame) -> None:
+        """Append the rows of `df` (with the table's `columns`) as one batch."""
+        df = apply_schema(df[self.columns])
+        if self.format == "csv":
+            _csv_frame(df).to_csv(
+                self._file, header=False, index=False, lineterminator=self._csv.dialect.lineterminator
+            )
+            self._sync()
+            return
+
+        table = self._pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            # The first batch fixes the schema; later batches are cast to it.
+            self._schema = table.schema
+            if self.format == "parquet":
+                import pyarrow.parquet as pq
+
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            else:
+                self._writer = self._pa.ipc.new_file(self.path, self._schema)
+        else:
+            table = table.cast(self._schema)
+        self._writer.write_table(table)
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self) -> "TableWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def records(df: pd.DataFrame) -> List[Dict]:
+    """Return the rows of `df` as dicts, with missing values as None."""
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert repository tables between storage formats.")
+    parser.add_argument("paths", nargs="+", help="Tables (or folders of tables) to convert.")
+    parser.add_argument(
+        "--to",
+        choices=sorted(FORMATS),
+        default="csv",
+        help="Target format (default: csv, the replication package format).",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    for path in args.paths:
+        for table in list_tables(path) if os.path.isdir(path) else [path]:
+            output_path = with_extension(table, args.to)
+            if table_format(table) == args.to:
+                continue
+            write_table(read_table(table), output_path)
+            logger.info("Converted %s to %s", table, output_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Structured telemetry of a mining run.
+
+Every outbound request (and every retry) becomes one `request` record with its
+endpoint, status, latency, body bytes, remaining rate-limit quota and retry
+number; timed sections of the run (a term, a repository, a GraphQL batch) become
+`span` records. Records are kept in memory for the summary report and, once
+`open` is called, appended to a JSONL file:
+
+  {"type": "request", "ts": ..., "method": "GET", "endpoint": "commits", "status": 200,
+   "latency": 0.031, "bytes": 412, "ratelimit_remaining": 4873, "retry": 0, ...}
+  {"type": "span", "ts": ..., "kind": "repo", "name": "owner/repo", "duration": 0.094, ...}
+
+Listeners added with `subscribe` receive every record as it is emitted, e.g. to
+forward them to another monitoring system.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+from utils import percentile
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[[Dict], None]
+
+
+class Telemetry:
+    """
+    Thread-safe recorder of request and span records.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        Initialize the recorder.
+
+        Parameters
+        ----------
+        path : str, optional
+            JSONL file the records are appended to. If None, records are only
+            aggregated in memory (see `open`).
+        """
+        self._lock = threading.Lock()
+        self._file = None
+        self._listeners: List[Listener] = []
+        self.reset()
+        if path:
+            self.open(path)
+
+    def reset(self) -> None:
+        """Forget the aggregated records (the JSONL file is kept)."""
+        with self._lock:
+            self._requests: Dict[str, List[Dict]] = defaultdict(list)
+            self._spans: Dict[str, List[float]] = defaultdict(list)
+            self._first: Optional[float] = None
+            self._last: Optional[float] = None
+
+    def open(self, path: str) -> None:
+        """Start appending records to the JSONL file `path`."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self._file = open(path, mode="a", encoding="utf-8")
+        logger.info("Writing request telemetry to %s", path)
+
+    def subscribe(self, listener: Listener) -> None:
+        """Call `listener(record)` for every record emitted from now on."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _emit(self, record: Dict) -> None:
+        record["thread"] = threading.current_thread().name
+        with self._lock:
+            end = record["ts"] + record.get("latency", record.get("duration", 0.0))
+            self._first = record["ts"] if self._first is None else min(self._first, record["ts"])
+            self._last = end if self._last is None else max(self._last, end)
+            if record["type"] == "request":
+                self._requests[record["endpoint"]].append(record)
+            else:
+                self._spans[record["kind"]].append(record["duration"])
+            if self._file is not None:
+                self._file.write(json.dumps(record) + "\n")
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            listener(record)
+
+    def record_request(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        started_at: float,
+        latency: float,
+        status: Optional[int],
+        size: int = 0,
+        ratelimit_remaining: Optional[int] = None,
+        retry: int = 0,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Record one outbound request.
+
+        Parameters
+        ----------
+        method, url, endpoint : str
+            Request method, URL and endpoint family (see `http_client.endpoint_name`).
+        started_at : float
+            Epoch time the request was sent.
+        latency : float
+            Seconds until the response (or the error).
+        status : int or None
+            HTTP status, None if no response was received.
+        size : int, optional
+            Body bytes received.
+        ratelimit_remaining : int, optional
+            `X-RateLimit-Remaining` of the response.
+        retry : int, optional
+            0 for the first attempt, then the retry number.
+        error : str, optional
+            Exception name when the request failed without a response.
+        """
+        record = {
+            "type": "request",
+            "ts": started_at,
+            "method": method,
+            "endpoint": endpoint,
+            "url": url,
+            "status": status,
+            "latency": latency,
+            "bytes": size,
+            "ratelimit_remaining": ratelimit_remaining,
+            "retry": retry,
+        }
+        if error:
+            record["error"] = error
+        self._emit(record)
+
+    def record_span(self, kind: str, name: str, started_at: float, duration: float) -> None:
+        """Record a timed section `kind` (e.g. 'term', 'repo') named `name`."""
+        self._emit(
+            {"type": "span", "ts": started_at, "kind": kind, "name": name, "duration": duration}
+        )
+
+    @contextmanager
+    def span(self, kind: str, name: str) -> Iterator[None]:
+        """Time the enclosed block as a span (recorded even if it raises)."""
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_span(kind, name, started_at, time.perf_counter() - start)
+
+    def summary(self) -> Dict:
+        """
+        Aggregate the records.
+
+        Returns
+        -------
+        dict
+            `wall` (seconds between the first and the last record), `request_time`
+            (sum of latencies), an `endpoints` mapping with per-endpoint
+            `requests`, `errors`, `retries`, `bytes`, `time`, `share` of the
+            request time, `p50` and `p95`, and a `spans` mapping with per-kind
+            `count`, `total`, `mean` and `p95` durations.
+        """
+        with self._lock:
+            requests = {name: list(records) for name, records in self._requests.items()}
+            spans = {kind: list(values) for kind, values in self._spans.items()}
+            wall = (self._last - self._first) if self._first is not None else 0.0
+
+        request_time = sum(r["latency"] for records in requests.values() for r in records)
+        endpoints = {}
+        for name, records in sorted(requests.items()):
+            latencies = [r["latency"] for r in records]
+            endpoints[name] = {
+                "requests": len(records),
+                "errors": sum(r["status"] is None or r["status"] >= 400 for r in records),
+                "retries": sum(r["retry"] > 0 for r in records),
+                "bytes": sum(r["bytes"] for r in records),
+                "time": sum(latencies),
+                "share": sum(latencies) / request_time if request_time else 0.0,
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+            }
+
+        return {
+            "wall": wall,
+            "request_time": request_time,
+            "endpoints": endpoints,
+            "spans": {
+                kind: {
+                    "count": len(values),
+                    "total": sum(values),
+                    "mean": sum(values) / len(values),
+                    "p95": percentile(values, 95),
+                }
+                for kind, values in sorted(spans.items())
+            },
+        }
+
+    def report(self) -> str:
+        """Return a human-readable report of `summary()`: where the time goes."""
+        summary = self.summary()
+        lines = [
+            f"wall time: {summary['wall']:.2f} s | time in requests: {summary['request_time']:.2f} s "
+            f"(x{summary['request_time'] / summary['wall'] if summary['wall'] else 0.0:.1f} concurrency)"
+        ]
+        for name, values in summary["endpoints"].items():
+            lines.append(
+                f"  {name:<14s} {values['share']:6.1%} of request time | {values['requests']:7d} requests "
+                f"| {values['retries']:5d} retries | {values['errors']:5d} errors "
+                f"| {values['bytes'] / 1024:9.1f} KiB | p50 {values['p50'] * 1000:7.1f} ms "
+                f"| p95 {values['p95'] * 1000:7.1f} ms"
+            )
+        for kind, values in summary["spans"].items():
+            lines.append(
+                f"  span {kind:<9s} {values['count']:7d} | total {values['total']:8.2f} s "
+                f"| mean {values['mean']:7.3f} s | p95 {values['p95']:7.3f} s"
+            )
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
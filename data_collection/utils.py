@@ -1,6 +1,7 @@
+import math
 import os
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 ROOT = os.getcwd()
 
@@ -10,6 +11,15 @@ def format_datetime() -> str:
     return datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
 
 
+def percentile(values: List[float], q: float) -> float:
+    """Return the `q`-th percentile (0-100) of `values` (nearest rank), 0.0 if empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
 class Menu:
     @staticmethod
     def _get_filtered_entries(root: str, *, files: bool) -> list[str]:
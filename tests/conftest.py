@@ -0,0 +1,11 @@
+import os
+import sys
+
+# The data collection scripts are run from their folder and import each other flat.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data_collection"))
+
+# Settings read when `api_search` is imported; no on-disk cache or telemetry in tests.
+os.environ.setdefault("PER_PAGE", "50")
+os.environ.setdefault("MAX_RESP", "400")
+os.environ["HTTP_CACHE_PATH"] = ""
+os.environ["TELEMETRY_PATH"] = ""
@@ -0,0 +1,119 @@
+import random
+
+import pytest
+import requests
+
+import api_search
+from enrichment import EnrichmentEngine, GraphQLEnricher
+from mock_github import MockGitHub, synthetic_repos
+
+COUNTS = {"total_commits": "_commits", "commits_2024": "_commits_2024"}
+
+
+@pytest.fixture
+def server():
+    repos = synthetic_repos(30, seed=1)
+    # An empty repository: no default branch in GraphQL, `409` on the REST commits.
+    repos[4]["_commits"] = repos[4]["_commits_2024"] = 0
+    with MockGitHub(repos) as mock:
+        yield mock
+
+
+def expected(repos):
+    return [{field: repo[key] for field, key in COUNTS.items()} for repo in repos]
+
+
+def make_enricher(server, batch_size=7, post=None, path="/graphql"):
+    """A GraphQL enricher on the mock whose REST fallback records the repositories it counts."""
+    fallback_calls = []
+
+    def fallback(field):
+        def fetch(owner, name):
+            fallback_calls.append((field, f"{owner}/{name}"))
+            return server.find(owner, name)[COUNTS[field]]
+
+        return fetch
+
+    enricher = GraphQLEnricher(
+        post or (lambda url, body: requests.post(url, json=body, timeout=10)),
+        f"{server.url}{path}",
+        api_search.COMMITS_2024_WINDOW,
+        rest_fetchers={},
+        fallback_fetchers={field: fallback(field) for field in COUNTS},
+        batch_size=batch_size,
+        max_workers=3,
+    )
+    return enricher, fallback_calls
+
+
+def fallback_repos(calls):
+    return sorted({full_name for _, full_name in calls})
+
+
+def test_aliases_map_back_to_input_order_across_batches(server):
+    repos = list(server.repos)
+    random.Random(0).shuffle(repos)
+    enricher, calls = make_enricher(server, batch_size=7)
+    assert enricher.enrich(repos) == expected(repos)
+    assert calls == []
+    assert server.graphql_queries == 5
+
+
+def test_empty_repository_counts_zero_without_rest(server):
+    enricher, calls = make_enricher(server, batch_size=10)
+    results = enricher.enrich(server.repos[:10])
+    assert results[4] == {"total_commits": 0, "commits_2024": 0}
+    assert calls == []
+
+
+def test_null_alias_falls_back_to_rest(server):
+    # The first query succeeds; its 3rd, 6th and 9th aliases are null (FORBIDDEN).
+    server.graphql_failures = 3
+    repos = server.repos[10:20]
+    enricher, calls = make_enricher(server, batch_size=10)
+    assert enricher.enrich(repos) == expected(repos)
+    assert fallback_repos(calls) == sorted(repos[index]["full_name"] for index in (2, 5, 8))
+
+
+def test_query_without_data_falls_back_to_rest(server):
+    # Every query is answered 200 with `"data": null` (RATE_LIMITED).
+    server.graphql_failures = 1
+    repos = server.repos[10:24]
+    enricher, calls = make_enricher(server, batch_size=7)
+    assert enricher.enrich(repos) == expected(repos)
+    assert fallback_repos(calls) == sorted(repo["full_name"] for repo in repos)
+
+
+def test_error_status_falls_back_to_rest(server):
+    repos = server.repos[10:17]
+    enricher, calls = make_enricher(server, path="/not-graphql")
+    assert enricher.enrich(repos) == expected(repos)
+    assert fallback_repos(calls) == sorted(repo["full_name"] for repo in repos)
+
+
+def test_request_exception_falls_back_to_rest(server):
+    def unreachable(url, body):
+        raise requests.ConnectionError("connection refused")
+
+    repos = server.repos[10:17]
+    enricher, calls = make_enricher(server, post=unreachable)
+    assert enricher.enrich(repos) == expected(repos)
+    assert fallback_repos(calls) == sorted(repo["full_name"] for repo in repos)
+
+
+def test_output_matches_rest_engine(server, monkeypatch):
+    monkeypatch.setattr(api_search, "API_URL", server.url)
+    monkeypatch.setattr(api_search, "GRAPHQL_BATCH_SIZE", 4)
+    server.graphql_failures = 3
+    repos = server.repos
+
+    seen = []
+    graphql = api_search.build_enricher(max_workers=4, backend="graphql").enrich(
+        repos, on_repo=lambda repo, metrics: seen.append((repo["full_name"], metrics))
+    )
+    rest = EnrichmentEngine(api_search.ENRICHMENT_FETCHERS, max_workers=4).enrich(repos)
+
+    assert graphql == rest
+    assert sorted(seen, key=lambda item: item[0]) == sorted(
+        ((repo["full_name"], metrics) for repo, metrics in zip(repos, rest)), key=lambda item: item[0]
+    )
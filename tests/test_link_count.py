@@ -0,0 +1,93 @@
+import json
+
+import pytest
+import requests
+
+import api_search
+
+REPO_URL = "https://api.github.com/repos/octo/demo"
+
+
+def make_response(status_code, body=None, link=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = REPO_URL
+    if link:
+        response.headers["Link"] = link
+    response._content = b"" if body is None else json.dumps(body).encode()
+    return response
+
+
+@pytest.fixture
+def replay(monkeypatch):
+    """Answer every `client.get` with the given response, recording the query parameters."""
+    calls = []
+
+    def install(response):
+        def get(url, params=None, **kwargs):
+            calls.append((url, params))
+            return response
+
+        monkeypatch.setattr(api_search.client, "get", get)
+        return calls
+
+    return install
+
+
+LAST_WITH_PARAMS = (
+    f'<{REPO_URL}/commits?since=2024-01-01T00%3A00%3A00Z&per_page=1&page=2>; rel="next", '
+    f'<{REPO_URL}/commits?since=2024-01-01T00%3A00%3A00Z&per_page=1&page=1234>; rel="last"'
+)
+
+
+def test_last_page_among_other_query_params(replay):
+    calls = replay(make_response(200, [{"sha": "a"}], LAST_WITH_PARAMS))
+    assert api_search.count_commits_2024("octo", "demo", mode="link") == 1234
+    assert calls[0][1]["per_page"] == 1
+    assert calls[0][1]["since"] == api_search.COMMITS_2024_WINDOW["since"]
+
+
+def test_last_page_number_ignores_links_without_page():
+    response = make_response(200, [], f'<{REPO_URL}/commits?per_page=1>; rel="last"')
+    assert api_search._last_page_number(response) is None
+
+
+@pytest.mark.parametrize("body, expected", [([{"sha": "a"}], 1), ([], 0)])
+def test_single_page_without_link_header(replay, body, expected):
+    replay(make_response(200, body))
+    assert api_search.count_total_commits("octo", "demo", mode="link") == expected
+
+
+def test_no_content_empty_repository(replay):
+    replay(make_response(204))
+    assert api_search.count_total_commits("octo", "demo", mode="link") == 0
+
+
+def test_conflict_empty_repository(replay, caplog):
+    replay(make_response(409, {"message": "Git Repository is empty."}))
+    assert api_search.count_total_commits("octo", "demo", mode="link") == 0
+    assert api_search.count_commits_2024("octo", "demo", mode="link") == 0
+    assert not [record for record in caplog.records if record.levelname == "ERROR"]
+
+
+def test_contributors_link_mode(replay):
+    link = (
+        f'<{REPO_URL}/contributors?anon=true&per_page=1&page=2>; rel="next", '
+        f'<{REPO_URL}/contributors?anon=true&per_page=1&page=731>; rel="last"'
+    )
+    calls = replay(make_response(200, [{"login": "octocat"}], link))
+    assert api_search.get_collaborators_count("octo", "demo", mode="link", anon=True) == 731
+    assert calls[0] == (f"{api_search.API_URL}/repos/octo/demo/contributors", {"anon": "true", "per_page": 1})
+
+
+@pytest.mark.parametrize(
+    "response, expected",
+    [
+        (make_response(200, [{"login": "octocat"}]), 1),
+        (make_response(200, []), 0),
+        (make_response(204), 0),
+    ],
+)
+def test_contributors_single_page_or_empty(replay, response, expected):
+    replay(response)
+    assert api_search.get_collaborators_count("octo", "demo", mode="link") == expected